@@ -0,0 +1,84 @@
+"""
+Benchmark de horários disponíveis sob acesso simultâneo.
+
+Simula muitos pacientes consultando o mesmo psicólogo e a mesma data ao mesmo
+tempo e compara:
+  - cada requisição calculando a própria resposta;
+  - requisições simultâneas idênticas compartilhando um cálculo (single-flight).
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_available_slots [--appointments 50000] [--clients 200]
+"""
+
+import argparse
+import random
+import threading
+import time
+from datetime import date, time as dtime, timedelta
+from synapse.business_model.appointment import Appointment
+from synapse.business_model.availability import Availability
+from synapse.repositories.implementations.inmemory_appointment_repository import InMemoryAppointmentRepository
+from synapse.repositories.implementations.inmemory_availability_repository import InMemoryAvailabilityRepository
+from synapse.repositories.implementations.inmemory_patient_repository import InMemoryPatientRepository
+from synapse.repositories.implementations.inmemory_psychologist_repository import InMemoryPsychologistRepository
+from synapse.services.appointment_service import AppointmentService
+
+
+def _appointments(count):
+    random.seed(42)
+    base = date.today()
+    for i in range(count):
+        day = base + timedelta(days=random.randint(0, 365))
+        yield Appointment(1, random.randint(1, 50), day, dtime(random.randint(8, 17), 0), id=i + 1)
+
+
+def _run(clients, call):
+    barrier = threading.Barrier(clients)
+
+    def worker():
+        barrier.wait()
+        call()
+
+    threads = [threading.Thread(target=worker) for _ in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--appointments", type=int, default=50000)
+    parser.add_argument("--clients", type=int, default=200)
+    args = parser.parse_args()
+
+    target = date.today() + timedelta(days=7)
+    availabilities = [Availability(1, target.weekday(), dtime(8, 0), dtime(18, 0), id=1)]
+    service = AppointmentService(
+        InMemoryAppointmentRepository(list(_appointments(args.appointments))),
+        InMemoryPatientRepository(), InMemoryPsychologistRepository(),
+        InMemoryAvailabilityRepository(availabilities),
+    )
+
+    computations = [0]
+    compute = service._compute_available_slots
+
+    def counted(*a):
+        computations[0] += 1
+        return compute(*a)
+
+    service._compute_available_slots = counted
+    print(f"{args.appointments} consultas / {args.clients} clientes simultâneos")
+
+    elapsed = _run(args.clients, lambda: counted(1, target.isoformat(), 60))
+    print(f"  sem agrupamento: {elapsed:8.1f} ms ({computations[0]} cálculos)")
+
+    computations[0] = 0
+    elapsed = _run(args.clients, lambda: service.get_available_slots(1, target.isoformat(), 60))
+    print(f"  single-flight:   {elapsed:8.1f} ms ({computations[0]} cálculos)")
+
+
+if __name__ == "__main__":
+    main()
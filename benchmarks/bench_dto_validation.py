@@ -0,0 +1,91 @@
+"""
+Micro-benchmark do custo de validação dos DTOs.
+
+Para cada DTO de escrita mede:
+  - o caminho válido via ``Model(**data)`` e via o TypeAdapter em cache;
+  - o custo de cada regra de campo, com um payload que viola apenas aquela regra;
+  - o custo por item de ``validate_many`` em lotes.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_dto_validation [--number 20000] [--batch 1000]
+"""
+
+import argparse
+import timeit
+from pydantic import ValidationError as PydanticValidationError
+from synapse.api.dto import (
+    PatientCreateDTO,
+    PsychologistCreateDTO,
+    ClinicCreateDTO,
+    AvailabilityCreateDTO,
+    AppointmentCreateDTO,
+    LeadCreateDTO,
+)
+from synapse.api.validation import validate, validate_many, error_details
+
+
+# (DTO, payload válido, {regra: campos que a violam})
+CASES = [
+    (PatientCreateDTO,
+     {"name": "Maria Silva", "email": "maria@email.com", "phone": "(11) 98765-4321", "cpf": "123.456.789-00"},
+     {"name vazio": {"name": "   "}, "phone curto": {"phone": "123"}, "email inválido": {"email": "maria"}}),
+    (PsychologistCreateDTO,
+     {"user_id": 1, "name": "Dr. Carlos", "crp": "06/12345", "specialty": "TCC", "hourly_rate": 150.0,
+      "themes": ["Ansiedade", "Depressão"], "bio": "Especialista"},
+     {"crp sem barra": {"crp": "0612345"}, "hourly_rate <= 0": {"hourly_rate": 0}}),
+    (ClinicCreateDTO,
+     {"user_id": 2, "name": "Clínica Vida", "address": "Rua A, 1", "phone": "1133334444", "email": "c@vida.com"},
+     {"name vazio": {"name": ""}}),
+    (AvailabilityCreateDTO,
+     {"psychologist_id": 1, "day_of_week": 2, "start_time": "08:00", "end_time": "12:00"},
+     {"day_of_week fora": {"day_of_week": 9}, "start_time formato": {"start_time": "8h"}}),
+    (AppointmentCreateDTO,
+     {"patient_id": 3, "psychologist_id": 1, "date": "2030-01-07", "time": "14:00", "duration": 60},
+     {"duration fora": {"duration": 5}}),
+    (LeadCreateDTO,
+     {"name": "João", "email": "joao@email.com", "phone": "11999999999", "source": "website"},
+     {"name vazio": {"name": " "}}),
+]
+
+
+def _per_call_us(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=3)) / number * 1e6
+
+
+def _invalid(model, payload):
+    def run():
+        try:
+            validate(model, payload)
+        except PydanticValidationError as e:
+            error_details(e)
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=20000, help="chamadas por medição")
+    parser.add_argument("--batch", type=int, default=1000, help="tamanho do lote para validate_many")
+    args = parser.parse_args()
+
+    print(f"{'DTO':<24} {'cenário':<26} {'µs/chamada':>11}")
+    print("-" * 63)
+    for model, payload, rules in CASES:
+        name = model.__name__
+        print(f"{name:<24} {'Model(**data)':<26} {_per_call_us(lambda: model(**payload), args.number):>11.2f}")
+        print(f"{'':<24} {'validate()':<26} {_per_call_us(lambda: validate(model, payload), args.number):>11.2f}")
+        for rule, override in rules.items():
+            bad = {**payload, **override}
+            print(f"{'':<24} {'falha: ' + rule:<26} {_per_call_us(_invalid(model, bad), args.number):>11.2f}")
+
+        batch = [payload] * args.batch
+        number = max(1, args.number // args.batch)
+        per_item = _per_call_us(lambda: validate_many(model, batch), number) / args.batch
+        print(f"{'':<24} {'validate_many/item':<26} {per_item:>11.2f}")
+
+        mixed = [payload if i % 10 else {**payload, **next(iter(rules.values()))} for i in range(args.batch)]
+        per_item = _per_call_us(lambda: validate_many(model, mixed), number) / args.batch
+        print(f"{'':<24} {'validate_many 10% err':<26} {per_item:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark do funil de leads.
+
+Gera leads sintéticos espalhados por alguns anos e mede:
+  - a construção do cubo diário (feita só quando a coleção muda);
+  - o relatório por dia, semana e mês sobre o cubo já construído.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_lead_analytics [--leads 200000] [--years 3]
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from synapse.business_model.lead import Lead
+from synapse.repositories.implementations.inmemory_lead_repository import InMemoryLeadRepository
+from synapse.services.lead_analytics import LeadAnalyticsService, FUNNEL_STATUSES, GRANULARITIES
+
+SOURCES = ("website", "instagram", "indicacao", "ai_chat")
+
+
+def _leads(count, years):
+    random.seed(42)
+    base = datetime.now() - timedelta(days=365 * years)
+    for _ in range(count):
+        created_at = base + timedelta(minutes=random.randint(0, 525600 * years))
+        status = random.choice(FUNNEL_STATUSES)
+        converted_at = created_at + timedelta(minutes=random.randint(30, 20000)) if status == "converted" else None
+        yield Lead("Lead", "lead@email.com", "11999999999", random.choice(SOURCES),
+                   status=status, created_at=created_at, converted_at=converted_at)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--leads", type=int, default=200000)
+    parser.add_argument("--years", type=int, default=3)
+    args = parser.parse_args()
+
+    repository = InMemoryLeadRepository()
+    repository.add_many(_leads(args.leads, args.years))
+    analytics = LeadAnalyticsService(repository)
+
+    start = time.perf_counter()
+    analytics.funnel()
+    print(f"{args.leads} leads / {args.years} anos")
+    print(f"  cubo + primeiro relatório: {(time.perf_counter() - start) * 1000:8.1f} ms")
+    for granularity in GRANULARITIES:
+        start = time.perf_counter()
+        report = analytics.funnel(granularity)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"  {granularity:<6} ({len(report['series']):5d} linhas): {elapsed:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
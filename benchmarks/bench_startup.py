@@ -0,0 +1,82 @@
+"""
+Benchmark do tempo de inicialização com muitos usuários nos seeds.
+
+Gera um arquivo de seeds temporário com N usuários (senhas em texto puro,
+como no seeds.json) e mede:
+  - ``SeedLoader.load`` (hidratação sem bcrypt);
+  - a criação da aplicação (``import main``) a partir desse arquivo;
+  - o custo estimado do comportamento antigo (um bcrypt por usuário no boot),
+    extrapolado de uma amostra;
+  - a migração única com ``hash_seed_users`` em paralelo, sobre uma amostra.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_startup [--users 2000] [--sample 8] [--rounds 12]
+"""
+
+import argparse
+import importlib
+import json
+import os
+import tempfile
+import time
+from unittest import mock
+import bcrypt
+from synapse.services import seed_loader
+from synapse.services.seed_loader import SeedLoader, SEEDS_FILE
+from synapse.services.seed_migration import hash_seed_users
+
+
+def _seeds_with_users(count):
+    with open(SEEDS_FILE, encoding='utf-8') as f:
+        data = json.load(f)
+    first_id = max((u["id"] for u in data["users"]), default=0) + 1
+    data["users"] += [
+        {"id": first_id + i, "email": f"user{i}@bench.com", "password": f"senha{i}",
+         "user_type": "patient", "name": f"Usuário {i}"}
+        for i in range(count)
+    ]
+    return data
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=2000, help="usuários extras no arquivo de seeds")
+    parser.add_argument("--sample", type=int, default=8, help="amostra para medir o custo do bcrypt")
+    parser.add_argument("--rounds", type=int, default=12, help="custo do bcrypt")
+    args = parser.parse_args()
+
+    data = _seeds_with_users(args.users)
+    total = len(data["users"])
+    fd, path = tempfile.mkstemp(suffix='.json')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+        load_s = _timed(lambda: SeedLoader.load(path))
+
+        # main cria a aplicação ao ser importado, lendo seed_loader.SEEDS_FILE
+        import flask  # noqa: F401  (fora da medição)
+        with mock.patch.object(seed_loader, "SEEDS_FILE", path):
+            app_s = _timed(lambda: importlib.import_module("main"))
+    finally:
+        os.unlink(path)
+
+    sample = [{"password": f"senha{i}"} for i in range(args.sample)]
+    per_hash = _timed(lambda: [bcrypt.hashpw(u["password"].encode(), bcrypt.gensalt(args.rounds)) for u in sample]) / args.sample
+    migration_s = _timed(lambda: hash_seed_users([dict(u) for u in sample], args.rounds)) / args.sample
+
+    print(f"usuários nos seeds:            {total}")
+    print(f"SeedLoader.load:               {load_s * 1000:10.1f} ms")
+    print(f"import main (create_app):      {app_s * 1000:10.1f} ms")
+    print(f"bcrypt no boot (antigo, est.): {per_hash * total * 1000:10.1f} ms  ({per_hash * 1000:.1f} ms/usuário, custo {args.rounds})")
+    print(f"migração paralela (est.):      {migration_s * total * 1000:10.1f} ms  ({os.cpu_count()} threads)")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ Ponto de entrada da aplicação Synapse.
 Configura e inicializa o servidor Flask com todos os serviços e rotas.
 """
 
+import os
 from flask import Flask, jsonify, render_template, session, redirect, request, url_for
 from functools import wraps
 from synapse.services.seed_loader import SeedLoader
@@ -16,12 +17,28 @@ from synapse.repositories.implementations.inmemory_availability_repository impor
 
 # Services
 from synapse.services.auth_service import AuthService
+from synapse.services.password_hasher import PasswordHasher
+from synapse.services.token_service import TokenService
 from synapse.services.patient_service import PatientService
 from synapse.services.psychologist_service import PsychologistService
 from synapse.services.appointment_service import AppointmentService
 from synapse.services.clinic_service import ClinicService
 from synapse.services.lead_service import LeadService
 from synapse.services.availability_service import AvailabilityService
+from synapse.services.export_service import ExportService
+from synapse.services.import_service import ImportService
+from synapse.services.events import EventBus
+from synapse.services.jobs import JobQueue
+from synapse.services.mailer import FileMailer
+from synapse.services.appointment_notifier import AppointmentNotifier
+from synapse.services.appointment_scheduler import AppointmentScheduler
+from synapse.services.slot_holds import SlotHolds
+from synapse.services.waitlist import WaitlistService
+from synapse.services.clinic_metrics import ClinicMetrics
+from synapse.services.psychologist_agenda import PsychologistAgendas
+from synapse.services.lead_analytics import LeadAnalyticsService
+from synapse.services.utilization import UtilizationReport
+from synapse.services.live_updates import LiveUpdates
 
 # Controllers
 from synapse.controllers.auth_controller import create_auth_routes
@@ -31,8 +48,18 @@ from synapse.controllers.appointment_controller import create_appointment_routes
 from synapse.controllers.clinic_controller import create_clinic_routes
 from synapse.controllers.lead_controller import create_lead_routes
 from synapse.controllers.availability_controller import create_availability_routes
+from synapse.controllers.batch_controller import create_batch_routes
+from synapse.controllers.export_controller import create_export_routes
+from synapse.controllers.import_controller import create_import_routes
+from synapse.controllers.metrics_controller import create_metrics_routes
+from synapse.controllers.analytics_controller import create_analytics_routes
+from synapse.controllers.waitlist_controller import create_waitlist_routes
+from synapse.controllers.stream_controller import create_stream_routes
 
 from synapse.api.response import ApiResponse
+from synapse.api.compression import ResponseCompressor
+from synapse.api.rate_limit import RateLimiter, rate_limited, client_ip, login_email
+from synapse.api.idempotency import IdempotencyStore
 
 
 def login_required(user_type=None):
@@ -63,10 +90,14 @@ def login_required(user_type=None):
     return decorator
 
 
-def create_app():
+def create_app(start_workers: bool = True):
     """
     Factory function para criar e configurar a aplicação Flask.
     
+    Args:
+        start_workers: Inicia as threads de background (fila de jobs,
+            expiração de reservas e conclusão automática de consultas)
+    
     Returns:
         Flask: Aplicação configurada
     """
@@ -77,6 +108,45 @@ def create_app():
     
     app.secret_key = 'synapse-dev-secret-key-2025'
 
+    # Configuração padrão; sobrescrita por variáveis SYNAPSE_* (ex: SYNAPSE_BCRYPT_ROUNDS=10)
+    app.config.from_mapping(
+        BCRYPT_ROUNDS=12,
+        AUTH_HASH_WORKERS=2,
+        AUTH_HASH_QUEUE=16,
+        AUTH_HASH_TIMEOUT=5.0,
+        AUTH_TOKEN_TTL=3600,
+        AUTH_TOKEN_CACHE_SIZE=1024,
+        # Limites de taxa: [rajada, segundos para repor a rajada]
+        RATE_LIMIT_LOGIN_IP=[20, 60],
+        RATE_LIMIT_LOGIN_EMAIL=[5, 300],
+        RATE_LIMIT_BOOKING_IP=[30, 60],
+        # Threads dos inscritos de eventos em background
+        EVENT_WORKERS=2,
+        # Fila de jobs em disco e emails gravados como .eml
+        JOBS_DIR=os.path.join(app.root_path, 'var', 'jobs'),
+        JOB_WORKERS=2,
+        JOB_MAX_ATTEMPTS=5,
+        JOB_LEASE=300,
+        MAIL_DIR=os.path.join(app.root_path, 'var', 'mail'),
+        # Conclui automaticamente as consultas no horário de término
+        APPOINTMENT_AUTO_COMPLETE=True,
+        # Validade (s) das reservas de horário durante o agendamento
+        SLOT_HOLD_TTL=300,
+        # Respostas guardadas por Idempotency-Key nas rotas de criação
+        IDEMPOTENCY_TTL=86400,
+        IDEMPOTENCY_MAX_KEYS=10000,
+        # Streams SSE: mensagens pendentes por conexão e intervalo (s) de keepalive
+        LIVE_QUEUE_SIZE=100,
+        LIVE_KEEPALIVE=15.0,
+        # Streams SSE simultâneos: cada um ocupa uma thread do servidor
+        LIVE_MAX_STREAMS=100,
+        LIVE_MAX_STREAMS_PER_IP=5,
+    )
+    app.config.from_prefixed_env('SYNAPSE')
+
+    # Compressão gzip/deflate de JSON e arquivos estáticos
+    ResponseCompressor(min_size=1024, level=6, cache_size=128).init_app(app)
+
     # =========================================================================
     # INICIALIZAÇÃO DOS REPOSITÓRIOS
     # =========================================================================
@@ -93,28 +163,117 @@ def create_app():
     # =========================================================================
     # INICIALIZAÇÃO DOS SERVIÇOS
     # =========================================================================
-    auth_service = AuthService(user_repo)
-    patient_service = PatientService(patient_repo)
-    psychologist_service = PsychologistService(psychologist_repo)
+    password_hasher = PasswordHasher(
+        rounds=app.config['BCRYPT_ROUNDS'],
+        max_workers=app.config['AUTH_HASH_WORKERS'],
+        max_queue=app.config['AUTH_HASH_QUEUE'],
+        timeout=app.config['AUTH_HASH_TIMEOUT'],
+    )
+    token_service = TokenService(
+        app.secret_key,
+        ttl=app.config['AUTH_TOKEN_TTL'],
+        cache_size=app.config['AUTH_TOKEN_CACHE_SIZE'],
+    )
+    # Eventos de domínio publicados pelos serviços após cada escrita
+    events = EventBus(max_workers=app.config['EVENT_WORKERS'])
+
+    # Agregados dos dashboards e relatórios, mantidos pelos eventos (inscritos síncronos)
+    clinic_metrics = ClinicMetrics()
+    clinic_metrics.rebuild(lead_repo.all(), appointment_repo.all(), psychologist_repo.all())
+    clinic_metrics.subscribe(events)
+    psychologist_agendas = PsychologistAgendas()
+    psychologist_agendas.rebuild(appointment_repo.all())
+    psychologist_agendas.subscribe(events)
+    utilization = UtilizationReport(availability_repo)
+    utilization.rebuild(appointment_repo.all())
+    utilization.subscribe(events)
+    live_updates = LiveUpdates(
+        max_queue=app.config['LIVE_QUEUE_SIZE'],
+        keepalive=app.config['LIVE_KEEPALIVE'],
+    )
+    live_updates.subscribe(events)
+    
+    auth_service = AuthService(user_repo, password_hasher, token_service)
+    patient_service = PatientService(patient_repo, events)
+    psychologist_service = PsychologistService(psychologist_repo, events)
     clinic_service = ClinicService(clinic_repo)
-    lead_service = LeadService(lead_repo)
+    lead_service = LeadService(lead_repo, events)
     
-    availability_service = AvailabilityService(availability_repo, psychologist_repo)
+    availability_service = AvailabilityService(availability_repo, psychologist_repo, events)
     
+    # Reservas publicam eventos (horários ao vivo); a thread expira as vencidas no prazo
+    slot_holds = SlotHolds(ttl=app.config['SLOT_HOLD_TTL'], events=events)
+    if start_workers:
+        slot_holds.start()
+
     appointment_service = AppointmentService(
-        appointment_repo, patient_repo, psychologist_repo, availability_repo
+        appointment_repo, patient_repo, psychologist_repo, availability_repo,
+        psychologist_agendas, events, slot_holds
+    )
+    
+    export_service = ExportService(appointment_repo, lead_repo, patient_repo)
+    import_service = ImportService(lead_repo, patient_repo, chunk_size=1000, max_errors=100,
+                                   events=events)
+
+    # Efeitos lentos saem da requisição: os eventos enfileiram jobs executados pelos workers
+    job_queue = JobQueue(
+        app.config['JOBS_DIR'],
+        workers=app.config['JOB_WORKERS'],
+        max_attempts=app.config['JOB_MAX_ATTEMPTS'],
+        lease=app.config['JOB_LEASE'],
+    )
+    mailer = FileMailer(app.config['MAIL_DIR'])
+    AppointmentNotifier(patient_repo, psychologist_repo, mailer, job_queue).subscribe(events)
+    if start_workers:
+        job_queue.start()
+
+    if start_workers and app.config['APPOINTMENT_AUTO_COMPLETE']:
+        appointment_scheduler = AppointmentScheduler(appointment_service)
+        appointment_scheduler.rebuild(appointment_repo.iter_all())
+        appointment_scheduler.subscribe(events)
+        appointment_scheduler.start()
+
+    # Horários liberados por cancelamentos vão primeiro para a lista de espera.
+    # Inscrito por último: os demais inscritos veem o cancelamento antes do novo agendamento
+    waitlist_service = WaitlistService(appointment_service, events)
+    waitlist_service.subscribe(events)
+    lead_analytics = LeadAnalyticsService(lead_repo)
+
+    # Os logins (API e formulário) compartilham os mesmos limites
+    login_limits = [
+        (RateLimiter(*app.config['RATE_LIMIT_LOGIN_IP']), client_ip),
+        (RateLimiter(*app.config['RATE_LIMIT_LOGIN_EMAIL']), login_email),
+    ]
+    booking_limits = [
+        (RateLimiter(*app.config['RATE_LIMIT_BOOKING_IP']), client_ip),
+    ]
+    # Retentativas de clientes (timeouts) não criam registros duplicados
+    idempotency = IdempotencyStore(
+        max_keys=app.config['IDEMPOTENCY_MAX_KEYS'],
+        ttl=app.config['IDEMPOTENCY_TTL'],
     )
 
     # =========================================================================
     # REGISTRO DOS BLUEPRINTS (ROTAS DA API)
     # =========================================================================
-    app.register_blueprint(create_auth_routes(auth_service))
-    app.register_blueprint(create_patient_routes(patient_service))
-    app.register_blueprint(create_psychologist_routes(psychologist_service))
-    app.register_blueprint(create_appointment_routes(appointment_service))
+    app.register_blueprint(create_auth_routes(auth_service, login_limits))
+    app.register_blueprint(create_patient_routes(patient_service, idempotency))
+    app.register_blueprint(create_psychologist_routes(psychologist_service, appointment_service, auth_service))
+    app.register_blueprint(create_appointment_routes(appointment_service, booking_limits, idempotency))
+    app.register_blueprint(create_waitlist_routes(waitlist_service))
     app.register_blueprint(create_clinic_routes(clinic_service))
-    app.register_blueprint(create_lead_routes(lead_service))
+    app.register_blueprint(create_lead_routes(lead_service, idempotency))
     app.register_blueprint(create_availability_routes(availability_service))
+    app.register_blueprint(create_batch_routes(max_requests=20, max_workers=4))
+    app.register_blueprint(create_export_routes(export_service, max_concurrent=2))
+    app.register_blueprint(create_import_routes(import_service))
+    app.register_blueprint(create_metrics_routes(clinic_metrics, auth_service, job_queue))
+    app.register_blueprint(create_analytics_routes(lead_analytics, utilization, auth_service))
+    app.register_blueprint(create_stream_routes(
+        live_updates, psychologist_service, auth_service,
+        max_streams=app.config['LIVE_MAX_STREAMS'],
+        max_streams_per_ip=app.config['LIVE_MAX_STREAMS_PER_IP'],
+    ))
 
     # =========================================================================
     # ROTAS DE VIEWS (FRONTEND)
@@ -164,6 +323,7 @@ def create_app():
         return render_template('clinic_dashboard.html')
 
     @app.route("/auth/login", methods=["POST"])
+    @rate_limited(login_limits)
     def do_login():
         """Processa login via formulário e cria session."""
         email = request.form.get('email')
@@ -229,8 +389,17 @@ def create_app():
     return app
 
 
+def _reloader_parent() -> bool:
+    """
+    Processo que só vigia os arquivos no modo debug: ``app.run(debug=True)``
+    executa o script de novo em um processo filho (WERKZEUG_RUN_MAIN=true),
+    que é quem atende as requisições e deve executar os workers.
+    """
+    return __name__ == "__main__" and os.environ.get('WERKZEUG_RUN_MAIN') != 'true'
+
+
 # Criar instância da aplicação
-app = create_app()
+app = create_app(start_workers=not _reloader_parent())
 
 if __name__ == "__main__":
     app.run(debug=True)
@@ -0,0 +1,66 @@
+"""
+Autenticação das rotas da API.
+Aceita token bearer assinado ou, como fallback, a session das páginas HTML.
+"""
+
+from functools import wraps
+from typing import Dict, Optional
+from flask import g, request, session
+from synapse.services.auth_service import AuthService
+from synapse.api.response import ApiResponse
+
+
+def _bearer_token() -> Optional[str]:
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower() != 'bearer' or not token.strip():
+        return None
+    return token.strip()
+
+
+def resolve_identity(auth_service: AuthService) -> Optional[Dict]:
+    """
+    Identifica o usuário da requisição sem consultar repositórios.
+
+    Returns:
+        Dict com user_id, user_type e name, ou None se não autenticado
+    """
+    token = _bearer_token()
+    if token is not None:
+        claims = auth_service.verify_token(token)
+        if claims is None:
+            return None
+        return {"user_id": claims["sub"], "user_type": claims["type"], "name": claims.get("name")}
+
+    if 'user_id' in session:
+        return {"user_id": session['user_id'], "user_type": session.get('user_type'), "name": session.get('user_name')}
+    return None
+
+
+def current_identity() -> Optional[Dict]:
+    """Identidade resolvida por ``auth_required`` na requisição atual."""
+    return g.get('identity')
+
+
+def auth_required(auth_service: AuthService, user_type: str = None):
+    """
+    Decorator que protege rotas da API.
+
+    Um cabeçalho Authorization presente e inválido não cai no fallback da
+    session: a requisição é recusada com 401.
+
+    Args:
+        auth_service: Serviço de autenticação (verificação dos tokens)
+        user_type: Tipo de usuário permitido ou None para qualquer
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            identity = resolve_identity(auth_service)
+            if identity is None:
+                return ApiResponse.unauthorized("Autenticação necessária")
+            if user_type and identity["user_type"] != user_type:
+                return ApiResponse.forbidden("Acesso não permitido para este tipo de usuário")
+            g.identity = identity
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
@@ -0,0 +1,123 @@
+"""
+Compressão de respostas HTTP (gzip/deflate) com negociação via Accept-Encoding.
+Mantém um cache dos corpos já comprimidos, indexado pelo ETag da resposta.
+"""
+
+import gzip
+import threading
+import zlib
+from collections import OrderedDict
+from flask import request
+
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/javascript",
+    "text/html",
+    "text/css",
+    "text/javascript",
+    "text/plain",
+    "text/csv",
+    "application/x-ndjson",
+    "image/svg+xml",
+}
+
+
+class ResponseCompressor:
+    """
+    Comprime respostas elegíveis em um hook ``after_request``.
+
+    Respostas com ETag (listas e itens da API, arquivos estáticos) são
+    comprimidas uma única vez por versão: o resultado fica em um cache LRU
+    indexado por (ETag, codificação). Ao comprimir, o ETag passa a ser fraco
+    (``W/"..."``), já que os bytes da representação mudam.
+
+    Attributes:
+        min_size: Tamanho mínimo do corpo (bytes) para comprimir
+        level: Nível de compressão (1-9)
+        cache_size: Número máximo de corpos comprimidos em cache
+    """
+
+    def __init__(self, min_size: int = 1024, level: int = 6, cache_size: int = 128):
+        self.min_size = min_size
+        self.level = level
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        app.after_request(self.compress)
+
+    def _negotiate(self):
+        accepted = request.accept_encodings
+        for encoding in ("gzip", "deflate"):
+            if accepted[encoding]:
+                return encoding
+        return None
+
+    def _encode(self, data: bytes, encoding: str) -> bytes:
+        if encoding == "gzip":
+            return gzip.compress(data, compresslevel=self.level, mtime=0)
+        return zlib.compress(data, self.level)
+
+    def _cached_encode(self, etag: str, data: bytes, encoding: str) -> bytes:
+        key = (etag, encoding)
+        with self._lock:
+            body = self._cache.get(key)
+            if body is not None:
+                self._cache.move_to_end(key)
+                return body
+        body = self._encode(data, encoding)
+        with self._lock:
+            self._cache[key] = body
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return body
+
+    def _stream(self, chunks, encoding: str):
+        wbits = 31 if encoding == "gzip" else 15
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, wbits)
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+
+    def compress(self, response):
+        if (response.status_code != 200
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES
+                or "Content-Encoding" in response.headers):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        encoding = self._negotiate()
+        if encoding is None:
+            return response
+
+        if response.is_streamed and not response.direct_passthrough:
+            response.response = self._stream(response.response, encoding)
+            response.headers["Content-Encoding"] = encoding
+            response.headers.pop("Content-Length", None)
+            # A representação comprimida não é idêntica byte a byte: a ETag forte vira fraca
+            etag, _ = response.get_etag()
+            if etag:
+                response.set_etag(etag, weak=True)
+            return response
+
+        # Arquivos estáticos chegam como passthrough; lê o conteúdo para comprimir
+        response.direct_passthrough = False
+        data = response.get_data()
+        if len(data) < self.min_size:
+            return response
+
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            body = self._cached_encode(etag, data, encoding)
+        else:
+            body = self._encode(data, encoding)
+
+        response.set_data(body)
+        response.headers["Content-Encoding"] = encoding
+        if etag:
+            response.set_etag(etag, weak=True)
+        return response
@@ -1,10 +1,48 @@
 """
 Data Transfer Objects (DTOs) para validação de entrada/saída da API.
 Utiliza Pydantic para validação automática e documentação.
+
+As regras de campo usam restrições nativas do pydantic-core (StringConstraints,
+Field(ge/le/gt)) em vez de field_validators em Python. As mensagens em
+português de cada regra ficam em FIELD_ERROR_MESSAGES.
 """
 
-from pydantic import BaseModel, EmailStr, field_validator
-from typing import Optional, List
+from pydantic import BaseModel, EmailStr, Field, StringConstraints
+from typing import Optional, List, Annotated, Any, Literal
+from datetime import date
+
+
+# =============================================================================
+# TIPOS RESTRITOS
+# =============================================================================
+
+NonEmptyStr = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
+PhoneStr = Annotated[str, StringConstraints(min_length=8)]
+CrpStr = Annotated[str, StringConstraints(pattern=r"/")]
+TimeStr = Annotated[str, StringConstraints(pattern=r"^([01]?[0-9]|2[0-3]):[0-5]?[0-9]$")]
+
+# Mensagens por (campo, tipo de erro do pydantic-core)
+FIELD_ERROR_MESSAGES = {
+    ("name", "string_too_short"): "Nome não pode ser vazio",
+    ("phone", "string_too_short"): "Telefone deve ter pelo menos 8 caracteres",
+    ("crp", "string_pattern_mismatch"): "CRP deve estar no formato XX/XXXXX",
+    ("hourly_rate", "greater_than"): "Valor hora deve ser positivo",
+    ("day_of_week", "greater_than_equal"): "Dia da semana deve ser entre 0 (Segunda) e 6 (Domingo)",
+    ("day_of_week", "less_than_equal"): "Dia da semana deve ser entre 0 (Segunda) e 6 (Domingo)",
+    ("start_time", "string_pattern_mismatch"): "Horário deve estar no formato HH:MM",
+    ("end_time", "string_pattern_mismatch"): "Horário deve estar no formato HH:MM",
+    ("duration", "greater_than_equal"): "Duração deve ser entre 15 e 180 minutos",
+    ("duration", "less_than_equal"): "Duração deve ser entre 15 e 180 minutos",
+    ("path", "string_pattern_mismatch"): "Caminho deve começar com /api/",
+    ("limit", "greater_than_equal"): "Limite deve ser entre 1 e 50",
+    ("limit", "less_than_equal"): "Limite deve ser entre 1 e 50",
+    ("format", "literal_error"): "Formato deve ser 'csv' ou 'ndjson'",
+    ("start", "date_from_datetime_parsing"): "Data deve estar no formato AAAA-MM-DD",
+    ("end", "date_from_datetime_parsing"): "Data deve estar no formato AAAA-MM-DD",
+    ("date", "date_from_datetime_parsing"): "Data deve estar no formato AAAA-MM-DD",
+    ("psychologist_id", "int_parsing"): "ID do psicólogo deve ser um número inteiro",
+    ("granularity", "literal_error"): "Granularidade deve ser 'day', 'week' ou 'month'",
+}
 
 
 # =============================================================================
@@ -20,6 +58,8 @@ class AuthLoginDTO(BaseModel):
 class AuthResponseDTO(BaseModel):
     """DTO para resposta de autenticação."""
     token: str
+    token_type: str = "Bearer"
+    expires_in: int
     user_id: int
     name: str
     user_type: str
@@ -31,24 +71,10 @@ class AuthResponseDTO(BaseModel):
 
 class PatientCreateDTO(BaseModel):
     """DTO para criação de paciente."""
-    name: str
+    name: NonEmptyStr
     email: EmailStr
-    phone: str
+    phone: PhoneStr
     cpf: Optional[str] = None
-    
-    @field_validator('name')
-    @classmethod
-    def name_not_empty(cls, v):
-        if not v or not v.strip():
-            raise ValueError('Nome não pode ser vazio')
-        return v.strip()
-    
-    @field_validator('phone')
-    @classmethod
-    def phone_valid(cls, v):
-        if not v or len(v) < 8:
-            raise ValueError('Telefone deve ter pelo menos 8 caracteres')
-        return v
 
 
 class PatientUpdateDTO(BaseModel):
@@ -77,25 +103,11 @@ class PsychologistCreateDTO(BaseModel):
     """DTO para criação de psicólogo."""
     user_id: int
     name: str
-    crp: str
+    crp: CrpStr
     specialty: str
-    hourly_rate: float
+    hourly_rate: float = Field(gt=0)
     themes: Optional[List[str]] = None
     bio: Optional[str] = ""
-    
-    @field_validator('crp')
-    @classmethod
-    def crp_valid(cls, v):
-        if not v or '/' not in v:
-            raise ValueError('CRP deve estar no formato XX/XXXXX')
-        return v
-    
-    @field_validator('hourly_rate')
-    @classmethod
-    def rate_positive(cls, v):
-        if v <= 0:
-            raise ValueError('Valor hora deve ser positivo')
-        return v
 
 
 class PsychologistUpdateDTO(BaseModel):
@@ -129,17 +141,10 @@ class PsychologistResponseDTO(BaseModel):
 class ClinicCreateDTO(BaseModel):
     """DTO para criação de clínica."""
     user_id: int
-    name: str
+    name: NonEmptyStr
     address: str
     phone: str
     email: EmailStr
-    
-    @field_validator('name')
-    @classmethod
-    def name_not_empty(cls, v):
-        if not v or not v.strip():
-            raise ValueError('Nome não pode ser vazio')
-        return v.strip()
 
 
 class ClinicUpdateDTO(BaseModel):
@@ -168,30 +173,9 @@ class ClinicResponseDTO(BaseModel):
 class AvailabilityCreateDTO(BaseModel):
     """DTO para criação de disponibilidade."""
     psychologist_id: int
-    day_of_week: int  # 0=Segunda, 6=Domingo
-    start_time: str   # HH:MM
-    end_time: str     # HH:MM
-    
-    @field_validator('day_of_week')
-    @classmethod
-    def day_valid(cls, v):
-        if v < 0 or v > 6:
-            raise ValueError('Dia da semana deve ser entre 0 (Segunda) e 6 (Domingo)')
-        return v
-    
-    @field_validator('start_time', 'end_time')
-    @classmethod
-    def time_format(cls, v):
-        try:
-            parts = v.split(':')
-            if len(parts) != 2:
-                raise ValueError()
-            h, m = int(parts[0]), int(parts[1])
-            if h < 0 or h > 23 or m < 0 or m > 59:
-                raise ValueError()
-        except:
-            raise ValueError('Horário deve estar no formato HH:MM')
-        return v
+    day_of_week: int = Field(ge=0, le=6)  # 0=Segunda, 6=Domingo
+    start_time: TimeStr   # HH:MM
+    end_time: TimeStr     # HH:MM
 
 
 class AvailabilityUpdateDTO(BaseModel):
@@ -221,15 +205,29 @@ class AppointmentCreateDTO(BaseModel):
     psychologist_id: int
     date: str   # yyyy-mm-dd
     time: str   # HH:MM
-    duration: int = 60
+    duration: int = Field(default=60, ge=15, le=180)
     notes: Optional[str] = None
-    
-    @field_validator('duration')
-    @classmethod
-    def duration_valid(cls, v):
-        if v < 15 or v > 180:
-            raise ValueError('Duração deve ser entre 15 e 180 minutos')
-        return v
+    hold_id: Optional[str] = None
+
+
+class SlotHoldCreateDTO(BaseModel):
+    """DTO para reserva temporária de horário."""
+    patient_id: int
+    psychologist_id: int
+    date: str   # yyyy-mm-dd
+    time: str   # HH:MM
+    duration: int = Field(default=60, ge=15, le=180)
+
+
+class WaitlistJoinDTO(BaseModel):
+    """DTO para inclusão na lista de espera."""
+    patient_id: int
+    psychologist_id: int
+    date: str   # yyyy-mm-dd
+    start_time: TimeStr
+    end_time: TimeStr
+    duration: int = Field(default=60, ge=15, le=180)
+    auto_book: bool = False
 
 
 class AppointmentUpdateDTO(BaseModel):
@@ -264,24 +262,28 @@ class AvailableSlotsRequestDTO(BaseModel):
     duration: int = 60
 
 
+class SlotStreamQueryDTO(BaseModel):
+    """DTO para a assinatura de horários de um psicólogo em uma data (query string)."""
+    psychologist_id: int
+    date: date
+
+
+class AgendaStreamQueryDTO(BaseModel):
+    """DTO para a assinatura de agenda (query string)."""
+    psychologist_id: Optional[int] = None
+
+
 # =============================================================================
 # LEAD DTOs
 # =============================================================================
 
 class LeadCreateDTO(BaseModel):
     """DTO para criação de lead."""
-    name: str
+    name: NonEmptyStr
     email: EmailStr
     phone: str
     source: str
     notes: Optional[str] = None
-    
-    @field_validator('name')
-    @classmethod
-    def name_not_empty(cls, v):
-        if not v or not v.strip():
-            raise ValueError('Nome não pode ser vazio')
-        return v.strip()
 
 
 class LeadUpdateDTO(BaseModel):
@@ -319,3 +321,64 @@ class LeadResponseDTO(BaseModel):
     created_at: str
     converted_at: Optional[str] = None
     converted_to_patient_id: Optional[int] = None
+
+
+# =============================================================================
+# BATCH DTOs
+# =============================================================================
+
+class BatchSubRequestDTO(BaseModel):
+    """DTO para uma sub-requisição do endpoint de lote."""
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"]
+    path: Annotated[str, StringConstraints(pattern=r"^/api/")]
+    body: Optional[Any] = None
+
+
+class BatchRequestDTO(BaseModel):
+    """DTO para requisição de lote."""
+    requests: List[BatchSubRequestDTO] = Field(min_length=1)
+
+
+# =============================================================================
+# DASHBOARD DTOs
+# =============================================================================
+
+class PsychologistSummaryQueryDTO(BaseModel):
+    """DTO para os parâmetros do resumo do psicólogo (query string)."""
+    limit: int = Field(default=5, ge=1, le=50)
+
+
+class LeadAnalyticsQueryDTO(BaseModel):
+    """DTO para os filtros do funil de leads (query string)."""
+    granularity: Literal["day", "week", "month"] = "week"
+    start: Optional[date] = None
+    end: Optional[date] = None
+    source: Optional[str] = None
+
+
+class UtilizationQueryDTO(BaseModel):
+    """DTO para os filtros do relatório de ocupação (query string)."""
+    start: Optional[date] = None
+    end: Optional[date] = None
+    psychologist_id: Optional[int] = None
+
+
+# =============================================================================
+# EXPORT DTOs
+# =============================================================================
+
+class ExportQueryDTO(BaseModel):
+    """DTO para os filtros de exportação (query string)."""
+    format: Literal["csv", "ndjson"] = "csv"
+    start: Optional[date] = None
+    end: Optional[date] = None
+    status: Optional[str] = None
+
+
+# =============================================================================
+# IMPORT DTOs
+# =============================================================================
+
+class ImportQueryDTO(BaseModel):
+    """DTO para as opções de importação (query string)."""
+    format: Optional[Literal["csv", "ndjson"]] = None
@@ -46,3 +46,11 @@ class BusinessRuleError(SynapseException):
     
     def __init__(self, message: str):
         super().__init__(message, code="BUSINESS_RULE_VIOLATION")
+
+
+class ServiceUnavailableError(SynapseException):
+    """Exceção lançada quando um recurso limitado está saturado (ex: pool de hash de senhas)."""
+    
+    def __init__(self, message: str, retry_after: int = 1):
+        self.retry_after = retry_after
+        super().__init__(message, code="SERVICE_UNAVAILABLE")
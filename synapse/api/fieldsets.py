@@ -0,0 +1,99 @@
+"""
+Projeção de campos (?fields=) e embutimento de recursos relacionados (?include=).
+Permite que os clientes reduzam o payload e evitem requisições N+1.
+"""
+
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+from synapse.api.exceptions import ValidationError
+from synapse.api.response import ApiResponse
+from synapse.business_model.serializable import SerializableEntity, encode_json
+
+
+def _split(value: Optional[str]) -> Tuple[str, ...]:
+    if not value:
+        return ()
+    return tuple(dict.fromkeys(part.strip() for part in value.split(',') if part.strip()))
+
+
+def parse_fields(args: Mapping, allowed: Iterable[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Lê o parâmetro ``fields`` (ex: ``?fields=id,name``).
+
+    Args:
+        args: Query params
+        allowed: Campos da entidade (ver ``SerializableEntity.FIELDS``)
+
+    Returns:
+        Tupla com os campos pedidos ou None para todos os campos
+
+    Raises:
+        ValidationError: Se algum campo não existir na entidade
+    """
+    fields = _split(args.get('fields'))
+    allowed = tuple(allowed)
+    for name in fields:
+        if name not in allowed:
+            raise ValidationError(f"Campo '{name}' não existe. Use: {', '.join(allowed)}", "fields")
+    return fields or None
+
+
+def parse_include(args: Mapping, allowed: Iterable[str]) -> Tuple[str, ...]:
+    """
+    Lê o parâmetro ``include`` (ex: ``?include=patient,psychologist``).
+
+    Raises:
+        ValidationError: Se algum relacionamento não for suportado
+    """
+    include = _split(args.get('include'))
+    allowed = tuple(allowed)
+    for name in include:
+        if name not in allowed:
+            raise ValidationError(
+                f"Relacionamento '{name}' não suportado. Use: {', '.join(allowed) or 'nenhum'}",
+                "include"
+            )
+    return include
+
+
+def shape(entity: SerializableEntity, fields: Optional[Tuple[str, ...]] = None,
+          related: Dict = None) -> Dict:
+    """
+    Monta o dicionário de saída de uma entidade.
+
+    Args:
+        entity: Entidade serializável
+        fields: Campos a manter (None para todos)
+        related: {nome: (atributo_fk, {id: entidade})} de recursos a embutir
+    """
+    data = entity.to_cached_dict()
+    if fields:
+        out = {name: data[name] for name in fields if name in data}
+    else:
+        out = dict(data)
+    for name, (foreign_key, by_id) in (related or {}).items():
+        target = by_id.get(getattr(entity, foreign_key))
+        out[name] = target.to_cached_dict() if target is not None else None
+    return out
+
+
+def render_entity(entity: SerializableEntity, fields: Optional[Tuple[str, ...]] = None,
+                  related: Dict = None):
+    """Resposta de item único, usando o JSON memoizado quando não há projeção."""
+    if not fields and not related:
+        return ApiResponse.entity(entity)
+    return ApiResponse.success(shape(entity, fields, related))
+
+
+def render_list(entities: Iterable[SerializableEntity], fields: Optional[Tuple[str, ...]] = None,
+                related: Dict = None):
+    """Resposta de lista, usando os fragmentos memoizados quando não há projeção."""
+    if not fields and not related:
+        return ApiResponse.entity_list(entities)
+    return ApiResponse.list_response([shape(e, fields, related) for e in entities])
+
+
+def stream_serializer(fields: Optional[Tuple[str, ...]] = None):
+    """Serializador para ApiResponse.stream_list que respeita a projeção."""
+    if not fields:
+        return None
+    return lambda entity: encode_json(shape(entity, fields))
@@ -0,0 +1,180 @@
+"""
+Chaves de idempotência (cabeçalho Idempotency-Key) para rotas de criação.
+Uma requisição repetida com a mesma chave recebe a resposta original, sem
+nova validação nem nova chamada ao serviço.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import List, Optional, Tuple
+from flask import Response, make_response, request, session
+from synapse.api.response import ApiResponse
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+class _Entry:
+    """Resultado (ou execução em andamento) de uma chave."""
+    __slots__ = ("fingerprint", "expires_at", "done", "response")
+
+    def __init__(self, fingerprint: str, expires_at: float):
+        self.fingerprint = fingerprint
+        self.expires_at = expires_at
+        self.done = threading.Event()
+        self.response: Optional[Tuple[int, bytes, List[Tuple[str, str]]]] = None
+
+
+class IdempotencyStore:
+    """
+    Armazena as respostas por chave de idempotência, com limite de tamanho e TTL.
+
+    As entradas ficam em ordem de criação; como todas têm o mesmo TTL, as
+    mais antigas são as primeiras a vencer e o despejo (por validade ou por
+    excesso de chaves) sempre retira do início.
+
+    A primeira requisição de uma chave a executa; requisições concorrentes
+    com a mesma chave esperam pelo resultado dela. Se a execução falhar
+    (exceção ou erro 5xx) a chave é liberada e a próxima tentativa executa
+    de novo.
+
+    Attributes:
+        max_keys: Máximo de chaves armazenadas
+        ttl: Validade (s) de cada chave
+        wait_timeout: Espera máxima (s) por uma execução em andamento
+    """
+
+    def __init__(self, max_keys: int = 10000, ttl: float = 86400, wait_timeout: float = 30.0):
+        self.max_keys = max_keys
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def begin(self, key: str, fingerprint: str) -> Tuple[_Entry, bool]:
+        """
+        Registra a chave ou retorna a entrada existente.
+
+        Returns:
+            Tuple (entrada, True se esta requisição deve executar)
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._evict(now)
+            entry = self._entries.get(key)
+            if entry is not None:
+                return entry, False
+            entry = _Entry(fingerprint, now + self.ttl)
+            self._entries[key] = entry
+            return entry, True
+
+    def finish(self, entry: _Entry, response: Optional[Tuple[int, bytes, List[Tuple[str, str]]]],
+               key: str) -> None:
+        """
+        Conclui uma execução, guardando a resposta ou liberando a chave (None).
+        """
+        entry.response = response
+        if response is None:
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+        entry.done.set()
+
+    def _evict(self, now: float) -> None:
+        entries = self._entries
+        while entries:
+            key, entry = next(iter(entries.items()))
+            if entry.expires_at > now and len(entries) < self.max_keys:
+                break
+            del entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _caller() -> str:
+    """
+    Identifica quem envia a requisição, para que chaves iguais de clientes
+    diferentes não compartilhem respostas: token bearer (pelo hash), usuário
+    da session ou, sem autenticação, o IP.
+    """
+    authorization = request.headers.get('Authorization')
+    if authorization:
+        return "token:" + hashlib.sha256(authorization.encode()).hexdigest()
+    if 'user_id' in session:
+        return f"user:{session['user_id']}"
+    return f"ip:{request.remote_addr}"
+
+
+def _fingerprint() -> str:
+    digest = hashlib.sha256(request.method.encode())
+    digest.update(request.path.encode())
+    digest.update(request.get_data())
+    return digest.hexdigest()
+
+
+def _replay(stored: Tuple[int, bytes, List[Tuple[str, str]]]) -> Response:
+    status, body, headers = stored
+    response = Response(body, status=status, headers=headers)
+    response.headers["Idempotent-Replayed"] = "true"
+    return response
+
+
+def idempotent(store: Optional[IdempotencyStore]):
+    """
+    Decorator que aplica o cabeçalho Idempotency-Key a uma rota de criação.
+
+    Requisições sem o cabeçalho seguem normalmente. As chaves valem por
+    cliente (ver ``_caller``). Respostas 5xx e 429 não são armazenadas.
+    Reusar uma chave com outro corpo ou em outra rota resulta em 422.
+
+    Args:
+        store: Armazenamento das respostas. Sem ele, a rota fica inalterada.
+    """
+
+    def decorator(f):
+        if store is None:
+            return f
+
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            key = request.headers.get(HEADER)
+            if not key:
+                return f(*args, **kwargs)
+            if len(key) > MAX_KEY_LENGTH:
+                return ApiResponse.validation_error(
+                    f"Deve ter no máximo {MAX_KEY_LENGTH} caracteres", HEADER)
+
+            fingerprint = _fingerprint()
+            # Método e rota entram só na impressão digital: a mesma chave em
+            # outra rota é reuso (422), não uma chave nova
+            scoped_key = f"{_caller()} {key}"
+            deadline = time.monotonic() + store.wait_timeout
+            while True:
+                entry, owner = store.begin(scoped_key, fingerprint)
+                if owner:
+                    break
+                if entry.fingerprint != fingerprint:
+                    return ApiResponse.error(
+                        "Idempotency-Key já usada com outra requisição", "IDEMPOTENCY_KEY_REUSED", 422)
+                if not entry.done.wait(max(0.0, deadline - time.monotonic())):
+                    return ApiResponse.error(
+                        "Requisição com esta Idempotency-Key ainda em processamento", "CONFLICT", 409)
+                if entry.response is not None:
+                    return _replay(entry.response)
+                # A execução original falhou: tenta executar de novo
+
+            stored = None
+            try:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code < 500 and response.status_code != 429 and not response.is_streamed:
+                    stored = (response.status_code, response.get_data(),
+                              [(k, v) for k, v in response.headers.items() if k != "Content-Length"])
+                return response
+            finally:
+                store.finish(entry, stored, scoped_key)
+        return decorated_function
+    return decorator
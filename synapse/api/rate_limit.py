@@ -0,0 +1,113 @@
+"""
+Limitação de taxa em memória (token bucket).
+Recusa com 429 antes de qualquer validação ou hash de senha.
+"""
+
+import math
+import threading
+import time
+from functools import wraps
+from typing import Callable, Iterable, Optional, Tuple
+from flask import request
+from synapse.api.response import ApiResponse
+
+# Chave compartilhada pelas requisições cuja chave não pôde ser extraída
+UNKNOWN_KEY = "unknown"
+
+
+class RateLimiter:
+    """
+    Token bucket por chave.
+
+    Cada chave tem até ``capacity`` fichas, repostas continuamente à taxa de
+    ``capacity / period`` por segundo; cada requisição consome uma. O estado
+    por chave é um par (fichas, último acesso). Periodicamente as chaves cujo
+    balde já estaria cheio são descartadas, pois recriá-las dá o mesmo
+    resultado.
+
+    Attributes:
+        capacity: Rajada máxima por chave
+        period: Segundos para repor o balde inteiro
+    """
+
+    def __init__(self, capacity: int, period: float, eviction_interval: float = 60.0):
+        self.capacity = capacity
+        self.period = period
+        self._rate = capacity / period
+        self._eviction_interval = eviction_interval
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._next_eviction = time.monotonic() + eviction_interval
+
+    def hit(self, key: str) -> Tuple[bool, int]:
+        """
+        Consome uma ficha da chave.
+
+        Returns:
+            Tuple (permitido, segundos até a próxima ficha)
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now >= self._next_eviction:
+                self._evict(now)
+            tokens, last = self._buckets.get(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - last) * self._rate)
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                return True, 0
+            self._buckets[key] = (tokens, now)
+        return False, max(1, math.ceil((1 - tokens) / self._rate))
+
+    def _evict(self, now: float) -> None:
+        self._buckets = {k: v for k, v in self._buckets.items() if now - v[1] < self.period}
+        self._next_eviction = now + self._eviction_interval
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+def client_ip() -> Optional[str]:
+    """Chave por endereço IP do cliente."""
+    return request.remote_addr or None
+
+
+def login_email() -> Optional[str]:
+    """Chave pelo email enviado no login (JSON ou formulário), sem validá-lo."""
+    if request.is_json:
+        data = request.get_json(silent=True)
+        email = data.get('email') if isinstance(data, dict) else None
+    else:
+        email = request.form.get('email')
+    if not isinstance(email, str) or not email.strip():
+        return None
+    return email.strip().lower()
+
+
+def rate_limited(rules: Optional[Iterable[Tuple[RateLimiter, Callable[[], Optional[str]]]]]):
+    """
+    Decorator que aplica limites de taxa a uma rota.
+
+    Args:
+        rules: Pares (limitador, função que extrai a chave da requisição).
+            Chaves None caem em um balde comum (UNKNOWN_KEY), para que uma
+            requisição sem chave não escape do limite. Sem regras, a rota
+            fica inalterada.
+    """
+    rules = list(rules or [])
+
+    def decorator(f):
+        if not rules:
+            return f
+
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            for limiter, key_func in rules:
+                key = key_func()
+                if key is None:
+                    key = UNKNOWN_KEY
+                allowed, retry_after = limiter.hit(key)
+                if not allowed:
+                    return ApiResponse.too_many_requests(retry_after)
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
@@ -3,8 +3,17 @@ Classe ApiResponse para padronização de respostas da API.
 Garante formato consistente em todas as respostas HTTP.
 """
 
-from typing import Any, Optional, List, Dict
-from flask import jsonify
+import hashlib
+import os
+from typing import Any, Optional, List, Dict, Iterable, Callable
+from flask import jsonify, current_app, Response, request, make_response
+from synapse.business_model.serializable import SerializableEntity, encode_json
+
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Diferencia ETags entre execuções: as versões em memória recomeçam do zero a cada boot
+_ETAG_SALT = os.urandom(8).hex()
 
 
 class ApiResponse:
@@ -119,6 +128,35 @@ class ApiResponse:
         """Atalho para resposta 422 de erro de regra de negócio."""
         return ApiResponse.error(message, "BUSINESS_RULE_VIOLATION", 422)
     
+    @staticmethod
+    def unauthorized(message: str):
+        """Atalho para resposta 401 Unauthorized."""
+        response, status_code = ApiResponse.error(message, "UNAUTHORIZED", 401)
+        response.headers["WWW-Authenticate"] = "Bearer"
+        return response, status_code
+    
+    @staticmethod
+    def forbidden(message: str):
+        """Atalho para resposta 403 Forbidden."""
+        return ApiResponse.error(message, "FORBIDDEN", 403)
+    
+    @staticmethod
+    def too_many_requests(retry_after: int):
+        """Atalho para resposta 429 Too Many Requests."""
+        response, status_code = ApiResponse.error(
+            "Muitas requisições. Tente novamente em instantes.", "TOO_MANY_REQUESTS", 429
+        )
+        response.headers["Retry-After"] = str(retry_after)
+        return response, status_code
+    
+    @staticmethod
+    def service_unavailable(message: str, retry_after: int = None):
+        """Atalho para resposta 503 Service Unavailable."""
+        response, status_code = ApiResponse.error(message, "SERVICE_UNAVAILABLE", 503)
+        if retry_after:
+            response.headers["Retry-After"] = str(retry_after)
+        return response, status_code
+    
     @staticmethod
     def list_response(items: List, total: int = None):
         """
@@ -138,3 +176,123 @@ class ApiResponse:
         if total is not None:
             data["total"] = total
         return ApiResponse.success(data)
+
+    @staticmethod
+    def entity(entity: SerializableEntity, message: str = None, status_code: int = 200):
+        """
+        Cria uma resposta de sucesso a partir do JSON memoizado de uma entidade.
+        
+        Args:
+            entity: Entidade serializável
+            message: Mensagem opcional de sucesso
+            status_code: Código HTTP (default 200)
+            
+        Returns:
+            Tuple de (response, status_code)
+        """
+        body = b'{"data":' + entity.to_json()
+        if message:
+            body += b',"message":' + encode_json(message)
+        body += b',"success":true}'
+        return current_app.response_class(body, mimetype="application/json"), status_code
+    
+    @staticmethod
+    def entity_list(entities: Iterable[SerializableEntity], total: int = None):
+        """
+        Cria uma resposta de lista concatenando os fragmentos JSON memoizados
+        de cada entidade, sem reserializar as que não mudaram.
+        
+        Args:
+            entities: Entidades serializáveis
+            total: Total de itens (para paginação futura)
+            
+        Returns:
+            Tuple de (response, status_code)
+        """
+        fragments = [e.to_json() for e in entities]
+        body = b'{"data":{"count":' + str(len(fragments)).encode("ascii")
+        body += b',"items":[' + b",".join(fragments) + b"]"
+        if total is not None:
+            body += b',"total":' + str(total).encode("ascii")
+        body += b'},"success":true}'
+        return current_app.response_class(body, mimetype="application/json"), 200
+
+    @staticmethod
+    def stream_list(entities: Iterable[SerializableEntity], serialize: Callable = None):
+        """
+        Cria uma resposta de lista transmitida em partes (chunked).
+        
+        O envelope padrão é emitido incrementalmente à medida que o iterável
+        é consumido, em blocos de até STREAM_CHUNK_SIZE bytes; a lista
+        completa nunca fica em memória. Como o total só é conhecido ao
+        final, "count" é emitido depois de "items".
+        
+        Args:
+            entities: Iterável (idealmente um gerador) de entidades serializáveis
+            serialize: Função entidade -> bytes JSON (default: to_json memoizado)
+            
+        Returns:
+            Tuple de (response, status_code)
+        """
+        encode = serialize or (lambda entity: entity.to_json())
+        
+        def generate():
+            buffer = bytearray(b'{"success":true,"data":{"items":[')
+            count = 0
+            for entity in entities:
+                if count:
+                    buffer += b","
+                buffer += encode(entity)
+                count += 1
+                if len(buffer) >= STREAM_CHUNK_SIZE:
+                    yield bytes(buffer)
+                    buffer.clear()
+            buffer += b'],"count":' + str(count).encode("ascii") + b"}}"
+            yield bytes(buffer)
+        
+        return Response(generate(), mimetype="application/json"), 200
+
+    @staticmethod
+    def etag(version_key: Any) -> str:
+        """
+        Gera um ETag forte a partir da chave de versão e da URL da requisição
+        (a query string muda o conteúdo, ex: ?fields= e ?include=).
+        """
+        raw = f"{_ETAG_SALT}|{request.full_path}|{version_key!r}".encode("utf-8")
+        return hashlib.sha1(raw).hexdigest()
+    
+    @staticmethod
+    def conditional(version_key: Any, build: Callable[[], Any], private: bool = False):
+        """
+        Responde a um GET condicional.
+        
+        Se o ETag derivado de ``version_key`` constar em ``If-None-Match``,
+        retorna 304 sem chamar ``build`` (nenhuma serialização acontece).
+        Caso contrário, chama ``build`` e anexa o ETag à resposta.
+        
+        Args:
+            version_key: Valor que muda sempre que o conteúdo muda
+                (versão da coleção ou da entidade)
+            build: Função que monta a resposta completa
+            private: Resposta restrita ao usuário autenticado: não pode ser
+                guardada por caches compartilhados e varia com as credenciais
+                (a chave de versão deve identificar o usuário quando o
+                conteúdo depende dele)
+            
+        Returns:
+            Response
+        """
+        etag = ApiResponse.etag(version_key)
+        # Comparação fraca: a compressão torna o ETag fraco (W/"...")
+        if request.if_none_match.contains_weak(etag):
+            response = current_app.response_class(status=304)
+        else:
+            response = make_response(build())
+            if response.status_code != 200:
+                return response
+        response.set_etag(etag)
+        response.cache_control.no_cache = True
+        if private:
+            response.cache_control.private = True
+            response.vary.update(("Authorization", "Cookie"))
+        return response
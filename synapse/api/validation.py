@@ -0,0 +1,95 @@
+"""
+Camada de validação dos DTOs.
+Reaproveita TypeAdapters compilados e traduz erros do Pydantic para o formato da API.
+"""
+
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Tuple, Type, TypeVar
+from pydantic import BaseModel, TypeAdapter, ValidationError as PydanticValidationError
+from synapse.api.dto import FIELD_ERROR_MESSAGES
+
+M = TypeVar('M', bound=BaseModel)
+
+
+@lru_cache(maxsize=None)
+def get_adapter(model: Type[M]) -> TypeAdapter:
+    """Retorna o TypeAdapter (schema já compilado) de um DTO."""
+    return TypeAdapter(model)
+
+
+@lru_cache(maxsize=None)
+def get_list_adapter(model: Type[M]) -> TypeAdapter:
+    """Retorna o TypeAdapter de List[DTO], que valida um lote em uma única chamada ao pydantic-core."""
+    return TypeAdapter(List[model])
+
+
+def validate(model: Type[M], data: Any) -> M:
+    """
+    Valida um payload contra um DTO.
+
+    Args:
+        model: Classe do DTO
+        data: Payload (dict) recebido na requisição
+
+    Returns:
+        Instância validada do DTO
+
+    Raises:
+        pydantic.ValidationError: Se o payload for inválido
+    """
+    return get_adapter(model).validate_python(data)
+
+
+def error_details(error: PydanticValidationError) -> Tuple[str, Optional[str]]:
+    """
+    Extrai (mensagem, campo) do primeiro erro de validação.
+
+    Regras com mensagem em FIELD_ERROR_MESSAGES usam o texto em português;
+    as demais mantêm a mensagem do Pydantic.
+    """
+    errors = error.errors(include_url=False)
+    if not errors:
+        return "Dados inválidos", None
+    return _describe(errors[0])
+
+
+def _describe(err: dict, skip: int = 0) -> Tuple[str, Optional[str]]:
+    loc = err['loc'][skip:]
+    field = loc[0] if loc else None
+    # Em DTOs aninhados a regra pertence ao campo mais interno
+    name = next((part for part in reversed(loc) if isinstance(part, str)), None)
+    message = FIELD_ERROR_MESSAGES.get((name, err['type']), err['msg'])
+    return message, field
+
+
+def validate_many(model: Type[M], items: Iterable[Any]) -> Tuple[List[Tuple[int, M]], List[Tuple[int, str, Optional[str]]]]:
+    """
+    Valida um lote de payloads.
+
+    O lote inteiro é validado em uma única chamada ao pydantic-core. Se houver
+    falhas, os itens válidos são revalidados em uma segunda chamada, sem os
+    inválidos.
+
+    Args:
+        model: Classe do DTO
+        items: Payloads a validar
+
+    Returns:
+        Tuple de (válidos, erros): válidos é uma lista de (índice, dto) e
+        erros uma lista de (índice, mensagem, campo), com um erro por item
+    """
+    items = list(items)
+    adapter = get_list_adapter(model)
+    try:
+        return list(enumerate(adapter.validate_python(items))), []
+    except PydanticValidationError as e:
+        failures = {}
+        for err in e.errors(include_url=False):
+            index = err['loc'][0]
+            if index not in failures:
+                message, field = _describe(err, skip=1)
+                failures[index] = (index, message, field)
+
+    valid_indexes = [i for i in range(len(items)) if i not in failures]
+    valid = adapter.validate_python([items[i] for i in valid_indexes])
+    return list(zip(valid_indexes, valid)), sorted(failures.values())
@@ -1,7 +1,21 @@
-from datetime import datetime, date, time as dtime
-from typing import Optional, Dict
+from datetime import datetime, date, time as dtime, timedelta
+from typing import Optional, Dict, NamedTuple
+from synapse.business_model.serializable import SerializableEntity
+
+class AppointmentState(NamedTuple):
+    """Fotografia imutável dos campos de uma consulta usados em agregados."""
+    id: Optional[int]
+    patient_id: int
+    psychologist_id: int
+    date: date
+    time: dtime
+    status: str
+    duration: int = 60
+
+class Appointment(SerializableEntity):
+    FIELDS = ("id", "patient_id", "psychologist_id", "date", "time",
+              "duration", "status", "notes", "created_at", "cancelled_at", "cancellation_reason")
 
-class Appointment:
     def __init__(self, patient_id: int, psychologist_id: int, date: date, time: dtime, duration: int = 60, notes: Optional[str] = None, id: Optional[int]=None, status: str="scheduled", created_at: Optional[datetime]=None, cancelled_at: Optional[datetime]=None, cancellation_reason: Optional[str]=None):
         self.id = id
         self.patient_id = patient_id
@@ -42,6 +56,12 @@ class Appointment:
     def get_datetime(self):
         return datetime.combine(self.date, self.time)
 
+    def get_end_datetime(self):
+        return self.get_datetime() + timedelta(minutes=self.duration)
+
+    def snapshot(self) -> AppointmentState:
+        return AppointmentState(self.id, self.patient_id, self.psychologist_id, self.date, self.time, self.status, self.duration)
+
     def to_dict(self) -> Dict:
         return {
             "id": self.id,
@@ -1,7 +1,10 @@
 from datetime import time as dtime
 from typing import Optional, Dict
+from synapse.business_model.serializable import SerializableEntity
+
+class Availability(SerializableEntity):
+    FIELDS = ("id", "psychologist_id", "day_of_week", "start_time", "end_time", "is_active")
 
-class Availability:
     def __init__(self, psychologist_id: int, day_of_week: int, start_time: dtime, end_time: dtime, id: Optional[int]=None, is_active: bool=True):
         self.id = id
         self.psychologist_id = psychologist_id
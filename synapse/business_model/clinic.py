@@ -1,7 +1,10 @@
 from datetime import datetime
 from typing import Optional, Dict
+from synapse.business_model.serializable import SerializableEntity
+
+class Clinic(SerializableEntity):
+    FIELDS = ("id", "user_id", "name", "address", "phone", "email", "created_at")
 
-class Clinic:
     def __init__(self, user_id: int, name: str, address: str, phone: str, email: str, id: Optional[int]=None, created_at: Optional[datetime]=None):
         self.id = id
         self.user_id = user_id
@@ -1,7 +1,11 @@
 from datetime import datetime
 from typing import Optional, Dict
+from synapse.business_model.serializable import SerializableEntity
+
+class Lead(SerializableEntity):
+    FIELDS = ("id", "name", "email", "phone", "source",
+              "status", "notes", "created_at", "converted_at", "converted_to_patient_id")
 
-class Lead:
     def __init__(self, name: str, email: str, phone: str, source: str, notes: Optional[str]=None, status: str="new", id: Optional[int]=None, created_at: Optional[datetime]=None, converted_at: Optional[datetime]=None, converted_to_patient_id: Optional[int]=None):
         self.id = id
         self.name = name
@@ -1,7 +1,10 @@
 from datetime import datetime
 from typing import Optional, Dict
+from synapse.business_model.serializable import SerializableEntity
+
+class Patient(SerializableEntity):
+    FIELDS = ("id", "name", "email", "phone", "cpf", "created_at")
 
-class Patient:
     def __init__(self, name: str, email: str, phone: str, cpf: Optional[str] = None, id: Optional[int]=None, created_at: Optional[datetime]=None):
         self.id = id
         self.name = name
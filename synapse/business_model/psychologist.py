@@ -1,7 +1,11 @@
 from datetime import datetime
 from typing import List, Optional, Dict
+from synapse.business_model.serializable import SerializableEntity
+
+class Psychologist(SerializableEntity):
+    FIELDS = ("id", "user_id", "name", "crp", "specialty",
+              "themes", "bio", "hourly_rate", "is_active", "created_at")
 
-class Psychologist:
     def __init__(self, user_id: int, name: str, crp: str, specialty: str, hourly_rate: float, themes: Optional[List[str]] = None,
                  bio: str = "", id: Optional[int]=None, is_active: bool = True, created_at: Optional[datetime]=None):
         self.id = id
@@ -0,0 +1,59 @@
+import json
+from typing import Dict, Tuple
+
+
+def encode_json(data) -> bytes:
+    """Codifica um valor no mesmo formato compacto usado por jsonify."""
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=True).encode("ascii")
+
+
+class SerializableEntity:
+    """
+    Mixin que memoiza a forma serializada de uma entidade.
+
+    O cache é descartado sempre que um atributo público é reatribuído
+    (ex: ``lead.status = "converted"``) ou quando o repositório chama
+    ``invalidate_cache()`` no ``update``. Mutações in-place em listas
+    (ex: ``psychologist.themes.append(...)``) só são percebidas no ``update``.
+    Cada invalidação incrementa ``version``, usada na geração de ETags.
+
+    ``FIELDS`` lista as chaves de ``to_dict`` (campos aceitos em ``?fields=``).
+    """
+    FIELDS: Tuple[str, ...] = ()
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if not name.startswith("_"):
+            self.invalidate_cache()
+
+    @property
+    def version(self) -> int:
+        return self.__dict__.get("_version", 0)
+
+    def to_dict(self) -> Dict:
+        raise NotImplementedError
+
+    def invalidate_cache(self) -> None:
+        self.__dict__.pop("_serialized", None)
+        self.__dict__["_version"] = self.__dict__.get("_version", 0) + 1
+
+    def _cached(self):
+        cached = self.__dict__.get("_serialized")
+        if cached is None:
+            version = self.version
+            cached = [self.to_dict(), None]
+            # Não memoiza se a entidade mudou durante a serialização
+            if self.version == version:
+                self.__dict__["_serialized"] = cached
+        return cached
+
+    def to_cached_dict(self) -> Dict:
+        """Retorna o ``to_dict()`` memoizado. O dicionário é compartilhado: não o modifique."""
+        return self._cached()[0]
+
+    def to_json(self) -> bytes:
+        """Retorna o JSON (bytes) memoizado da entidade."""
+        cached = self._cached()
+        if cached[1] is None:
+            cached[1] = encode_json(cached[0])
+        return cached[1]
@@ -1,27 +1,38 @@
+import hmac
 from datetime import datetime
 from typing import Optional, Dict
-import bcrypt
+from synapse.business_model.serializable import SerializableEntity
 
-class User:
-    def __init__(self, email: str, password: str, user_type: str, name: str, id: Optional[int]=None, password_hash: Optional[str]=None, created_at: Optional[datetime]=None):
+# Hash que nunca corresponde a uma senha (usuário sem senha definida)
+UNUSABLE_PASSWORD = "!"
+
+class User(SerializableEntity):
+    def __init__(self, email: str, password: Optional[str], user_type: str, name: str, id: Optional[int]=None, password_hash: Optional[str]=None, created_at: Optional[datetime]=None):
         self.id = id
         self.email = email
         self.user_type = user_type
         self.name = name
         self.created_at = created_at or datetime.now()
-        if password_hash:
-            self.password_hash = password_hash
-        else:
-            self.password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode()
+        # Nunca calcula bcrypt aqui: senha em texto puro (seeds) fica pendente
+        # e é convertida em hash no primeiro login bem-sucedido
+        self._pending_password = None if password_hash else password
+        self.password_hash = password_hash or UNUSABLE_PASSWORD
+
+    @property
+    def has_pending_password(self) -> bool:
+        return self._pending_password is not None
+
+    def check_pending_password(self, password) -> bool:
+        if self._pending_password is None:
+            return False
+        return hmac.compare_digest(password.encode('utf-8'), self._pending_password.encode('utf-8'))
 
-    def check_password(self, password):
-        return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
+    def set_password_hash(self, password_hash: str):
+        self.password_hash = password_hash
+        self._pending_password = None
 
-    def update_password(self, old_password, new_password):
-        if self.check_password(old_password) and len(new_password) >= 8:
-            self.password_hash = bcrypt.hashpw(new_password.encode('utf-8'), bcrypt.gensalt()).decode()
-            return True
-        return False
+    # Verificação e geração de hashes ficam no AuthService (PasswordHasher):
+    # bcrypt roda no pool dedicado e com o custo configurado
 
     def get_role(self):
         return self.user_type
@@ -41,5 +52,5 @@ class User:
         if data.get("created_at") and not isinstance(data["created_at"], datetime):
             data["created_at"] = datetime.fromisoformat(data["created_at"])
         password_hash = data.pop("password_hash", None)
-        password = data.pop("password", "dummy")
+        password = data.pop("password", None)
         return cls(password_hash=password_hash, password=password, **data)
@@ -0,0 +1,105 @@
+"""
+Controller de analytics.
+Expõe os relatórios agregados da clínica (funil de leads e ocupação).
+"""
+
+from datetime import date, timedelta
+from flask import Blueprint, request
+from pydantic import ValidationError as PydanticValidationError
+from synapse.services.auth_service import AuthService
+from synapse.services.lead_analytics import LeadAnalyticsService
+from synapse.services.utilization import UtilizationReport
+from synapse.api.auth import auth_required
+from synapse.api.dto import LeadAnalyticsQueryDTO, UtilizationQueryDTO
+from synapse.api.response import ApiResponse
+from synapse.api.validation import validate, error_details
+
+bp = Blueprint('analytics', __name__, url_prefix='/api/analytics')
+
+# Maior intervalo aceito pelo relatório de ocupação
+MAX_UTILIZATION_DAYS = 3 * 366
+
+
+def create_analytics_routes(lead_analytics: LeadAnalyticsService, utilization: UtilizationReport,
+                            auth_service: AuthService):
+    """
+    Registra as rotas de analytics no blueprint.
+
+    Args:
+        lead_analytics: Serviço do funil de leads
+        utilization: Relatório de ocupação dos psicólogos
+        auth_service: Serviço de autenticação (rotas restritas à clínica)
+
+    Returns:
+        Blueprint: Blueprint configurado com as rotas
+    """
+
+    @bp.route('/leads', methods=['GET'])
+    @auth_required(auth_service, user_type='clinic')
+    def get_lead_funnel():
+        """
+        Funil de leads por origem e período.
+
+        Query Params:
+            granularity: 'day', 'week' (default) ou 'month'
+            start: Primeiro dia de criação (yyyy-mm-dd, opcional)
+            end: Último dia de criação (yyyy-mm-dd, opcional)
+            source: Filtrar por origem (opcional)
+
+        Returns:
+            JSON com series (período x origem) e by_source, com contagens
+            por status, taxa de conversão e mediana de horas até a conversão
+        """
+        try:
+            dto = validate(LeadAnalyticsQueryDTO, request.args.to_dict())
+        except PydanticValidationError as e:
+            return ApiResponse.validation_error(*error_details(e))
+
+        if dto.start and dto.end and dto.start > dto.end:
+            return ApiResponse.validation_error("Data inicial deve ser anterior à data final", "start")
+
+        return ApiResponse.conditional(
+            (lead_analytics.get_version(), dto.granularity, dto.start, dto.end, dto.source),
+            lambda: ApiResponse.success(
+                lead_analytics.funnel(dto.granularity, dto.start, dto.end, dto.source)
+            ),
+            private=True
+        )
+
+    @bp.route('/utilization', methods=['GET'])
+    @auth_required(auth_service, user_type='clinic')
+    def get_utilization():
+        """
+        Ocupação (minutos agendados / ofertados) por semana ISO.
+
+        Query Params:
+            start: Primeiro dia (yyyy-mm-dd, default: segunda-feira desta semana)
+            end: Último dia (yyyy-mm-dd, default: quatro semanas a partir de start)
+            psychologist_id: Restringir a um psicólogo (opcional)
+
+        Returns:
+            JSON com weeks (total da clínica e by_psychologist por semana),
+            psychologists (totais por psicólogo) e clinic (total do intervalo)
+        """
+        try:
+            dto = validate(UtilizationQueryDTO, request.args.to_dict())
+        except PydanticValidationError as e:
+            return ApiResponse.validation_error(*error_details(e))
+
+        today = date.today()
+        start = dto.start or today - timedelta(days=today.weekday())
+        end = dto.end or start + timedelta(days=27)
+        if start > end:
+            return ApiResponse.validation_error("Data inicial deve ser anterior à data final", "start")
+        if (end - start).days >= MAX_UTILIZATION_DAYS:
+            return ApiResponse.validation_error(
+                f"Intervalo deve ter no máximo {MAX_UTILIZATION_DAYS} dias", "end"
+            )
+
+        return ApiResponse.conditional(
+            (utilization.version(), start, end, dto.psychologist_id),
+            lambda: ApiResponse.success(utilization.report(start, end, dto.psychologist_id)),
+            private=True
+        )
+
+    return bp
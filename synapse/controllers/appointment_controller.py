@@ -5,24 +5,33 @@ Define as rotas HTTP para operações de agendamento.
 
 from flask import Blueprint, request
 from pydantic import ValidationError as PydanticValidationError
+from synapse.business_model.appointment import Appointment
 from synapse.services.appointment_service import AppointmentService
 from synapse.api.dto import (
     AppointmentCreateDTO, 
     AppointmentCancelDTO,
-    AvailableSlotsRequestDTO
+    AvailableSlotsRequestDTO,
+    SlotHoldCreateDTO
 )
 from synapse.api.response import ApiResponse
+from synapse.api.validation import validate, error_details
+from synapse.api.fieldsets import parse_fields, parse_include, render_entity, render_list, stream_serializer
+from synapse.api.rate_limit import rate_limited
+from synapse.api.idempotency import IdempotencyStore, idempotent
 from synapse.api.exceptions import NotFoundError, ValidationError, ConflictError, BusinessRuleError
 
 bp = Blueprint('appointments', __name__, url_prefix='/api/appointments')
 
 
-def create_appointment_routes(appointment_service: AppointmentService):
+def create_appointment_routes(appointment_service: AppointmentService, booking_limits=None,
+                              idempotency: IdempotencyStore = None):
     """
     Registra as rotas de consultas no blueprint.
     
     Args:
         appointment_service: Instância do serviço de consultas
+        booking_limits: Regras (limitador, chave) aplicadas ao agendamento (opcional)
+        idempotency: Respostas por Idempotency-Key do agendamento (opcional)
         
     Returns:
         Blueprint: Blueprint configurado com as rotas
@@ -36,6 +45,9 @@ def create_appointment_routes(appointment_service: AppointmentService):
         Query Params:
             patient_id: Filtrar por paciente (opcional)
             psychologist_id: Filtrar por psicólogo (opcional)
+            stream: Se 'true', transmite a lista em partes (chunked)
+            fields: Campos a retornar, separados por vírgula (opcional)
+            include: Relacionamentos a embutir: patient, psychologist (opcional)
             
         Returns:
             JSON com lista de consultas
@@ -43,14 +55,34 @@ def create_appointment_routes(appointment_service: AppointmentService):
         patient_id = request.args.get('patient_id', type=int)
         psychologist_id = request.args.get('psychologist_id', type=int)
         
-        if patient_id:
-            appointments = appointment_service.get_by_patient(patient_id)
-        elif psychologist_id:
-            appointments = appointment_service.get_by_psychologist(psychologist_id)
-        else:
-            appointments = appointment_service.get_all()
-            
-        return ApiResponse.list_response([a.to_dict() for a in appointments])
+        try:
+            fields = parse_fields(request.args, Appointment.FIELDS)
+            include = parse_include(request.args, AppointmentService.RELATIONS)
+        except ValidationError as e:
+            return ApiResponse.validation_error(e.message, e.field)
+        
+        if request.args.get('stream', 'false').lower() == 'true':
+            if include:
+                return ApiResponse.validation_error("include não é suportado com stream=true", "include")
+            return ApiResponse.conditional(
+                appointment_service.get_version(),
+                lambda: ApiResponse.stream_list(
+                    appointment_service.iter_all(patient_id=patient_id, psychologist_id=psychologist_id),
+                    stream_serializer(fields)
+                )
+            )
+        
+        def build():
+            if patient_id:
+                appointments = appointment_service.get_by_patient(patient_id)
+            elif psychologist_id:
+                appointments = appointment_service.get_by_psychologist(psychologist_id)
+            else:
+                appointments = appointment_service.get_all()
+            related = appointment_service.get_related(appointments, include)
+            return render_list(appointments, fields, related)
+        
+        return ApiResponse.conditional(appointment_service.get_version(), build)
 
     @bp.route('/<int:appointment_id>', methods=['GET'])
     def get_appointment(appointment_id: int):
@@ -60,16 +92,32 @@ def create_appointment_routes(appointment_service: AppointmentService):
         Args:
             appointment_id: ID da consulta
             
+        Query Params:
+            fields: Campos a retornar, separados por vírgula (opcional)
+            include: Relacionamentos a embutir: patient, psychologist (opcional)
+            
         Returns:
             JSON com dados da consulta ou erro 404
         """
         try:
+            fields = parse_fields(request.args, Appointment.FIELDS)
+            include = parse_include(request.args, AppointmentService.RELATIONS)
             appointment = appointment_service.get_by_id(appointment_id)
-            return ApiResponse.success(appointment.to_dict())
+        except ValidationError as e:
+            return ApiResponse.validation_error(e.message, e.field)
         except NotFoundError:
             return ApiResponse.not_found("Consulta", appointment_id)
+        
+        def build():
+            related = appointment_service.get_related([appointment], include)
+            return render_entity(appointment, fields, related)
+        
+        version = (appointment.version, appointment_service.get_version() if include else None)
+        return ApiResponse.conditional(version, build)
 
     @bp.route('', methods=['POST'])
+    @idempotent(idempotency)
+    @rate_limited(booking_limits)
     def create_appointment():
         """
         Agenda uma nova consulta.
@@ -81,6 +129,7 @@ def create_appointment_routes(appointment_service: AppointmentService):
             time: Horário da consulta (HH:MM)
             duration: Duração em minutos (default: 60)
             notes: Observações (opcional)
+            hold_id: Reserva do horário (POST /holds), que garante o agendamento (opcional)
             
         Returns:
             JSON com dados da consulta agendada ou erro
@@ -88,12 +137,9 @@ def create_appointment_routes(appointment_service: AppointmentService):
         data = request.get_json()
         
         try:
-            dto = AppointmentCreateDTO(**data)
+            dto = validate(AppointmentCreateDTO, data)
         except PydanticValidationError as e:
-            errors = e.errors()
-            if errors:
-                return ApiResponse.validation_error(errors[0]['msg'], errors[0]['loc'][0])
-            return ApiResponse.validation_error("Dados inválidos")
+            return ApiResponse.validation_error(*error_details(e))
         
         try:
             appointment = appointment_service.schedule_appointment(
@@ -102,7 +148,8 @@ def create_appointment_routes(appointment_service: AppointmentService):
                 date_str=dto.date,
                 time_str=dto.time,
                 duration=dto.duration,
-                notes=dto.notes
+                notes=dto.notes,
+                hold_id=dto.hold_id
             )
             return ApiResponse.created(appointment.to_dict(), "Consulta agendada com sucesso")
         except NotFoundError as e:
@@ -114,6 +161,60 @@ def create_appointment_routes(appointment_service: AppointmentService):
         except BusinessRuleError as e:
             return ApiResponse.business_error(e.message)
 
+    @bp.route('/holds', methods=['POST'])
+    @rate_limited(booking_limits)
+    def create_hold():
+        """
+        Reserva um horário por alguns minutos durante o agendamento.
+        
+        Body:
+            patient_id: ID do paciente
+            psychologist_id: ID do psicólogo
+            date: Data (yyyy-mm-dd)
+            time: Horário (HH:MM)
+            duration: Duração em minutos (default: 60)
+            
+        Returns:
+            JSON com hold_id e expires_at, ou erro (409 se o horário estiver ocupado)
+        """
+        data = request.get_json()
+        
+        try:
+            dto = validate(SlotHoldCreateDTO, data)
+        except PydanticValidationError as e:
+            return ApiResponse.validation_error(*error_details(e))
+        
+        try:
+            hold = appointment_service.hold_slot(
+                dto.patient_id, dto.psychologist_id, dto.date, dto.time, dto.duration
+            )
+            return ApiResponse.created(hold.to_dict(), "Horário reservado")
+        except NotFoundError as e:
+            return ApiResponse.not_found(e.resource, e.resource_id)
+        except ValidationError as e:
+            return ApiResponse.validation_error(e.message, e.field)
+        except ConflictError as e:
+            return ApiResponse.conflict(e.message)
+        except BusinessRuleError as e:
+            return ApiResponse.business_error(e.message)
+
+    @bp.route('/holds/<hold_id>', methods=['DELETE'])
+    def release_hold(hold_id: str):
+        """
+        Libera uma reserva antes do prazo.
+        
+        Args:
+            hold_id: ID da reserva
+            
+        Returns:
+            204 No Content ou erro 404
+        """
+        try:
+            appointment_service.release_hold(hold_id)
+            return ApiResponse.no_content()
+        except NotFoundError:
+            return ApiResponse.not_found("Reserva", hold_id)
+
     @bp.route('/<int:appointment_id>', methods=['DELETE'])
     def delete_appointment(appointment_id: int):
         """
@@ -148,9 +249,9 @@ def create_appointment_routes(appointment_service: AppointmentService):
         data = request.get_json() or {}
         
         try:
-            dto = AppointmentCancelDTO(**data)
-        except PydanticValidationError:
-            return ApiResponse.validation_error("Dados inválidos")
+            dto = validate(AppointmentCancelDTO, data)
+        except PydanticValidationError as e:
+            return ApiResponse.validation_error(*error_details(e))
         
         try:
             appointment = appointment_service.cancel_appointment(
@@ -198,12 +299,9 @@ def create_appointment_routes(appointment_service: AppointmentService):
         data = request.get_json()
         
         try:
-            dto = AvailableSlotsRequestDTO(**data)
+            dto = validate(AvailableSlotsRequestDTO, data)
         except PydanticValidationError as e:
-            errors = e.errors()
-            if errors:
-                return ApiResponse.validation_error(errors[0]['msg'], errors[0]['loc'][0])
-            return ApiResponse.validation_error("Dados inválidos")
+            return ApiResponse.validation_error(*error_details(e))
         
         slots = appointment_service.get_available_slots(
             dto.psychologist_id, 
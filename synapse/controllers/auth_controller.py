@@ -1,25 +1,46 @@
 from flask import Blueprint, request, jsonify
 from synapse.api.dto import AuthLoginDTO, AuthResponseDTO
 from synapse.services.auth_service import AuthService
+from synapse.api.validation import validate
+from synapse.api.exceptions import ServiceUnavailableError
+from synapse.api.auth import auth_required, current_identity
+from synapse.api.rate_limit import rate_limited
 
 bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
-def create_auth_routes(auth_service: AuthService):
+def create_auth_routes(auth_service: AuthService, login_limits=None):
     @bp.route('/login', methods=['POST'])
+    @rate_limited(login_limits)
     def login():
         data = request.get_json()
         try:
-            dto = AuthLoginDTO(**data)
+            dto = validate(AuthLoginDTO, data)
         except Exception as e:
             return jsonify({'error': 'Dados inválidos'}), 400
-        user = auth_service.login(dto.email, dto.password)
+        try:
+            user = auth_service.login(dto.email, dto.password)
+        except ServiceUnavailableError as e:
+            response = jsonify({'error': e.message})
+            response.headers['Retry-After'] = str(e.retry_after)
+            return response, 503
         if not user:
             return jsonify({'error': 'Credenciais inválidas'}), 401
         response = AuthResponseDTO(
-            token="fake-token-123",
+            token=auth_service.issue_token(user),
+            expires_in=auth_service.token_service.ttl,
             user_id=user.id,
             name=user.name,
             user_type=user.user_type
         )
         return jsonify(response.dict()), 200
+
+    @bp.route('/me', methods=['GET'])
+    @auth_required(auth_service)
+    def me():
+        identity = current_identity()
+        return jsonify({
+            'user_id': identity['user_id'],
+            'name': identity['name'],
+            'user_type': identity['user_type']
+        }), 200
     return bp
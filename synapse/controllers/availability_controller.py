@@ -5,9 +5,12 @@ Define as rotas HTTP para operações CRUD de disponibilidades de psicólogos.
 
 from flask import Blueprint, request
 from pydantic import ValidationError as PydanticValidationError
+from synapse.business_model.availability import Availability
 from synapse.services.availability_service import AvailabilityService
 from synapse.api.dto import AvailabilityCreateDTO, AvailabilityUpdateDTO
 from synapse.api.response import ApiResponse
+from synapse.api.validation import validate, error_details
+from synapse.api.fieldsets import parse_fields, parse_include, render_entity, render_list
 from synapse.api.exceptions import NotFoundError, ValidationError, ConflictError
 
 bp = Blueprint('availabilities', __name__, url_prefix='/api/availabilities')
@@ -31,18 +34,29 @@ def create_availability_routes(availability_service: AvailabilityService):
         
         Query Params:
             psychologist_id: Filtrar por psicólogo (opcional)
+            fields: Campos a retornar, separados por vírgula (opcional)
+            include: Relacionamentos a embutir: psychologist (opcional)
             
         Returns:
             JSON com lista de disponibilidades
         """
         psychologist_id = request.args.get('psychologist_id', type=int)
         
-        if psychologist_id:
-            availabilities = availability_service.get_by_psychologist(psychologist_id)
-        else:
-            availabilities = availability_service.get_all()
-            
-        return ApiResponse.list_response([a.to_dict() for a in availabilities])
+        try:
+            fields = parse_fields(request.args, Availability.FIELDS)
+            include = parse_include(request.args, AvailabilityService.RELATIONS)
+        except ValidationError as e:
+            return ApiResponse.validation_error(e.message, e.field)
+        
+        def build():
+            if psychologist_id:
+                availabilities = availability_service.get_by_psychologist(psychologist_id)
+            else:
+                availabilities = availability_service.get_all()
+            related = availability_service.get_related(availabilities, include)
+            return render_list(availabilities, fields, related)
+        
+        return ApiResponse.conditional(availability_service.get_version(), build)
 
     @bp.route('/<int:availability_id>', methods=['GET'])
     def get_availability(availability_id: int):
@@ -52,14 +66,28 @@ def create_availability_routes(availability_service: AvailabilityService):
         Args:
             availability_id: ID da disponibilidade
             
+        Query Params:
+            fields: Campos a retornar, separados por vírgula (opcional)
+            include: Relacionamentos a embutir: psychologist (opcional)
+            
         Returns:
             JSON com dados da disponibilidade ou erro 404
         """
         try:
+            fields = parse_fields(request.args, Availability.FIELDS)
+            include = parse_include(request.args, AvailabilityService.RELATIONS)
             availability = availability_service.get_by_id(availability_id)
-            return ApiResponse.success(availability.to_dict())
+        except ValidationError as e:
+            return ApiResponse.validation_error(e.message, e.field)
         except NotFoundError:
             return ApiResponse.not_found("Disponibilidade", availability_id)
+        
+        def build():
+            related = availability_service.get_related([availability], include)
+            return render_entity(availability, fields, related)
+        
+        version = (availability.version, availability_service.get_version() if include else None)
+        return ApiResponse.conditional(version, build)
 
     @bp.route('/psychologist/<int:psychologist_id>', methods=['GET'])
     def get_psychologist_availabilities(psychologist_id: int):
@@ -69,11 +97,20 @@ def create_availability_routes(availability_service: AvailabilityService):
         Args:
             psychologist_id: ID do psicólogo
             
+        Query Params:
+            fields: Campos a retornar, separados por vírgula (opcional)
+            
         Returns:
             JSON com lista de disponibilidades do psicólogo
         """
-        availabilities = availability_service.get_by_psychologist(psychologist_id)
-        return ApiResponse.list_response([a.to_dict() for a in availabilities])
+        try:
+            fields = parse_fields(request.args, Availability.FIELDS)
+        except ValidationError as e:
+            return ApiResponse.validation_error(e.message, e.field)
+        return ApiResponse.conditional(
+            availability_service.get_version(),
+            lambda: render_list(availability_service.get_by_psychologist(psychologist_id), fields)
+        )
 
     @bp.route('', methods=['POST'])
     def create_availability():
@@ -92,12 +129,9 @@ def create_availability_routes(availability_service: AvailabilityService):
         data = request.get_json()
         
         try:
-            dto = AvailabilityCreateDTO(**data)
+            dto = validate(AvailabilityCreateDTO, data)
         except PydanticValidationError as e:
-            errors = e.errors()
-            if errors:
-                return ApiResponse.validation_error(errors[0]['msg'], errors[0]['loc'][0])
-            return ApiResponse.validation_error("Dados inválidos")
+            return ApiResponse.validation_error(*error_details(e))
         
         try:
             availability = availability_service.create_availability(
@@ -133,12 +167,9 @@ def create_availability_routes(availability_service: AvailabilityService):
         data = request.get_json()
         
         try:
-            dto = AvailabilityUpdateDTO(**data)
+            dto = validate(AvailabilityUpdateDTO, data)
         except PydanticValidationError as e:
-            errors = e.errors()
-            if errors:
-                return ApiResponse.validation_error(errors[0]['msg'], errors[0]['loc'][0])
-            return ApiResponse.validation_error("Dados inválidos")
+            return ApiResponse.validation_error(*error_details(e))
         
         try:
             availability = availability_service.update_availability(
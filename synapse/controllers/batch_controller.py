@@ -0,0 +1,120 @@
+"""
+Controller de requisições em lote.
+Executa várias sub-requisições da API em um único round trip HTTP.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from flask import Blueprint, request, current_app
+from pydantic import ValidationError as PydanticValidationError
+from synapse.api.dto import BatchRequestDTO
+from synapse.api.response import ApiResponse
+from synapse.api.validation import validate, error_details
+
+bp = Blueprint('batch', __name__, url_prefix='/api/batch')
+
+# Cabeçalhos repassados às sub-requisições (autenticação e sessão)
+FORWARDED_HEADERS = ('Cookie', 'Authorization')
+
+
+def _dispatch(app, sub, base_url, headers, environ_base):
+    """
+    Executa uma sub-requisição dentro do processo, passando pelo roteamento
+    normal do Flask (blueprints, hooks e tratamento de erros), sem HTTP.
+    
+    ``environ_base`` carrega o IP e o User-Agent do cliente real, para que os
+    limites de taxa por IP valham também dentro do lote.
+    """
+    options = {'method': sub.method, 'base_url': base_url, 'headers': headers,
+               'environ_base': environ_base}
+    if sub.body is not None:
+        options['json'] = sub.body
+    try:
+        with app.test_request_context(sub.path, **options):
+            response = app.full_dispatch_request()
+            try:
+                return {
+                    "status": response.status_code,
+                    "body": response.get_json(silent=True)
+                }
+            finally:
+                # Libera recursos presos à resposta (ex: slot de exportação)
+                response.close()
+    except Exception:
+        app.logger.exception("Falha na sub-requisição %s %s", sub.method, sub.path)
+        return {
+            "status": 500,
+            "body": {"success": False, "error": {"code": "INTERNAL_ERROR", "message": "Erro interno"}}
+        }
+
+
+def create_batch_routes(max_requests: int = 20, max_workers: int = 4):
+    """
+    Registra a rota de lote no blueprint.
+
+    Args:
+        max_requests: Número máximo de sub-requisições por lote
+        max_workers: Threads para executar leituras (GET) em paralelo
+
+    Returns:
+        Blueprint: Blueprint configurado com as rotas
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='batch')
+
+    @bp.route('', methods=['POST'])
+    def execute_batch():
+        """
+        Executa um lote de sub-requisições.
+
+        Body:
+            Lista de {method, path, body} (path deve começar com /api/), ou
+            {requests: [...]} com a mesma lista
+
+        As sub-requisições são executadas na ordem recebida. Leituras (GET)
+        consecutivas rodam em paralelo; escritas rodam uma a uma, de modo que
+        uma leitura posterior enxerga o efeito das escritas anteriores.
+
+        Returns:
+            JSON com {results: [{status, body}], count} na mesma ordem do lote
+        """
+        data = request.get_json(silent=True)
+        if isinstance(data, list):
+            data = {"requests": data}
+        try:
+            dto = validate(BatchRequestDTO, data)
+        except PydanticValidationError as e:
+            return ApiResponse.validation_error(*error_details(e))
+
+        if len(dto.requests) > max_requests:
+            return ApiResponse.validation_error(
+                f"Lote deve ter no máximo {max_requests} requisições", "requests"
+            )
+        if any(sub.path.split('?')[0].rstrip('/') == bp.url_prefix for sub in dto.requests):
+            return ApiResponse.validation_error("Lotes aninhados não são permitidos", "requests")
+
+        app = current_app._get_current_object()
+        base_url = request.host_url
+        headers = {name: request.headers[name] for name in FORWARDED_HEADERS if name in request.headers}
+        environ_base = {'HTTP_USER_AGENT': request.headers.get('User-Agent', '')}
+        if request.remote_addr:
+            environ_base['REMOTE_ADDR'] = request.remote_addr
+
+        results = [None] * len(dto.requests)
+        reads = []
+
+        def flush_reads():
+            futures = [(i, executor.submit(_dispatch, app, sub, base_url, headers, environ_base)) for i, sub in reads]
+            for i, future in futures:
+                results[i] = future.result()
+            reads.clear()
+
+        for i, sub in enumerate(dto.requests):
+            if sub.method == 'GET':
+                reads.append((i, sub))
+                continue
+            flush_reads()
+            results[i] = _dispatch(app, sub, base_url, headers, environ_base)
+        flush_reads()
+
+        return ApiResponse.success({"results": results, "count": len(results)})
+
+    return bp
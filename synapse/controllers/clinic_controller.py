@@ -5,9 +5,12 @@ Define as rotas HTTP para operações CRUD de clínicas.
 
 from flask import Blueprint, request
 from pydantic import ValidationError as PydanticValidationError
+from synapse.business_model.clinic import Clinic
 from synapse.services.clinic_service import ClinicService
 from synapse.api.dto import ClinicCreateDTO, ClinicUpdateDTO
 from synapse.api.response import ApiResponse
+from synapse.api.validation import validate, error_details
+from synapse.api.fieldsets import parse_fields, render_entity, render_list
 from synapse.api.exceptions import NotFoundError, ValidationError
 
 bp = Blueprint('clinics', __name__, url_prefix='/api/clinics')
@@ -29,11 +32,20 @@ def create_clinic_routes(clinic_service: ClinicService):
         """
         Lista todas as clínicas.
         
+        Query Params:
+            fields: Campos a retornar, separados por vírgula (opcional)
+        
         Returns:
             JSON com lista de clínicas
         """
-        clinics = clinic_service.get_all()
-        return ApiResponse.list_response([c.to_dict() for c in clinics])
+        try:
+            fields = parse_fields(request.args, Clinic.FIELDS)
+        except ValidationError as e:
+            return ApiResponse.validation_error(e.message, e.field)
+        return ApiResponse.conditional(
+            clinic_service.get_version(),
+            lambda: render_list(clinic_service.get_all(), fields)
+        )
 
     @bp.route('/<int:clinic_id>', methods=['GET'])
     def get_clinic(clinic_id: int):
@@ -43,14 +55,22 @@ def create_clinic_routes(clinic_service: ClinicService):
         Args:
             clinic_id: ID da clínica
             
+        Query Params:
+            fields: Campos a retornar, separados por vírgula (opcional)
+            
         Returns:
             JSON com dados da clínica ou erro 404
         """
         try:
             clinic = clinic_service.get_by_id(clinic_id)
-            return ApiResponse.success(clinic.to_dict())
         except NotFoundError:
             return ApiResponse.not_found("Clínica", clinic_id)
+        
+        try:
+            fields = parse_fields(request.args, Clinic.FIELDS)
+        except ValidationError as e:
+            return ApiResponse.validation_error(e.message, e.field)
+        return ApiResponse.conditional(clinic.version, lambda: render_entity(clinic, fields))
 
     @bp.route('', methods=['POST'])
     def create_clinic():
@@ -70,12 +90,9 @@ def create_clinic_routes(clinic_service: ClinicService):
         data = request.get_json()
         
         try:
-            dto = ClinicCreateDTO(**data)
+            dto = validate(ClinicCreateDTO, data)
         except PydanticValidationError as e:
-            errors = e.errors()
-            if errors:
-                return ApiResponse.validation_error(errors[0]['msg'], errors[0]['loc'][0])
-            return ApiResponse.validation_error("Dados inválidos")
+            return ApiResponse.validation_error(*error_details(e))
         
         try:
             clinic = clinic_service.create_clinic(
@@ -109,12 +126,9 @@ def create_clinic_routes(clinic_service: ClinicService):
         data = request.get_json()
         
         try:
-            dto = ClinicUpdateDTO(**data)
+            dto = validate(ClinicUpdateDTO, data)
         except PydanticValidationError as e:
-            errors = e.errors()
-            if errors:
-                return ApiResponse.validation_error(errors[0]['msg'], errors[0]['loc'][0])
-            return ApiResponse.validation_error("Dados inválidos")
+            return ApiResponse.validation_error(*error_details(e))
         
         try:
             clinic = clinic_service.update_clinic(
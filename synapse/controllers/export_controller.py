@@ -0,0 +1,131 @@
+"""
+Controller de exportações.
+Define as rotas HTTP que transmitem CSV/NDJSON de consultas, leads e pacientes.
+"""
+
+import threading
+from flask import Blueprint, Response, request
+from pydantic import ValidationError as PydanticValidationError
+from synapse.services.export_service import ExportService
+from synapse.api.dto import ExportQueryDTO
+from synapse.api.response import ApiResponse
+from synapse.api.validation import validate, error_details
+
+bp = Blueprint('exports', __name__, url_prefix='/api/exports')
+
+MIMETYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def _release_once(semaphore: threading.BoundedSemaphore):
+    """Função que libera o slot na primeira chamada e ignora as seguintes."""
+    lock = threading.Lock()
+    pending = [True]
+
+    def release():
+        with lock:
+            if not pending[0]:
+                return
+            pending[0] = False
+        semaphore.release()
+    return release
+
+
+def create_export_routes(export_service: ExportService, max_concurrent: int = 2):
+    """
+    Registra as rotas de exportação no blueprint.
+
+    Args:
+        export_service: Instância do serviço de exportação
+        max_concurrent: Exportações simultâneas permitidas; o excedente recebe
+            503, para que exportações longas não ocupem todas as threads que
+            atendem o tráfego interativo
+
+    Returns:
+        Blueprint: Blueprint configurado com as rotas
+    """
+    slots = threading.BoundedSemaphore(max_concurrent)
+
+    def stream(name, entities, columns, fmt, release):
+        # O slot é liberado quando a resposta é fechada pelo servidor: após o
+        # último byte, na desconexão do cliente ou sem o corpo ser lido (HEAD,
+        # sub-requisições de lote)
+        response = Response(export_service.encode(entities, columns, fmt), mimetype=MIMETYPES[fmt])
+        response.headers["Content-Disposition"] = f'attachment; filename="{name}.{fmt}"'
+        response.call_on_close(release)
+        return response
+
+    def export(name, build):
+        try:
+            dto = validate(ExportQueryDTO, request.args.to_dict())
+        except PydanticValidationError as e:
+            return ApiResponse.validation_error(*error_details(e))
+
+        if not slots.acquire(blocking=False):
+            return ApiResponse.service_unavailable(
+                "Muitas exportações em andamento. Tente novamente em instantes.", retry_after=5
+            )
+        release = _release_once(slots)
+        try:
+            entities, columns = build(dto)
+            return stream(name, entities, columns, dto.format, release)
+        except BaseException:
+            release()
+            raise
+
+    @bp.route('/appointments', methods=['GET'])
+    def export_appointments():
+        """
+        Exporta consultas.
+
+        Query Params:
+            format: 'csv' (default) ou 'ndjson'
+            start: Data inicial da consulta (yyyy-mm-dd, opcional)
+            end: Data final da consulta (yyyy-mm-dd, opcional)
+            status: Filtrar por status (opcional)
+
+        Returns:
+            Arquivo transmitido em partes (chunked)
+        """
+        return export("appointments", lambda dto: (
+            export_service.iter_appointments(dto.start, dto.end, dto.status),
+            ExportService.APPOINTMENT_COLUMNS
+        ))
+
+    @bp.route('/leads', methods=['GET'])
+    def export_leads():
+        """
+        Exporta leads.
+
+        Query Params:
+            format: 'csv' (default) ou 'ndjson'
+            start: Data inicial de criação (yyyy-mm-dd, opcional)
+            end: Data final de criação (yyyy-mm-dd, opcional)
+            status: Filtrar por status (opcional)
+
+        Returns:
+            Arquivo transmitido em partes (chunked)
+        """
+        return export("leads", lambda dto: (
+            export_service.iter_leads(dto.start, dto.end, dto.status),
+            ExportService.LEAD_COLUMNS
+        ))
+
+    @bp.route('/patients', methods=['GET'])
+    def export_patients():
+        """
+        Exporta pacientes.
+
+        Query Params:
+            format: 'csv' (default) ou 'ndjson'
+            start: Data inicial de cadastro (yyyy-mm-dd, opcional)
+            end: Data final de cadastro (yyyy-mm-dd, opcional)
+
+        Returns:
+            Arquivo transmitido em partes (chunked)
+        """
+        return export("patients", lambda dto: (
+            export_service.iter_patients(dto.start, dto.end),
+            ExportService.PATIENT_COLUMNS
+        ))
+
+    return bp
@@ -0,0 +1,93 @@
+"""
+Controller de importações.
+Define as rotas HTTP que recebem arquivos CSV/NDJSON de leads e pacientes.
+"""
+
+from flask import Blueprint, request
+from pydantic import ValidationError as PydanticValidationError
+from synapse.services.import_service import ImportService
+from synapse.api.dto import ImportQueryDTO
+from synapse.api.response import ApiResponse
+from synapse.api.validation import validate, error_details
+
+bp = Blueprint('imports', __name__, url_prefix='/api/imports')
+
+NDJSON_MIMETYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl')
+NDJSON_EXTENSIONS = ('.ndjson', '.jsonl')
+
+
+def _upload():
+    """
+    Retorna (fluxo, formato detectado) da requisição.
+
+    Aceita o arquivo no campo 'file' de um multipart/form-data ou o corpo
+    bruto da requisição, que é lido em fluxo sem ser carregado inteiro.
+    """
+    upload = request.files.get('file')
+    if upload is not None:
+        is_ndjson = (upload.mimetype in NDJSON_MIMETYPES
+                     or (upload.filename or '').lower().endswith(NDJSON_EXTENSIONS))
+        return upload.stream, 'ndjson' if is_ndjson else 'csv'
+    return request.stream, 'ndjson' if request.mimetype in NDJSON_MIMETYPES else 'csv'
+
+
+def create_import_routes(import_service: ImportService):
+    """
+    Registra as rotas de importação no blueprint.
+
+    Args:
+        import_service: Instância do serviço de importação
+
+    Returns:
+        Blueprint: Blueprint configurado com as rotas
+    """
+
+    def run(importer):
+        try:
+            dto = validate(ImportQueryDTO, request.args.to_dict())
+        except PydanticValidationError as e:
+            return ApiResponse.validation_error(*error_details(e))
+
+        stream, detected = _upload()
+        report = importer(stream, dto.format or detected)
+        return ApiResponse.success(
+            report, f"{report['imported']} registros importados, {report['failed']} com erro"
+        )
+
+    @bp.route('/leads', methods=['POST'])
+    def import_leads():
+        """
+        Importa leads em massa.
+
+        Body:
+            Arquivo CSV (com cabeçalho) ou NDJSON com os campos de criação
+            de lead: name, email, phone, source, notes (opcional)
+
+        Query Params:
+            format: 'csv' ou 'ndjson' (opcional; detectado pelo Content-Type
+                ou pela extensão do arquivo)
+
+        Returns:
+            JSON com {imported, failed, errors, errors_truncated}
+        """
+        return run(import_service.import_leads)
+
+    @bp.route('/patients', methods=['POST'])
+    def import_patients():
+        """
+        Importa pacientes em massa.
+
+        Body:
+            Arquivo CSV (com cabeçalho) ou NDJSON com os campos de criação
+            de paciente: name, email, phone, cpf (opcional)
+
+        Query Params:
+            format: 'csv' ou 'ndjson' (opcional; detectado pelo Content-Type
+                ou pela extensão do arquivo)
+
+        Returns:
+            JSON com {imported, failed, errors, errors_truncated}
+        """
+        return run(import_service.import_patients)
+
+    return bp
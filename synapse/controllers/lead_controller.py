@@ -5,6 +5,7 @@ Define as rotas HTTP para operações CRUD de leads.
 
 from flask import Blueprint, request
 from pydantic import ValidationError as PydanticValidationError
+from synapse.business_model.lead import Lead
 from synapse.services.lead_service import LeadService
 from synapse.api.dto import (
     LeadCreateDTO, 
@@ -14,17 +15,21 @@ from synapse.api.dto import (
     LeadConvertDTO
 )
 from synapse.api.response import ApiResponse
+from synapse.api.validation import validate, error_details
+from synapse.api.idempotency import IdempotencyStore, idempotent
+from synapse.api.fieldsets import parse_fields, render_entity, render_list, stream_serializer
 from synapse.api.exceptions import NotFoundError, ValidationError, BusinessRuleError
 
 bp = Blueprint('leads', __name__, url_prefix='/api/leads')
 
 
-def create_lead_routes(lead_service: LeadService):
+def create_lead_routes(lead_service: LeadService, idempotency: IdempotencyStore = None):
     """
     Registra as rotas de leads no blueprint.
     
     Args:
         lead_service: Instância do serviço de leads
+        idempotency: Respostas por Idempotency-Key da criação (opcional)
         
     Returns:
         Blueprint: Blueprint configurado com as rotas
@@ -35,11 +40,28 @@ def create_lead_routes(lead_service: LeadService):
         """
         Lista todos os leads.
         
+        Query Params:
+            stream: Se 'true', transmite a lista em partes (chunked)
+            fields: Campos a retornar, separados por vírgula (opcional)
+            
         Returns:
             JSON com lista de leads
         """
-        leads = lead_service.get_all()
-        return ApiResponse.list_response([l.to_dict() for l in leads])
+        try:
+            fields = parse_fields(request.args, Lead.FIELDS)
+        except ValidationError as e:
+            return ApiResponse.validation_error(e.message, e.field)
+        
+        if request.args.get('stream', 'false').lower() == 'true':
+            return ApiResponse.conditional(
+                lead_service.get_version(),
+                lambda: ApiResponse.stream_list(lead_service.iter_all(), stream_serializer(fields))
+            )
+        
+        return ApiResponse.conditional(
+            lead_service.get_version(),
+            lambda: render_list(lead_service.get_all(), fields)
+        )
 
     @bp.route('/<int:lead_id>', methods=['GET'])
     def get_lead(lead_id: int):
@@ -49,16 +71,25 @@ def create_lead_routes(lead_service: LeadService):
         Args:
             lead_id: ID do lead
             
+        Query Params:
+            fields: Campos a retornar, separados por vírgula (opcional)
+            
         Returns:
             JSON com dados do lead ou erro 404
         """
         try:
             lead = lead_service.get_by_id(lead_id)
-            return ApiResponse.success(lead.to_dict())
         except NotFoundError:
             return ApiResponse.not_found("Lead", lead_id)
+        
+        try:
+            fields = parse_fields(request.args, Lead.FIELDS)
+        except ValidationError as e:
+            return ApiResponse.validation_error(e.message, e.field)
+        return ApiResponse.conditional(lead.version, lambda: render_entity(lead, fields))
 
     @bp.route('', methods=['POST'])
+    @idempotent(idempotency)
     def create_lead():
         """
         Cria um novo lead.
@@ -76,12 +107,9 @@ def create_lead_routes(lead_service: LeadService):
         data = request.get_json()
         
         try:
-            dto = LeadCreateDTO(**data)
+            dto = validate(LeadCreateDTO, data)
         except PydanticValidationError as e:
-            errors = e.errors()
-            if errors:
-                return ApiResponse.validation_error(errors[0]['msg'], errors[0]['loc'][0])
-            return ApiResponse.validation_error("Dados inválidos")
+            return ApiResponse.validation_error(*error_details(e))
         
         lead = lead_service.create_lead(
             name=dto.name,
@@ -112,12 +140,9 @@ def create_lead_routes(lead_service: LeadService):
         data = request.get_json()
         
         try:
-            dto = LeadUpdateDTO(**data)
+            dto = validate(LeadUpdateDTO, data)
         except PydanticValidationError as e:
-            errors = e.errors()
-            if errors:
-                return ApiResponse.validation_error(errors[0]['msg'], errors[0]['loc'][0])
-            return ApiResponse.validation_error("Dados inválidos")
+            return ApiResponse.validation_error(*error_details(e))
         
         try:
             lead = lead_service.update_lead(
@@ -165,9 +190,9 @@ def create_lead_routes(lead_service: LeadService):
         data = request.get_json() or {}
         
         try:
-            dto = LeadContactedDTO(**data)
-        except PydanticValidationError:
-            return ApiResponse.validation_error("Dados inválidos")
+            dto = validate(LeadContactedDTO, data)
+        except PydanticValidationError as e:
+            return ApiResponse.validation_error(*error_details(e))
         
         try:
             lead = lead_service.mark_contacted(lead_id, dto.notes)
@@ -192,9 +217,9 @@ def create_lead_routes(lead_service: LeadService):
         data = request.get_json() or {}
         
         try:
-            dto = LeadLostDTO(**data)
-        except PydanticValidationError:
-            return ApiResponse.validation_error("Dados inválidos")
+            dto = validate(LeadLostDTO, data)
+        except PydanticValidationError as e:
+            return ApiResponse.validation_error(*error_details(e))
         
         try:
             lead = lead_service.mark_lost(lead_id, dto.reason)
@@ -219,12 +244,9 @@ def create_lead_routes(lead_service: LeadService):
         data = request.get_json() or {}
         
         try:
-            dto = LeadConvertDTO(**data)
+            dto = validate(LeadConvertDTO, data)
         except PydanticValidationError as e:
-            errors = e.errors()
-            if errors:
-                return ApiResponse.validation_error(errors[0]['msg'], errors[0]['loc'][0])
-            return ApiResponse.validation_error("Dados inválidos")
+            return ApiResponse.validation_error(*error_details(e))
         
         try:
             lead = lead_service.convert_to_patient(lead_id, dto.patient_id)
@@ -0,0 +1,62 @@
+"""
+Controller de métricas da clínica.
+Expõe os contadores do dashboard, mantidos incrementalmente pelos serviços,
+e as métricas da fila de jobs.
+"""
+
+from datetime import date
+from flask import Blueprint
+from synapse.services.auth_service import AuthService
+from synapse.services.clinic_metrics import ClinicMetrics
+from synapse.services.jobs import JobQueue
+from synapse.api.auth import auth_required
+from synapse.api.response import ApiResponse
+
+bp = Blueprint('clinic_metrics', __name__, url_prefix='/api/clinic')
+
+
+def create_metrics_routes(clinic_metrics: ClinicMetrics, auth_service: AuthService,
+                          job_queue: JobQueue = None):
+    """
+    Registra as rotas de métricas no blueprint.
+
+    Args:
+        clinic_metrics: Contadores do dashboard da clínica
+        auth_service: Serviço de autenticação (rotas restritas à clínica)
+        job_queue: Fila de jobs (opcional; habilita GET /jobs)
+
+    Returns:
+        Blueprint: Blueprint configurado com as rotas
+    """
+
+    @bp.route('/metrics', methods=['GET'])
+    @auth_required(auth_service, user_type='clinic')
+    def get_metrics():
+        """
+        Retorna as métricas do dashboard da clínica.
+
+        Returns:
+            JSON com leads (total e por status), consultas do dia,
+            psicólogos ativos e taxa de conversão
+        """
+        today = date.today()
+        return ApiResponse.conditional(
+            (clinic_metrics.version, today),
+            lambda: ApiResponse.success(clinic_metrics.snapshot(today)),
+            private=True
+        )
+
+    if job_queue is not None:
+        @bp.route('/jobs', methods=['GET'])
+        @auth_required(auth_service, user_type='clinic')
+        def get_job_metrics():
+            """
+            Retorna o estado da fila de jobs em background.
+
+            Returns:
+                JSON com jobs pendentes, em execução e com falha definitiva,
+                e contadores/tempos por tipo de job
+            """
+            return ApiResponse.success(job_queue.metrics())
+
+    return bp
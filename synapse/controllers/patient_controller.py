@@ -5,20 +5,25 @@ Define as rotas HTTP para operações CRUD de pacientes.
 
 from flask import Blueprint, request
 from pydantic import ValidationError as PydanticValidationError
+from synapse.business_model.patient import Patient
 from synapse.services.patient_service import PatientService
 from synapse.api.dto import PatientCreateDTO, PatientUpdateDTO
 from synapse.api.response import ApiResponse
+from synapse.api.validation import validate, error_details
+from synapse.api.idempotency import IdempotencyStore, idempotent
+from synapse.api.fieldsets import parse_fields, render_entity, render_list
 from synapse.api.exceptions import NotFoundError, ValidationError
 
 bp = Blueprint('patients', __name__, url_prefix='/api/patients')
 
 
-def create_patient_routes(patient_service: PatientService):
+def create_patient_routes(patient_service: PatientService, idempotency: IdempotencyStore = None):
     """
     Registra as rotas de pacientes no blueprint.
     
     Args:
         patient_service: Instância do serviço de pacientes
+        idempotency: Respostas por Idempotency-Key do cadastro (opcional)
         
     Returns:
         Blueprint: Blueprint configurado com as rotas
@@ -29,11 +34,20 @@ def create_patient_routes(patient_service: PatientService):
         """
         Lista todos os pacientes.
         
+        Query Params:
+            fields: Campos a retornar, separados por vírgula (opcional)
+        
         Returns:
             JSON com lista de pacientes
         """
-        patients = patient_service.get_all()
-        return ApiResponse.list_response([p.to_dict() for p in patients])
+        try:
+            fields = parse_fields(request.args, Patient.FIELDS)
+        except ValidationError as e:
+            return ApiResponse.validation_error(e.message, e.field)
+        return ApiResponse.conditional(
+            patient_service.get_version(),
+            lambda: render_list(patient_service.get_all(), fields)
+        )
 
     @bp.route('/<int:patient_id>', methods=['GET'])
     def get_patient(patient_id: int):
@@ -43,16 +57,25 @@ def create_patient_routes(patient_service: PatientService):
         Args:
             patient_id: ID do paciente
             
+        Query Params:
+            fields: Campos a retornar, separados por vírgula (opcional)
+            
         Returns:
             JSON com dados do paciente ou erro 404
         """
         try:
             patient = patient_service.get_by_id(patient_id)
-            return ApiResponse.success(patient.to_dict())
         except NotFoundError as e:
             return ApiResponse.not_found("Paciente", patient_id)
+        
+        try:
+            fields = parse_fields(request.args, Patient.FIELDS)
+        except ValidationError as e:
+            return ApiResponse.validation_error(e.message, e.field)
+        return ApiResponse.conditional(patient.version, lambda: render_entity(patient, fields))
 
     @bp.route('', methods=['POST'])
+    @idempotent(idempotency)
     def create_patient():
         """
         Cria um novo paciente.
@@ -70,12 +93,9 @@ def create_patient_routes(patient_service: PatientService):
         
         # Validar DTO
         try:
-            dto = PatientCreateDTO(**data)
+            dto = validate(PatientCreateDTO, data)
         except PydanticValidationError as e:
-            errors = e.errors()
-            if errors:
-                return ApiResponse.validation_error(errors[0]['msg'], errors[0]['loc'][0])
-            return ApiResponse.validation_error("Dados inválidos")
+            return ApiResponse.validation_error(*error_details(e))
         
         # Criar paciente via service
         try:
@@ -109,12 +129,9 @@ def create_patient_routes(patient_service: PatientService):
         data = request.get_json()
         
         try:
-            dto = PatientUpdateDTO(**data)
+            dto = validate(PatientUpdateDTO, data)
         except PydanticValidationError as e:
-            errors = e.errors()
-            if errors:
-                return ApiResponse.validation_error(errors[0]['msg'], errors[0]['loc'][0])
-            return ApiResponse.validation_error("Dados inválidos")
+            return ApiResponse.validation_error(*error_details(e))
         
         try:
             patient = patient_service.update_patient(
@@ -3,22 +3,34 @@ Controller de psicólogos.
 Define as rotas HTTP para operações CRUD de psicólogos.
 """
 
+from datetime import datetime
 from flask import Blueprint, request
 from pydantic import ValidationError as PydanticValidationError
+from synapse.business_model.psychologist import Psychologist
 from synapse.services.psychologist_service import PsychologistService
-from synapse.api.dto import PsychologistCreateDTO, PsychologistUpdateDTO
+from synapse.services.appointment_service import AppointmentService
+from synapse.services.auth_service import AuthService
+from synapse.api.dto import PsychologistCreateDTO, PsychologistUpdateDTO, PsychologistSummaryQueryDTO
+from synapse.api.auth import auth_required, current_identity
 from synapse.api.response import ApiResponse
+from synapse.api.validation import validate, error_details
+from synapse.api.fieldsets import parse_fields, render_entity, render_list
 from synapse.api.exceptions import NotFoundError, ValidationError
 
 bp = Blueprint('psychologists', __name__, url_prefix='/api/psychologists')
 
 
-def create_psychologist_routes(psychologist_service: PsychologistService):
+def create_psychologist_routes(psychologist_service: PsychologistService,
+                               appointment_service: AppointmentService = None,
+                               auth_service: AuthService = None):
     """
     Registra as rotas de psicólogos no blueprint.
     
     Args:
         psychologist_service: Instância do serviço de psicólogos
+        appointment_service: Serviço de consultas, para o resumo do
+            psicólogo autenticado (opcional)
+        auth_service: Serviço de autenticação, para o resumo (opcional)
         
     Returns:
         Blueprint: Blueprint configurado com as rotas
@@ -31,13 +43,20 @@ def create_psychologist_routes(psychologist_service: PsychologistService):
         
         Query Params:
             active_only: Se 'true', retorna apenas psicólogos ativos
+            fields: Campos a retornar, separados por vírgula (opcional)
             
         Returns:
             JSON com lista de psicólogos
         """
         active_only = request.args.get('active_only', 'false').lower() == 'true'
-        psychologists = psychologist_service.get_all(active_only=active_only)
-        return ApiResponse.list_response([p.to_dict() for p in psychologists])
+        try:
+            fields = parse_fields(request.args, Psychologist.FIELDS)
+        except ValidationError as e:
+            return ApiResponse.validation_error(e.message, e.field)
+        return ApiResponse.conditional(
+            psychologist_service.get_version(),
+            lambda: render_list(psychologist_service.get_all(active_only=active_only), fields)
+        )
 
     @bp.route('/<int:psychologist_id>', methods=['GET'])
     def get_psychologist(psychologist_id: int):
@@ -47,14 +66,22 @@ def create_psychologist_routes(psychologist_service: PsychologistService):
         Args:
             psychologist_id: ID do psicólogo
             
+        Query Params:
+            fields: Campos a retornar, separados por vírgula (opcional)
+            
         Returns:
             JSON com dados do psicólogo ou erro 404
         """
         try:
             psychologist = psychologist_service.get_by_id(psychologist_id)
-            return ApiResponse.success(psychologist.to_dict())
         except NotFoundError:
             return ApiResponse.not_found("Psicólogo", psychologist_id)
+        
+        try:
+            fields = parse_fields(request.args, Psychologist.FIELDS)
+        except ValidationError as e:
+            return ApiResponse.validation_error(e.message, e.field)
+        return ApiResponse.conditional(psychologist.version, lambda: render_entity(psychologist, fields))
 
     @bp.route('', methods=['POST'])
     def create_psychologist():
@@ -76,12 +103,9 @@ def create_psychologist_routes(psychologist_service: PsychologistService):
         data = request.get_json()
         
         try:
-            dto = PsychologistCreateDTO(**data)
+            dto = validate(PsychologistCreateDTO, data)
         except PydanticValidationError as e:
-            errors = e.errors()
-            if errors:
-                return ApiResponse.validation_error(errors[0]['msg'], errors[0]['loc'][0])
-            return ApiResponse.validation_error("Dados inválidos")
+            return ApiResponse.validation_error(*error_details(e))
         
         try:
             psychologist = psychologist_service.create_psychologist(
@@ -119,12 +143,9 @@ def create_psychologist_routes(psychologist_service: PsychologistService):
         data = request.get_json()
         
         try:
-            dto = PsychologistUpdateDTO(**data)
+            dto = validate(PsychologistUpdateDTO, data)
         except PydanticValidationError as e:
-            errors = e.errors()
-            if errors:
-                return ApiResponse.validation_error(errors[0]['msg'], errors[0]['loc'][0])
-            return ApiResponse.validation_error("Dados inválidos")
+            return ApiResponse.validation_error(*error_details(e))
         
         try:
             psychologist = psychologist_service.update_psychologist(
@@ -177,4 +198,41 @@ def create_psychologist_routes(psychologist_service: PsychologistService):
         except NotFoundError:
             return ApiResponse.not_found("Psicólogo", psychologist_id)
 
+    if appointment_service and auth_service:
+        @bp.route('/me/summary', methods=['GET'])
+        @auth_required(auth_service, user_type='psychologist')
+        def get_my_summary():
+            """
+            Resumo da agenda do psicólogo autenticado.
+            
+            Query Params:
+                limit: Quantidade de próximas sessões (1 a 50, default 5)
+                
+            Returns:
+                JSON com today, week, unique_patients e upcoming
+            """
+            try:
+                dto = validate(PsychologistSummaryQueryDTO, request.args.to_dict())
+            except PydanticValidationError as e:
+                return ApiResponse.validation_error(*error_details(e))
+            
+            try:
+                psychologist = psychologist_service.get_by_user_id(current_identity()['user_id'])
+            except NotFoundError:
+                return ApiResponse.not_found("Psicólogo")
+            
+            def build():
+                summary = appointment_service.get_psychologist_summary(psychologist.id, dto.limit)
+                summary["psychologist_id"] = psychologist.id
+                summary["upcoming"] = [a.to_cached_dict() for a in summary["upcoming"]]
+                return ApiResponse.success(summary)
+            
+            # As próximas sessões dependem do relógio: a versão muda a cada minuto
+            minute = datetime.now().strftime('%Y-%m-%dT%H:%M')
+            # O ID do psicólogo entra na chave: agendas distintas podem estar na mesma versão
+            return ApiResponse.conditional(
+                (psychologist.id, appointment_service.get_agenda_version(psychologist.id), minute),
+                build, private=True
+            )
+
     return bp
@@ -0,0 +1,157 @@
+"""
+Controller de atualizações ao vivo.
+Expõe streams Server-Sent Events de horários (página de agendamento) e de
+agendas (dashboards do psicólogo e da clínica).
+"""
+
+import threading
+from typing import Callable, Dict, Optional
+from flask import Blueprint, Response, request
+from pydantic import ValidationError as PydanticValidationError
+from synapse.services.auth_service import AuthService
+from synapse.services.live_updates import LiveUpdates, slots_topic, agenda_topic, CLINIC_TOPIC
+from synapse.services.psychologist_service import PsychologistService
+from synapse.api.auth import auth_required, current_identity
+from synapse.api.dto import SlotStreamQueryDTO, AgendaStreamQueryDTO
+from synapse.api.response import ApiResponse
+from synapse.api.rate_limit import client_ip, UNKNOWN_KEY
+from synapse.api.validation import validate, error_details
+from synapse.api.exceptions import NotFoundError
+
+bp = Blueprint('streams', __name__, url_prefix='/api/streams')
+
+
+class _StreamSlots:
+    """
+    Conta os streams abertos, no total e por IP.
+
+    Cada stream ocupa uma thread do servidor enquanto estiver aberto; sem
+    limite, um cliente (ou muitos) abrindo conexões esgota as threads que
+    atendem o restante da API.
+    """
+
+    def __init__(self, max_streams: int, max_per_ip: int):
+        self.max_streams = max_streams
+        self.max_per_ip = max_per_ip
+        self._total = 0
+        self._by_ip: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, ip: str) -> Optional[Callable[[], None]]:
+        """
+        Ocupa um slot para o IP.
+
+        Returns:
+            Função que libera o slot (só a primeira chamada tem efeito) ou
+            None se um dos limites foi atingido
+        """
+        with self._lock:
+            if self._total >= self.max_streams or self._by_ip.get(ip, 0) >= self.max_per_ip:
+                return None
+            self._total += 1
+            self._by_ip[ip] = self._by_ip.get(ip, 0) + 1
+        pending = [True]
+
+        def release():
+            with self._lock:
+                if not pending[0]:
+                    return
+                pending[0] = False
+                self._total -= 1
+                self._by_ip[ip] -= 1
+                if not self._by_ip[ip]:
+                    del self._by_ip[ip]
+        return release
+
+
+def create_stream_routes(live_updates: LiveUpdates, psychologist_service: PsychologistService,
+                         auth_service: AuthService, max_streams: int = 100, max_streams_per_ip: int = 5):
+    """
+    Registra as rotas de streams no blueprint.
+
+    Args:
+        live_updates: Distribuidor das mensagens ao vivo
+        psychologist_service: Serviço de psicólogos (identifica o psicólogo autenticado)
+        auth_service: Serviço de autenticação (verificação dos tokens)
+        max_streams: Streams simultâneos permitidos; o excedente recebe 503
+        max_streams_per_ip: Streams simultâneos permitidos por IP
+
+    Returns:
+        Blueprint: Blueprint configurado com as rotas
+    """
+    slots = _StreamSlots(max_streams, max_streams_per_ip)
+
+    def event_stream(topics) -> Response:
+        release = slots.acquire(client_ip() or UNKNOWN_KEY)
+        if release is None:
+            return ApiResponse.service_unavailable(
+                "Muitas conexões ao vivo abertas. Tente novamente em instantes.", retry_after=5
+            )
+        try:
+            response = Response(live_updates.stream(topics), mimetype='text/event-stream')
+        except BaseException:
+            release()
+            raise
+        response.headers['Cache-Control'] = 'no-cache'
+        # Proxies (ex: nginx) não devem acumular as mensagens
+        response.headers['X-Accel-Buffering'] = 'no'
+        # O slot é liberado quando o servidor fecha a resposta (desconexão do cliente)
+        response.call_on_close(release)
+        return response
+
+    @bp.route('/slots', methods=['GET'])
+    def stream_slots():
+        """
+        Mudanças nos horários de um psicólogo em uma data.
+
+        Query Params:
+            psychologist_id: ID do psicólogo
+            date: Data (yyyy-mm-dd)
+
+        Returns:
+            text/event-stream com eventos slot_taken e slot_freed (503 se o
+            limite de streams foi atingido)
+        """
+        try:
+            dto = validate(SlotStreamQueryDTO, request.args.to_dict())
+        except PydanticValidationError as e:
+            return ApiResponse.validation_error(*error_details(e))
+
+        return event_stream([slots_topic(dto.psychologist_id, dto.date)])
+
+    @bp.route('/agenda', methods=['GET'])
+    @auth_required(auth_service)
+    def stream_agenda():
+        """
+        Mudanças de consultas para os dashboards.
+
+        Psicólogos recebem a própria agenda; a clínica recebe todas as
+        consultas ou as de um psicólogo.
+
+        Query Params:
+            psychologist_id: Restringir a um psicólogo (apenas clínica, opcional)
+
+        Returns:
+            text/event-stream com eventos appointment (503 se o limite de
+            streams foi atingido)
+        """
+        try:
+            dto = validate(AgendaStreamQueryDTO, request.args.to_dict())
+        except PydanticValidationError as e:
+            return ApiResponse.validation_error(*error_details(e))
+
+        identity = current_identity()
+        if identity["user_type"] == "psychologist":
+            try:
+                psychologist = psychologist_service.get_by_user_id(identity["user_id"])
+            except NotFoundError:
+                return ApiResponse.not_found("Psicólogo")
+            topics = [agenda_topic(psychologist.id)]
+        elif identity["user_type"] == "clinic":
+            topics = [agenda_topic(dto.psychologist_id) if dto.psychologist_id else CLINIC_TOPIC]
+        else:
+            return ApiResponse.forbidden("Acesso não permitido para este tipo de usuário")
+
+        return event_stream(topics)
+
+    return bp
@@ -0,0 +1,119 @@
+"""
+Controller da lista de espera.
+Define as rotas HTTP para entrar, consultar e sair da lista de espera por horários.
+"""
+
+from flask import Blueprint, request
+from pydantic import ValidationError as PydanticValidationError
+from synapse.services.waitlist import WaitlistService
+from synapse.api.dto import WaitlistJoinDTO
+from synapse.api.response import ApiResponse
+from synapse.api.validation import validate, error_details
+from synapse.api.exceptions import NotFoundError, ValidationError, ConflictError, BusinessRuleError
+
+bp = Blueprint('waitlist', __name__, url_prefix='/api/waitlist')
+
+
+def create_waitlist_routes(waitlist_service: WaitlistService):
+    """
+    Registra as rotas da lista de espera no blueprint.
+
+    Args:
+        waitlist_service: Instância do serviço de lista de espera
+
+    Returns:
+        Blueprint: Blueprint configurado com as rotas
+    """
+
+    @bp.route('', methods=['GET'])
+    def list_entries():
+        """
+        Lista as entradas da lista de espera.
+
+        Query Params:
+            patient_id: Filtrar por paciente (opcional)
+            psychologist_id: Filtrar por psicólogo (opcional)
+
+        Returns:
+            JSON com lista de entradas
+        """
+        patient_id = request.args.get('patient_id', type=int)
+        psychologist_id = request.args.get('psychologist_id', type=int)
+        entries = waitlist_service.list(patient_id, psychologist_id)
+        return ApiResponse.list_response([e.to_dict() for e in entries])
+
+    @bp.route('', methods=['POST'])
+    def join_waitlist():
+        """
+        Inclui um paciente na lista de espera.
+
+        Body:
+            patient_id: ID do paciente
+            psychologist_id: ID do psicólogo
+            date: Data desejada (yyyy-mm-dd)
+            start_time: Primeiro horário de início aceito (HH:MM)
+            end_time: Último horário de início aceito (HH:MM)
+            duration: Duração em minutos (default: 60)
+            auto_book: Agendar automaticamente quando surgir um horário (default: false)
+
+        Returns:
+            JSON da entrada criada ou erro
+        """
+        data = request.get_json()
+
+        try:
+            dto = validate(WaitlistJoinDTO, data)
+        except PydanticValidationError as e:
+            return ApiResponse.validation_error(*error_details(e))
+
+        try:
+            entry = waitlist_service.join(
+                dto.patient_id, dto.psychologist_id, dto.date, dto.start_time,
+                dto.end_time, dto.duration, dto.auto_book
+            )
+            return ApiResponse.created(entry.to_dict(), "Paciente incluído na lista de espera")
+        except NotFoundError as e:
+            return ApiResponse.not_found(e.resource, e.resource_id)
+        except ValidationError as e:
+            return ApiResponse.validation_error(e.message, e.field)
+        except ConflictError as e:
+            return ApiResponse.conflict(e.message)
+        except BusinessRuleError as e:
+            return ApiResponse.business_error(e.message)
+
+    @bp.route('/<int:entry_id>', methods=['GET'])
+    def get_entry(entry_id: int):
+        """
+        Busca uma entrada pelo ID (permite acompanhar se houve encaixe).
+
+        Args:
+            entry_id: ID da entrada
+
+        Returns:
+            JSON da entrada ou erro 404
+        """
+        try:
+            return ApiResponse.success(waitlist_service.get(entry_id).to_dict())
+        except NotFoundError as e:
+            return ApiResponse.not_found(e.resource, e.resource_id)
+
+    @bp.route('/<int:entry_id>', methods=['DELETE'])
+    def leave_waitlist(entry_id: int):
+        """
+        Retira uma entrada da lista de espera.
+
+        Args:
+            entry_id: ID da entrada
+
+        Returns:
+            204 No Content ou erro
+        """
+        try:
+            waitlist_service.leave(entry_id)
+            return ApiResponse.no_content()
+        except NotFoundError as e:
+            return ApiResponse.not_found(e.resource, e.resource_id)
+        except BusinessRuleError as e:
+            return ApiResponse.business_error(e.message)
+
+    return bp
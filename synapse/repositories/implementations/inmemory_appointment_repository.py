@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Iterator, Iterable, Dict
 from synapse.repositories.interfaces.abstract_repository import AbstractRepository
 from synapse.business_model.appointment import Appointment
 
@@ -11,19 +11,33 @@ class InMemoryAppointmentRepository(AbstractRepository[Appointment]):
         self._last_id += 1
         entity.id = self._last_id
         self._appointments[entity.id] = entity
+        self._touch()
 
     def get(self, entity_id: int) -> Optional[Appointment]:
         return self._appointments.get(entity_id)
 
+    def get_many(self, entity_ids: Iterable[int]) -> Dict[int, Appointment]:
+        found = ((i, self._appointments.get(i)) for i in set(entity_ids))
+        return {i: entity for i, entity in found if entity is not None}
+
     def all(self) -> List[Appointment]:
         return list(self._appointments.values())
 
+    def iter_all(self) -> Iterator[Appointment]:
+        for entity_id in list(self._appointments):
+            entity = self._appointments.get(entity_id)
+            if entity is not None:
+                yield entity
+
     def update(self, entity: Appointment) -> None:
         if entity.id in self._appointments:
+            entity.invalidate_cache()
             self._appointments[entity.id] = entity
+            self._touch()
 
     def delete(self, entity_id: int) -> None:
-        self._appointments.pop(entity_id, None)
+        if self._appointments.pop(entity_id, None) is not None:
+            self._touch()
 
     def by_psychologist(self, psychologist_id: int) -> List[Appointment]:
         return [a for a in self._appointments.values() if a.psychologist_id == psychologist_id]
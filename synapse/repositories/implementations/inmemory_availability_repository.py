@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Iterator, Iterable, Dict
 from synapse.repositories.interfaces.abstract_repository import AbstractRepository
 from synapse.business_model.availability import Availability
 
@@ -11,19 +11,33 @@ class InMemoryAvailabilityRepository(AbstractRepository[Availability]):
         self._last_id += 1
         entity.id = self._last_id
         self._availabilities[entity.id] = entity
+        self._touch()
 
     def get(self, entity_id: int) -> Optional[Availability]:
         return self._availabilities.get(entity_id)
 
+    def get_many(self, entity_ids: Iterable[int]) -> Dict[int, Availability]:
+        found = ((i, self._availabilities.get(i)) for i in set(entity_ids))
+        return {i: entity for i, entity in found if entity is not None}
+
     def all(self) -> List[Availability]:
         return list(self._availabilities.values())
 
+    def iter_all(self) -> Iterator[Availability]:
+        for entity_id in list(self._availabilities):
+            entity = self._availabilities.get(entity_id)
+            if entity is not None:
+                yield entity
+
     def update(self, entity: Availability) -> None:
         if entity.id in self._availabilities:
+            entity.invalidate_cache()
             self._availabilities[entity.id] = entity
+            self._touch()
 
     def delete(self, entity_id: int) -> None:
-        self._availabilities.pop(entity_id, None)
+        if self._availabilities.pop(entity_id, None) is not None:
+            self._touch()
 
     def by_psychologist(self, psychologist_id: int) -> List[Availability]:
         return [a for a in self._availabilities.values() if a.psychologist_id == psychologist_id]
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Iterator, Iterable, Dict
 from synapse.repositories.interfaces.abstract_repository import AbstractRepository
 from synapse.business_model.clinic import Clinic
 
@@ -11,16 +11,30 @@ class InMemoryClinicRepository(AbstractRepository[Clinic]):
         self._last_id += 1
         entity.id = self._last_id
         self._clinics[entity.id] = entity
+        self._touch()
 
     def get(self, entity_id: int) -> Optional[Clinic]:
         return self._clinics.get(entity_id)
 
+    def get_many(self, entity_ids: Iterable[int]) -> Dict[int, Clinic]:
+        found = ((i, self._clinics.get(i)) for i in set(entity_ids))
+        return {i: entity for i, entity in found if entity is not None}
+
     def all(self) -> List[Clinic]:
         return list(self._clinics.values())
 
+    def iter_all(self) -> Iterator[Clinic]:
+        for entity_id in list(self._clinics):
+            entity = self._clinics.get(entity_id)
+            if entity is not None:
+                yield entity
+
     def update(self, entity: Clinic) -> None:
         if entity.id in self._clinics:
+            entity.invalidate_cache()
             self._clinics[entity.id] = entity
+            self._touch()
 
     def delete(self, entity_id: int) -> None:
-        self._clinics.pop(entity_id, None)
+        if self._clinics.pop(entity_id, None) is not None:
+            self._touch()
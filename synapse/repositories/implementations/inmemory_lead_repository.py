@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Iterator, Iterable, Dict
 from synapse.repositories.interfaces.abstract_repository import AbstractRepository
 from synapse.business_model.lead import Lead
 
@@ -11,19 +11,41 @@ class InMemoryLeadRepository(AbstractRepository[Lead]):
         self._last_id += 1
         entity.id = self._last_id
         self._leads[entity.id] = entity
+        self._touch()
+
+    def add_many(self, entities: Iterable[Lead]) -> None:
+        # Uma única atualização de versão para o lote inteiro
+        for entity in entities:
+            self._last_id += 1
+            entity.id = self._last_id
+            self._leads[entity.id] = entity
+        self._touch()
 
     def get(self, entity_id: int) -> Optional[Lead]:
         return self._leads.get(entity_id)
 
+    def get_many(self, entity_ids: Iterable[int]) -> Dict[int, Lead]:
+        found = ((i, self._leads.get(i)) for i in set(entity_ids))
+        return {i: entity for i, entity in found if entity is not None}
+
     def all(self) -> List[Lead]:
         return list(self._leads.values())
 
+    def iter_all(self) -> Iterator[Lead]:
+        for entity_id in list(self._leads):
+            entity = self._leads.get(entity_id)
+            if entity is not None:
+                yield entity
+
     def update(self, entity: Lead) -> None:
         if entity.id in self._leads:
+            entity.invalidate_cache()
             self._leads[entity.id] = entity
+            self._touch()
 
     def delete(self, entity_id: int) -> None:
-        self._leads.pop(entity_id, None)
+        if self._leads.pop(entity_id, None) is not None:
+            self._touch()
 
     def by_status(self, status: str) -> List[Lead]:
         return [l for l in self._leads.values() if l.status == status]
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Iterator, Iterable, Dict
 from synapse.repositories.interfaces.abstract_repository import AbstractRepository
 from synapse.business_model.patient import Patient
 
@@ -11,16 +11,38 @@ class InMemoryPatientRepository(AbstractRepository[Patient]):
         self._last_id += 1
         entity.id = self._last_id
         self._patients[entity.id] = entity
+        self._touch()
+
+    def add_many(self, entities: Iterable[Patient]) -> None:
+        # Uma única atualização de versão para o lote inteiro
+        for entity in entities:
+            self._last_id += 1
+            entity.id = self._last_id
+            self._patients[entity.id] = entity
+        self._touch()
 
     def get(self, entity_id: int) -> Optional[Patient]:
         return self._patients.get(entity_id)
 
+    def get_many(self, entity_ids: Iterable[int]) -> Dict[int, Patient]:
+        found = ((i, self._patients.get(i)) for i in set(entity_ids))
+        return {i: entity for i, entity in found if entity is not None}
+
     def all(self) -> List[Patient]:
         return list(self._patients.values())
 
+    def iter_all(self) -> Iterator[Patient]:
+        for entity_id in list(self._patients):
+            entity = self._patients.get(entity_id)
+            if entity is not None:
+                yield entity
+
     def update(self, entity: Patient) -> None:
         if entity.id in self._patients:
+            entity.invalidate_cache()
             self._patients[entity.id] = entity
+            self._touch()
 
     def delete(self, entity_id: int) -> None:
-        self._patients.pop(entity_id, None)
+        if self._patients.pop(entity_id, None) is not None:
+            self._touch()
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Iterator, Iterable, Dict
 from synapse.repositories.interfaces.abstract_repository import AbstractRepository
 from synapse.business_model.psychologist import Psychologist
 
@@ -11,16 +11,33 @@ class InMemoryPsychologistRepository(AbstractRepository[Psychologist]):
         self._last_id += 1
         entity.id = self._last_id
         self._psychologists[entity.id] = entity
+        self._touch()
 
     def get(self, entity_id: int) -> Optional[Psychologist]:
         return self._psychologists.get(entity_id)
 
+    def get_many(self, entity_ids: Iterable[int]) -> Dict[int, Psychologist]:
+        found = ((i, self._psychologists.get(i)) for i in set(entity_ids))
+        return {i: entity for i, entity in found if entity is not None}
+
     def all(self) -> List[Psychologist]:
         return list(self._psychologists.values())
 
+    def iter_all(self) -> Iterator[Psychologist]:
+        for entity_id in list(self._psychologists):
+            entity = self._psychologists.get(entity_id)
+            if entity is not None:
+                yield entity
+
     def update(self, entity: Psychologist) -> None:
         if entity.id in self._psychologists:
+            entity.invalidate_cache()
             self._psychologists[entity.id] = entity
+            self._touch()
 
     def delete(self, entity_id: int) -> None:
-        self._psychologists.pop(entity_id, None)
+        if self._psychologists.pop(entity_id, None) is not None:
+            self._touch()
+
+    def by_user(self, user_id: int) -> Optional[Psychologist]:
+        return next((p for p in self._psychologists.values() if p.user_id == user_id), None)
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Iterator, Iterable, Dict
 from synapse.repositories.interfaces.abstract_repository import AbstractRepository
 from synapse.business_model.user import User
 
@@ -11,19 +11,33 @@ class InMemoryUserRepository(AbstractRepository[User]):
         self._last_id += 1
         entity.id = self._last_id
         self._users[entity.id] = entity
+        self._touch()
 
     def get(self, entity_id: int) -> Optional[User]:
         return self._users.get(entity_id)
 
+    def get_many(self, entity_ids: Iterable[int]) -> Dict[int, User]:
+        found = ((i, self._users.get(i)) for i in set(entity_ids))
+        return {i: entity for i, entity in found if entity is not None}
+
     def all(self) -> List[User]:
         return list(self._users.values())
 
+    def iter_all(self) -> Iterator[User]:
+        for entity_id in list(self._users):
+            entity = self._users.get(entity_id)
+            if entity is not None:
+                yield entity
+
     def update(self, entity: User) -> None:
         if entity.id in self._users:
+            entity.invalidate_cache()
             self._users[entity.id] = entity
+            self._touch()
 
     def delete(self, entity_id: int) -> None:
-        self._users.pop(entity_id, None)
+        if self._users.pop(entity_id, None) is not None:
+            self._touch()
 
     def get_by_email(self, email: str) -> Optional[User]:
         return next((u for u in self._users.values() if u.email == email), None)
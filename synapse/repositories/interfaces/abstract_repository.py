@@ -1,13 +1,27 @@
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar, List, Optional
+from typing import Generic, TypeVar, List, Optional, Iterator, Iterable, Dict
 
 T = TypeVar('T')
 
 class AbstractRepository(ABC, Generic[T]):
+    _version = 0
+
+    @property
+    def version(self) -> int:
+        """Versão da coleção, incrementada a cada escrita."""
+        return self._version
+
+    def _touch(self) -> None:
+        self._version += 1
+
     @abstractmethod
     def add(self, entity: T) -> None:
         pass
 
+    def add_many(self, entities: Iterable[T]) -> None:
+        for entity in entities:
+            self.add(entity)
+
     @abstractmethod
     def get(self, entity_id: int) -> Optional[T]:
         pass
@@ -16,6 +30,17 @@ class AbstractRepository(ABC, Generic[T]):
     def all(self) -> List[T]:
         pass
 
+    def iter_all(self) -> Iterator[T]:
+        return iter(self.all())
+
+    def get_many(self, entity_ids: Iterable[int]) -> Dict[int, T]:
+        found = {}
+        for entity_id in entity_ids:
+            entity = self.get(entity_id)
+            if entity is not None:
+                found[entity_id] = entity
+        return found
+
     @abstractmethod
     def update(self, entity: T) -> None:
         pass
@@ -0,0 +1,101 @@
+"""
+Notificações de consultas por email.
+Os eventos de agendamento, cancelamento e oferta da lista de espera só
+enfileiram um job; o email é montado e enviado depois, fora da requisição.
+"""
+
+from datetime import date, datetime
+from typing import Optional
+from synapse.business_model.appointment import AppointmentState
+from synapse.repositories.implementations.inmemory_patient_repository import InMemoryPatientRepository
+from synapse.repositories.implementations.inmemory_psychologist_repository import InMemoryPsychologistRepository
+from synapse.services.events import EventBus, AppointmentScheduled, AppointmentCancelled, WaitlistSlotOffered
+from synapse.services.jobs import JobQueue
+from synapse.services.mailer import FileMailer
+
+JOB_NAME = "appointment_email"
+
+
+class AppointmentNotifier:
+    """
+    Envia a confirmação de agendamento, o aviso de cancelamento e a oferta
+    de horário da lista de espera ao paciente.
+
+    O inscrito do evento é síncrono para que o job seja gravado em disco antes
+    da resposta (nenhuma notificação se perde se o processo cair logo depois);
+    o custo na requisição é a gravação de um arquivo pequeno.
+
+    O payload do job leva tudo o que o email precisa (destinatário, nomes,
+    data e horário), resolvido no momento do evento: os IDs dos repositórios
+    em memória não sobrevivem a um reinício, mas o job em disco sim.
+
+    Attributes:
+        patient_repository: Repositório de pacientes
+        psychologist_repository: Repositório de psicólogos
+        mailer: Mailer usado para o envio
+        jobs: Fila de jobs
+    """
+
+    def __init__(self, patient_repository: InMemoryPatientRepository,
+                 psychologist_repository: InMemoryPsychologistRepository,
+                 mailer: FileMailer, jobs: JobQueue):
+        self.patient_repository = patient_repository
+        self.psychologist_repository = psychologist_repository
+        self.mailer = mailer
+        self.jobs = jobs
+        jobs.register(JOB_NAME, self.send)
+
+    def subscribe(self, events: EventBus) -> None:
+        """Enfileira um email a cada agendamento, cancelamento ou oferta da lista de espera."""
+        events.subscribe(AppointmentScheduled, lambda e: self._enqueue(
+            "scheduled", e.after, e.after.patient_id, e.after.psychologist_id))
+        events.subscribe(AppointmentCancelled, lambda e: self._enqueue(
+            "cancelled", e.after, e.after.patient_id, e.after.psychologist_id, reason=e.reason))
+        events.subscribe(WaitlistSlotOffered, lambda e: self._enqueue(
+            "waitlist_offer", None, e.patient_id, e.psychologist_id,
+            date=e.date.isoformat(), time=e.time.strftime('%H:%M'),
+            expires_at=e.expires_at.isoformat(timespec='seconds')))
+
+    def _enqueue(self, kind: str, state: Optional[AppointmentState], patient_id: int,
+                 psychologist_id: int, **extra) -> None:
+        patient = self.patient_repository.get(patient_id)
+        if not patient:
+            return
+        psychologist = self.psychologist_repository.get(psychologist_id)
+        payload = {
+            "kind": kind,
+            "to": patient.email,
+            "patient_name": patient.name,
+            "psychologist_name": psychologist.name if psychologist else "seu psicólogo",
+        }
+        if state is not None:
+            payload.update(date=state.date.isoformat(), time=state.time.strftime('%H:%M'),
+                           duration=state.duration)
+        payload.update(extra)
+        self.jobs.enqueue(JOB_NAME, payload)
+
+    def send(self, payload: dict) -> None:
+        """
+        Monta e envia o email (handler do job) apenas com os dados do payload.
+        """
+        when = f"{date.fromisoformat(payload['date']).strftime('%d/%m/%Y')} às {payload['time']}"
+        greeting = f"Olá, {payload['patient_name']}!\n\n"
+        psychologist_name = payload["psychologist_name"]
+
+        if payload["kind"] == "scheduled":
+            subject = "Consulta agendada"
+            body = (f"Sua consulta com {psychologist_name} foi agendada para {when} "
+                    f"({payload['duration']} minutos).\n")
+        elif payload["kind"] == "cancelled":
+            subject = "Consulta cancelada"
+            body = f"Sua consulta com {psychologist_name} em {when} foi cancelada.\n"
+            if payload.get("reason"):
+                body += f"Motivo: {payload['reason']}\n"
+        else:
+            subject = "Horário disponível na lista de espera"
+            expires = datetime.fromisoformat(payload["expires_at"]).strftime('%H:%M')
+            body = (f"Abriu um horário com {psychologist_name} em {when}, e ele está reservado "
+                    f"para você até as {expires}.\n"
+                    f"Acesse o agendamento para confirmar a consulta.\n")
+
+        self.mailer.send(payload["to"], subject, greeting + body + "\nEquipe Synapse\n")
@@ -0,0 +1,131 @@
+"""
+Agendador de transições automáticas de consultas.
+Conclui cada consulta no horário em que ela termina, sem varrer o repositório.
+"""
+
+import heapq
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Iterable, List, Tuple
+from synapse.business_model.appointment import AppointmentState
+from synapse.services.events import EventBus, AppointmentEvent
+from synapse.services.psychologist_agenda import UPCOMING_STATUSES
+
+logger = logging.getLogger(__name__)
+
+# Espera antes de repetir um lote que falhou
+RETRY_DELAY = timedelta(minutes=1)
+
+
+def _end_of(state: AppointmentState) -> datetime:
+    return datetime.combine(state.date, state.time) + timedelta(minutes=state.duration)
+
+
+class AppointmentScheduler:
+    """
+    Conclui automaticamente as consultas que terminaram.
+
+    Mantém um heap de (fim da consulta, id) alimentado pelos eventos de
+    consulta. Uma thread dorme até o fim mais próximo, retira do heap todas as
+    entradas vencidas e as conclui em um único lote pelo serviço (que publica
+    ``AppointmentCompleted(automatic=True)``).
+
+    Cancelamentos e remarcações não removem entradas do heap (remoção
+    preguiçosa): a entrada antiga é descartada quando vence, porque o serviço
+    ignora consultas que não estão mais agendadas ou que terminam depois.
+
+    Attributes:
+        appointment_service: Serviço que aplica as transições
+        batch_size: Máximo de consultas concluídas por lote
+    """
+
+    def __init__(self, appointment_service, batch_size: int = 500):
+        self.appointment_service = appointment_service
+        self.batch_size = batch_size
+        self._heap: List[Tuple[datetime, int]] = []
+        self._wakeup = threading.Condition()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def rebuild(self, appointments: Iterable) -> None:
+        """Carrega as consultas ainda agendadas (usado na inicialização)."""
+        entries = [(a.get_end_datetime(), a.id) for a in appointments if a.status in UPCOMING_STATUSES]
+        heapq.heapify(entries)
+        with self._wakeup:
+            self._heap = entries
+            self._wakeup.notify()
+
+    def subscribe(self, events: EventBus) -> None:
+        """Acompanha agendamentos e remarcações."""
+        events.subscribe(AppointmentEvent, self._on_appointment)
+
+    def _on_appointment(self, event: AppointmentEvent) -> None:
+        after = event.after
+        if after is None or after.status not in UPCOMING_STATUSES:
+            return
+        if event.before is not None and _end_of(event.before) == _end_of(after) \
+                and event.before.status in UPCOMING_STATUSES:
+            return                  # já está no heap com o mesmo fim
+        self.push(_end_of(after), event.appointment_id)
+
+    def push(self, end: datetime, appointment_id: int) -> None:
+        """Agenda a verificação de uma consulta no instante em que termina."""
+        with self._wakeup:
+            heapq.heappush(self._heap, (end, appointment_id))
+            # Só acorda a thread se o novo fim for o mais próximo
+            if self._heap[0][1] == appointment_id:
+                self._wakeup.notify()
+
+    def pending(self) -> int:
+        """Entradas no heap (inclui entradas obsoletas ainda não vencidas)."""
+        return len(self._heap)
+
+    # =========================================================================
+    # CICLO DE VIDA
+    # =========================================================================
+
+    def start(self) -> None:
+        """Inicia a thread do agendador."""
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name='appointment-scheduler', daemon=True)
+        self._thread.start()
+
+    def shutdown(self, timeout: float = None) -> None:
+        """Para a thread do agendador."""
+        self._stopping.set()
+        with self._wakeup:
+            self._wakeup.notify()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            with self._wakeup:
+                due = self._pop_due(datetime.now())
+                if not due:
+                    timeout = (self._heap[0][0] - datetime.now()).total_seconds() if self._heap else None
+                    self._wakeup.wait(timeout)
+                    continue
+            self.run_due(due)
+
+    def _pop_due(self, now: datetime) -> List[int]:
+        due = []
+        while self._heap and self._heap[0][0] <= now and len(due) < self.batch_size:
+            due.append(heapq.heappop(self._heap)[1])
+        return due
+
+    def run_due(self, appointment_ids: List[int], now: datetime = None) -> None:
+        """Aplica as transições de um lote de consultas vencidas."""
+        try:
+            completed = self.appointment_service.complete_due(appointment_ids, now)
+        except Exception:
+            # Tenta o lote de novo mais tarde; as já concluídas serão ignoradas
+            logger.exception("Falha ao concluir %d consultas vencidas", len(appointment_ids))
+            retry_at = datetime.now() + RETRY_DELAY
+            for appointment_id in appointment_ids:
+                self.push(retry_at, appointment_id)
+            return
+        if completed:
+            logger.info("%d consultas concluídas automaticamente", len(completed))
@@ -8,8 +8,15 @@ from synapse.repositories.implementations.inmemory_patient_repository import InM
 from synapse.repositories.implementations.inmemory_psychologist_repository import InMemoryPsychologistRepository
 from synapse.repositories.implementations.inmemory_availability_repository import InMemoryAvailabilityRepository
 from synapse.business_model.appointment import Appointment
+from synapse.services.psychologist_agenda import PsychologistAgendas
+from synapse.services.slot_holds import SlotHold, SlotHolds
+from synapse.services.single_flight import SingleFlight
+from synapse.services.events import (
+    EventBus, AppointmentScheduled, AppointmentCancelled, AppointmentCompleted, AppointmentDeleted
+)
 from synapse.api.exceptions import NotFoundError, ValidationError, ConflictError, BusinessRuleError
 from datetime import datetime, date, time as dtime, timedelta
+import threading
 
 
 class AppointmentService:
@@ -21,21 +28,88 @@ class AppointmentService:
         patient_repository: Repositório para validação de pacientes
         psychologist_repository: Repositório para validação de psicólogos
         availability_repository: Repositório para verificação de disponibilidade
+        agendas: Agregados por psicólogo do dashboard do psicólogo (opcional)
+        events: Barramento onde as escritas são publicadas (opcional)
+        holds: Reservas temporárias de horários (opcional)
     """
     
+    # Relacionamentos que podem ser embutidos (?include=) -> atributo de chave estrangeira
+    RELATIONS = {"patient": "patient_id", "psychologist": "psychologist_id"}
+    
     def __init__(self, appointment_repository: InMemoryAppointmentRepository,
                  patient_repository: InMemoryPatientRepository,
                  psychologist_repository: InMemoryPsychologistRepository,
-                 availability_repository: InMemoryAvailabilityRepository):
+                 availability_repository: InMemoryAvailabilityRepository,
+                 agendas: PsychologistAgendas = None,
+                 events: EventBus = None,
+                 holds: SlotHolds = None):
         self.appointment_repository = appointment_repository
         self.patient_repository = patient_repository
         self.psychologist_repository = psychologist_repository
         self.availability_repository = availability_repository
+        self.agendas = agendas
+        self.events = events
+        self.holds = holds
+        # Serializa agendamentos, reservas e mudanças de status: a verificação
+        # do status e a transição acontecem juntas, então duas transições
+        # concorrentes da mesma consulta não publicam dois eventos. Os eventos
+        # são publicados fora do lock (inscritos como a lista de espera agendam).
+        self._booking_lock = threading.Lock()
+        self._slot_flights = SingleFlight()
+
+    def _publish(self, event_type, appointment: Appointment, before=None, **fields) -> None:
+        if self.events:
+            after = appointment.snapshot() if event_type is not AppointmentDeleted else None
+            self.events.publish(event_type(appointment_id=appointment.id, before=before, after=after, **fields))
 
     def get_all(self):
         """Retorna todas as consultas cadastradas."""
         return self.appointment_repository.all()
 
+    def iter_all(self, patient_id: int = None, psychologist_id: int = None):
+        """
+        Percorre as consultas sob demanda, sem montar uma lista.
+        
+        Args:
+            patient_id: Filtrar por paciente (opcional)
+            psychologist_id: Filtrar por psicólogo (opcional)
+        """
+        for appointment in self.appointment_repository.iter_all():
+            if patient_id and appointment.patient_id != patient_id:
+                continue
+            if psychologist_id and appointment.psychologist_id != psychologist_id:
+                continue
+            yield appointment
+
+    def get_version(self):
+        """
+        Versão das coleções que compõem as respostas de consultas
+        (inclui pacientes e psicólogos por causa do ?include=).
+        """
+        return (self.appointment_repository.version,
+                self.patient_repository.version,
+                self.psychologist_repository.version)
+
+    def get_related(self, appointments, include):
+        """
+        Resolve em lote os recursos relacionados das consultas, com um único
+        multi-get por tipo.
+        
+        Args:
+            appointments: Consultas cujos relacionamentos serão resolvidos
+            include: Nomes dos relacionamentos (ver RELATIONS)
+            
+        Returns:
+            Dict: {nome: (atributo_fk, {id: entidade})}
+        """
+        repositories = {"patient": self.patient_repository, "psychologist": self.psychologist_repository}
+        related = {}
+        for name in include:
+            foreign_key = self.RELATIONS[name]
+            ids = {getattr(a, foreign_key) for a in appointments}
+            related[name] = (foreign_key, repositories[name].get_many(ids))
+        return related
+
     def get_by_id(self, appointment_id: int):
         """
         Busca uma consulta pelo ID.
@@ -62,10 +136,33 @@ class AppointmentService:
         """Retorna todas as consultas de um psicólogo."""
         return [a for a in self.get_all() if a.psychologist_id == psychologist_id]
 
+    def get_psychologist_summary(self, psychologist_id: int, limit: int = 5):
+        """
+        Resume a agenda de um psicólogo a partir dos agregados, sem varrer consultas.
+        
+        Args:
+            psychologist_id: ID do psicólogo
+            limit: Quantidade de próximas sessões
+            
+        Returns:
+            Dict com today, week, unique_patients e upcoming (consultas)
+        """
+        summary = self.agendas.summary(psychologist_id, limit)
+        found = self.appointment_repository.get_many(summary.pop("upcoming_ids"))
+        summary["upcoming"] = [found[i] for i in sorted(found, key=lambda i: found[i].get_datetime())]
+        return summary
+
+    def get_agenda_version(self, psychologist_id: int):
+        """Versão da agenda de um psicólogo, usada para ETags."""
+        return self.agendas.version(psychologist_id)
+
     def get_available_slots(self, psychologist_id: int, date_str: str, duration: int = 60):
         """
         Retorna lista de horários disponíveis para um psicólogo em uma data específica.
         
+        Chamadas simultâneas com os mesmos argumentos (e os mesmos dados)
+        compartilham um único cálculo; a lista retornada não deve ser alterada.
+        
         Args:
             psychologist_id: ID do psicólogo
             date_str: Data no formato yyyy-mm-dd
@@ -74,6 +171,14 @@ class AppointmentService:
         Returns:
             List[str]: Lista de horários disponíveis (HH:MM)
         """
+        key = (psychologist_id, date_str, duration,
+               self.appointment_repository.version, self.availability_repository.version,
+               self.holds.version if self.holds else None)
+        return self._slot_flights.do(
+            key, lambda: self._compute_available_slots(psychologist_id, date_str, duration)
+        )
+
+    def _compute_available_slots(self, psychologist_id: int, date_str: str, duration: int):
         try:
             appt_date = date.fromisoformat(date_str)
         except:
@@ -97,6 +202,9 @@ class AppointmentService:
                 else:
                     booked_time = ap.time
                 booked_times.add(booked_time.strftime('%H:%M'))
+        # Horários reservados por pacientes em processo de agendamento
+        if self.holds:
+            booked_times |= self.holds.busy_times(psychologist_id, appt_date)
         
         available_slots = []
         for ava in day_availabilities:
@@ -112,28 +220,12 @@ class AppointmentService:
         
         return sorted(available_slots)
 
-    def schedule_appointment(self, patient_id: int, psychologist_id: int, 
-                            date_str: str, time_str: str, duration: int = 60, 
-                            notes: str = None) -> Appointment:
+    def _validate_slot(self, patient_id: int, psychologist_id: int, date_str: str, time_str: str):
         """
-        Agenda uma nova consulta.
+        Valida paciente, psicólogo, data/hora e disponibilidade de um horário.
         
-        Args:
-            patient_id: ID do paciente
-            psychologist_id: ID do psicólogo
-            date_str: Data da consulta (yyyy-mm-dd)
-            time_str: Horário da consulta (HH:MM)
-            duration: Duração em minutos
-            notes: Observações (opcional)
-            
         Returns:
-            Appointment: Consulta agendada
-            
-        Raises:
-            NotFoundError: Se paciente ou psicólogo não forem encontrados
-            ValidationError: Se data/hora forem inválidos
-            BusinessRuleError: Se psicólogo estiver inativo ou sem disponibilidade
-            ConflictError: Se já existir consulta no horário
+            Tuple[date, time]: Data e hora convertidas
         """
         # Validar existência
         patient = self.patient_repository.get(patient_id)
@@ -167,7 +259,9 @@ class AppointmentService:
         if not slot_ok:
             raise BusinessRuleError("Horário fora da faixa de disponibilidade")
         
-        # Checar conflitos
+        return appt_date, appt_time
+
+    def _check_conflicts(self, psychologist_id: int, appt_date: date, appt_time: dtime) -> None:
         existing = self.appointment_repository.all()
         for ap in existing:
             if (ap.psychologist_id == psychologist_id and 
@@ -175,12 +269,101 @@ class AppointmentService:
                 ap.time == appt_time and 
                 ap.status != 'cancelled'):
                 raise ConflictError("Já existe consulta agendada neste horário")
+
+    def schedule_appointment(self, patient_id: int, psychologist_id: int, 
+                            date_str: str, time_str: str, duration: int = 60, 
+                            notes: str = None, hold_id: str = None) -> Appointment:
+        """
+        Agenda uma nova consulta.
+        
+        Com ``hold_id`` o horário reservado pelo paciente é garantido enquanto
+        a reserva estiver ativa; sem ele, horários reservados por outro
+        paciente são recusados.
         
-        # Criar e salvar
-        appt = Appointment(patient_id, psychologist_id, appt_date, appt_time, duration, notes)
-        self.appointment_repository.add(appt)
+        Args:
+            patient_id: ID do paciente
+            psychologist_id: ID do psicólogo
+            date_str: Data da consulta (yyyy-mm-dd)
+            time_str: Horário da consulta (HH:MM)
+            duration: Duração em minutos
+            notes: Observações (opcional)
+            hold_id: Reserva do horário (opcional)
+            
+        Returns:
+            Appointment: Consulta agendada
+            
+        Raises:
+            NotFoundError: Se paciente ou psicólogo não forem encontrados
+            ValidationError: Se data/hora forem inválidos
+            BusinessRuleError: Se psicólogo estiver inativo ou sem disponibilidade,
+                ou se a reserva estiver expirada ou não corresponder ao horário
+            ConflictError: Se já existir consulta ou reserva de outro paciente no horário
+        """
+        appt_date, appt_time = self._validate_slot(patient_id, psychologist_id, date_str, time_str)
+        
+        # Verificação e gravação serializadas: nenhum outro agendamento ou
+        # reserva do mesmo horário passa entre as duas
+        with self._booking_lock:
+            holder = self.holds.holder(psychologist_id, appt_date, appt_time) if self.holds else None
+            if hold_id and (holder is None or holder.id != hold_id or holder.patient_id != patient_id):
+                raise BusinessRuleError("Reserva expirada ou inválida para este horário")
+            if holder and holder.patient_id != patient_id:
+                raise ConflictError("Horário reservado por outro paciente")
+            self._check_conflicts(psychologist_id, appt_date, appt_time)
+            
+            # Criar e salvar
+            appt = Appointment(patient_id, psychologist_id, appt_date, appt_time, duration, notes)
+            self.appointment_repository.add(appt)
+            if holder:
+                self.holds.release(holder.id, reason="booked")
+        self._publish(AppointmentScheduled, appt)
         return appt
 
+    def hold_slot(self, patient_id: int, psychologist_id: int, date_str: str, time_str: str,
+                  duration: int = 60, replace: bool = True) -> SlotHold:
+        """
+        Reserva um horário por alguns minutos enquanto o paciente conclui o agendamento.
+        
+        Uma nova reserva do mesmo paciente libera a anterior, a menos que
+        ``replace`` seja False.
+        
+        Args:
+            patient_id: ID do paciente
+            psychologist_id: ID do psicólogo
+            date_str: Data (yyyy-mm-dd)
+            time_str: Horário (HH:MM)
+            duration: Duração da consulta em minutos
+            replace: Se False, falha quando o paciente já tem uma reserva ativa
+            
+        Returns:
+            SlotHold: Reserva criada
+            
+        Raises:
+            NotFoundError, ValidationError, BusinessRuleError: Como em schedule_appointment
+            ConflictError: Se o horário já estiver agendado ou reservado por outro
+                paciente, ou se o paciente já tiver reserva e ``replace`` for False
+        """
+        appt_date, appt_time = self._validate_slot(patient_id, psychologist_id, date_str, time_str)
+        
+        with self._booking_lock:
+            if not replace and self.holds.for_patient(patient_id):
+                raise ConflictError("Paciente já tem uma reserva em andamento")
+            holder = self.holds.holder(psychologist_id, appt_date, appt_time)
+            if holder and holder.patient_id != patient_id:
+                raise ConflictError("Horário reservado por outro paciente")
+            self._check_conflicts(psychologist_id, appt_date, appt_time)
+            return self.holds.add(patient_id, psychologist_id, appt_date, appt_time, duration)
+
+    def release_hold(self, hold_id: str) -> None:
+        """
+        Libera uma reserva antes do prazo.
+        
+        Raises:
+            NotFoundError: Se a reserva não existir ou já tiver expirado
+        """
+        if not self.holds.release(hold_id):
+            raise NotFoundError("Reserva", hold_id)
+
     def cancel_appointment(self, appointment_id: int, reason: str = None) -> Appointment:
         """
         Cancela uma consulta.
@@ -196,13 +379,16 @@ class AppointmentService:
             NotFoundError: Se a consulta não for encontrada
             BusinessRuleError: Se a consulta não puder ser cancelada
         """
-        appt = self.get_by_id(appointment_id)
-        
-        if appt.status in ['cancelled', 'completed']:
-            raise BusinessRuleError(f"Consulta com status '{appt.status}' não pode ser cancelada")
-        
-        appt.cancel(reason)
-        self.appointment_repository.update(appt)
+        with self._booking_lock:
+            appt = self.get_by_id(appointment_id)
+            
+            if appt.status in ['cancelled', 'completed']:
+                raise BusinessRuleError(f"Consulta com status '{appt.status}' não pode ser cancelada")
+            
+            before = appt.snapshot()
+            appt.cancel(reason)
+            self.appointment_repository.update(appt)
+        self._publish(AppointmentCancelled, appt, before, reason=reason)
         return appt
 
     def complete_appointment(self, appointment_id: int) -> Appointment:
@@ -219,14 +405,46 @@ class AppointmentService:
             NotFoundError: Se a consulta não for encontrada
             BusinessRuleError: Se a consulta não puder ser concluída
         """
-        appt = self.get_by_id(appointment_id)
+        with self._booking_lock:
+            appt = self.get_by_id(appointment_id)
+            
+            if appt.status not in ['scheduled', 'confirmed']:
+                raise BusinessRuleError(f"Consulta com status '{appt.status}' não pode ser concluída")
+            
+            before = appt.snapshot()
+            appt.complete()
+            self.appointment_repository.update(appt)
+        self._publish(AppointmentCompleted, appt, before)
+        return appt
+
+    def complete_due(self, appointment_ids, now: datetime = None):
+        """
+        Conclui em lote as consultas que já terminaram (usado pelo agendador).
         
-        if appt.status not in ['scheduled', 'confirmed']:
-            raise BusinessRuleError(f"Consulta com status '{appt.status}' não pode ser concluída")
+        Consultas removidas, já canceladas/concluídas ou remarcadas para
+        depois de ``now`` são ignoradas.
         
-        appt.complete()
-        self.appointment_repository.update(appt)
-        return appt
+        Args:
+            appointment_ids: IDs candidatos
+            now: Instante de referência (default: agora)
+            
+        Returns:
+            List[Appointment]: Consultas concluídas
+        """
+        now = now or datetime.now()
+        transitions = []
+        with self._booking_lock:
+            # Status relido dentro do lock: um cancelamento concorrente vence ou é recusado
+            for appt in self.appointment_repository.get_many(appointment_ids).values():
+                if appt.status not in ['scheduled', 'confirmed'] or appt.get_end_datetime() > now:
+                    continue
+                before = appt.snapshot()
+                appt.complete()
+                self.appointment_repository.update(appt)
+                transitions.append((appt, before))
+        for appt, before in transitions:
+            self._publish(AppointmentCompleted, appt, before, automatic=True)
+        return [appt for appt, _ in transitions]
 
     def delete_appointment(self, appointment_id: int) -> None:
         """
@@ -238,5 +456,7 @@ class AppointmentService:
         Raises:
             NotFoundError: Se a consulta não for encontrada
         """
-        self.get_by_id(appointment_id)
-        self.appointment_repository.delete(appointment_id)
+        with self._booking_lock:
+            appt = self.get_by_id(appointment_id)
+            self.appointment_repository.delete(appointment_id)
+        self._publish(AppointmentDeleted, appt, appt.snapshot())
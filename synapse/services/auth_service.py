@@ -1,12 +1,45 @@
 from synapse.repositories.implementations.inmemory_user_repository import InMemoryUserRepository
 from synapse.business_model.user import User
+from synapse.services.password_hasher import PasswordHasher
+from synapse.services.token_service import TokenService
+from synapse.api.exceptions import ServiceUnavailableError
 
 class AuthService:
-    def __init__(self, user_repository: InMemoryUserRepository):
+    def __init__(self, user_repository: InMemoryUserRepository, password_hasher: PasswordHasher = None,
+                 token_service: TokenService = None):
         self.user_repository = user_repository
+        self.password_hasher = password_hasher or PasswordHasher()
+        self.token_service = token_service
 
     def login(self, email: str, password: str) -> User | None:
         user = self.user_repository.get_by_email(email)
-        if user and user.check_password(password):
-            return user
-        return None
+        if not user or not self._check_password(user, password):
+            return None
+        # Senha correta em mãos: gera o hash de senhas pendentes (seeds)
+        # e migra hashes gerados com outro custo. É oportunista: com o pool
+        # saturado o login segue e a migração fica para o próximo.
+        if self.password_hasher.needs_rehash(user.password_hash):
+            try:
+                user.set_password_hash(self.password_hasher.hash(password))
+                self.user_repository.update(user)
+            except ServiceUnavailableError:
+                pass
+        return user
+
+    def change_password(self, user: User, old_password: str, new_password: str) -> bool:
+        if not self._check_password(user, old_password) or len(new_password) < 8:
+            return False
+        user.set_password_hash(self.password_hasher.hash(new_password))
+        self.user_repository.update(user)
+        return True
+
+    def _check_password(self, user: User, password: str) -> bool:
+        if user.has_pending_password:
+            return user.check_pending_password(password)
+        return self.password_hasher.verify(password, user.password_hash)
+
+    def issue_token(self, user: User) -> str:
+        return self.token_service.issue(user)
+
+    def verify_token(self, token: str) -> dict | None:
+        return self.token_service.verify(token)
@@ -8,6 +8,7 @@ from typing import List
 from synapse.repositories.implementations.inmemory_availability_repository import InMemoryAvailabilityRepository
 from synapse.repositories.implementations.inmemory_psychologist_repository import InMemoryPsychologistRepository
 from synapse.business_model.availability import Availability
+from synapse.services.events import EventBus, AvailabilityCreated, AvailabilityUpdated, AvailabilityDeleted
 from synapse.api.exceptions import NotFoundError, ValidationError, ConflictError
 
 
@@ -18,17 +19,49 @@ class AvailabilityService:
     Attributes:
         availability_repository: Repositório para persistência de disponibilidades
         psychologist_repository: Repositório para validação de psicólogos
+        events: Barramento onde as escritas são publicadas (opcional)
     """
     
+    # Relacionamentos que podem ser embutidos (?include=) -> atributo de chave estrangeira
+    RELATIONS = {"psychologist": "psychologist_id"}
+    
     def __init__(self, availability_repository: InMemoryAvailabilityRepository,
-                 psychologist_repository: InMemoryPsychologistRepository):
+                 psychologist_repository: InMemoryPsychologistRepository,
+                 events: EventBus = None):
         self.availability_repository = availability_repository
         self.psychologist_repository = psychologist_repository
+        self.events = events
+
+    def _publish(self, event_type, availability: Availability) -> None:
+        if self.events:
+            self.events.publish(event_type(availability_id=availability.id,
+                                           psychologist_id=availability.psychologist_id))
 
     def get_all(self):
         """Retorna todas as disponibilidades cadastradas."""
         return self.availability_repository.all()
 
+    def get_version(self):
+        """
+        Versão das coleções que compõem as respostas de disponibilidades
+        (inclui psicólogos por causa do ?include=).
+        """
+        return (self.availability_repository.version,
+                self.psychologist_repository.version)
+
+    def get_related(self, availabilities, include):
+        """
+        Resolve em lote os psicólogos das disponibilidades, com um único multi-get.
+        
+        Returns:
+            Dict: {nome: (atributo_fk, {id: entidade})}
+        """
+        related = {}
+        if "psychologist" in include:
+            ids = {a.psychologist_id for a in availabilities}
+            related["psychologist"] = ("psychologist_id", self.psychologist_repository.get_many(ids))
+        return related
+
     def get_by_id(self, availability_id: int):
         """
         Busca uma disponibilidade pelo ID.
@@ -114,6 +147,7 @@ class AvailabilityService:
             end_time=end_time
         )
         self.availability_repository.add(availability)
+        self._publish(AvailabilityCreated, availability)
         return availability
 
     def update_availability(self, availability_id: int, start_time_str: str = None,
@@ -155,6 +189,7 @@ class AvailabilityService:
                 availability.deactivate()
                 
         self.availability_repository.update(availability)
+        self._publish(AvailabilityUpdated, availability)
         return availability
 
     def delete_availability(self, availability_id: int) -> None:
@@ -167,14 +202,16 @@ class AvailabilityService:
         Raises:
             NotFoundError: Se a disponibilidade não for encontrada
         """
-        self.get_by_id(availability_id)
+        availability = self.get_by_id(availability_id)
         self.availability_repository.delete(availability_id)
+        self._publish(AvailabilityDeleted, availability)
 
     def deactivate(self, availability_id: int) -> Availability:
         """Desativa uma disponibilidade."""
         availability = self.get_by_id(availability_id)
         availability.deactivate()
         self.availability_repository.update(availability)
+        self._publish(AvailabilityUpdated, availability)
         return availability
 
     def activate(self, availability_id: int) -> Availability:
@@ -182,4 +219,5 @@ class AvailabilityService:
         availability = self.get_by_id(availability_id)
         availability.activate()
         self.availability_repository.update(availability)
+        self._publish(AvailabilityUpdated, availability)
         return availability
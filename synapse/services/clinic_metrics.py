@@ -0,0 +1,111 @@
+"""
+Métricas do dashboard da clínica.
+Contadores mantidos incrementalmente pelos serviços a cada mudança de estado.
+"""
+
+import threading
+from collections import Counter
+from datetime import date
+from typing import Dict, Iterable, Optional
+from synapse.business_model.appointment import AppointmentState
+from synapse.services.events import EventBus, LeadEvent, AppointmentEvent, PsychologistEvent
+
+
+class ClinicMetrics:
+    """
+    Contadores agregados da clínica.
+
+    Os contadores acompanham os eventos de domínio (ver ``subscribe``): cada
+    evento traz a transição da entidade como (antes, depois), com None para
+    "não existia" ou "foi removida". Nenhuma leitura percorre
+    os repositórios: ``snapshot`` custa O(número de status).
+
+    Attributes:
+        leads_by_status: Quantidade de leads por status
+        appointments_by_date: Consultas não canceladas por data
+        active_psychologists: Psicólogos ativos
+    """
+
+    def __init__(self):
+        self.leads_by_status = Counter()
+        self.appointments_by_date = Counter()
+        self.active_psychologists = 0
+        self._version = 0
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        """Incrementada a cada mudança, usada para ETags."""
+        return self._version
+
+    def rebuild(self, leads: Iterable, appointments: Iterable, psychologists: Iterable) -> None:
+        """Recalcula todos os contadores a partir das entidades (usado na inicialização)."""
+        with self._lock:
+            self.leads_by_status = Counter(l.status for l in leads)
+            self.appointments_by_date = Counter(a.date for a in appointments if a.status != 'cancelled')
+            self.active_psychologists = sum(1 for p in psychologists if p.is_active)
+            self._version += 1
+
+    def subscribe(self, events: EventBus) -> None:
+        """Inscreve os contadores (síncronos) nos eventos de leads, consultas e psicólogos."""
+        events.subscribe(LeadEvent, lambda e: self.track_lead(e.before, e.after))
+        events.subscribe(AppointmentEvent, lambda e: self.track_appointment(e.before, e.after))
+        events.subscribe(PsychologistEvent, lambda e: self.track_psychologist(e.was_active, e.is_active))
+
+    def track_lead(self, before: Optional[str], after: Optional[str]) -> None:
+        """Registra a transição de status de um lead."""
+        if before == after:
+            return
+        with self._lock:
+            if before is not None:
+                self.leads_by_status[before] -= 1
+            if after is not None:
+                self.leads_by_status[after] += 1
+            self._version += 1
+
+    def track_appointment(self, before: Optional[AppointmentState], after: Optional[AppointmentState]) -> None:
+        """Registra a transição (data, status) de uma consulta."""
+        before = (before.date, before.status) if before else None
+        after = (after.date, after.status) if after else None
+        if before == after:
+            return
+        with self._lock:
+            if before is not None and before[1] != 'cancelled':
+                self.appointments_by_date[before[0]] -= 1
+            if after is not None and after[1] != 'cancelled':
+                self.appointments_by_date[after[0]] += 1
+            self._version += 1
+
+    def track_psychologist(self, before: Optional[bool], after: Optional[bool]) -> None:
+        """Registra a transição do flag is_active de um psicólogo."""
+        delta = int(bool(after)) - int(bool(before))
+        if not delta:
+            return
+        with self._lock:
+            self.active_psychologists += delta
+            self._version += 1
+
+    def snapshot(self, today: date = None) -> Dict:
+        """
+        Retorna as métricas do dashboard.
+
+        Args:
+            today: Data de referência para "consultas de hoje" (default: hoje)
+
+        Returns:
+            Dict com leads (total e por status), consultas do dia,
+            psicólogos ativos e taxa de conversão (%)
+        """
+        today = today or date.today()
+        with self._lock:
+            by_status = {status: count for status, count in self.leads_by_status.items() if count}
+            appointments_today = self.appointments_by_date.get(today, 0)
+            active = self.active_psychologists
+        total = sum(by_status.values())
+        converted = by_status.get('converted', 0)
+        return {
+            "leads": {"total": total, "by_status": by_status},
+            "appointments_today": appointments_today,
+            "active_psychologists": active,
+            "conversion_rate": round(converted / total * 100, 1) if total else 0.0
+        }
@@ -23,6 +23,10 @@ class ClinicService:
         """Retorna todas as clínicas cadastradas."""
         return self.clinic_repository.all()
 
+    def get_version(self):
+        """Versão da coleção, usada para ETags e GETs condicionais."""
+        return self.clinic_repository.version
+
     def get_by_id(self, clinic_id: int):
         """
         Busca uma clínica pelo ID.
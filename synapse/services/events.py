@@ -0,0 +1,301 @@
+"""
+Eventos de domínio e barramento em processo.
+Os serviços publicam um evento após cada escrita bem-sucedida; agregados,
+índices e notificações se inscrevem sem que os serviços os conheçam.
+"""
+
+import logging
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, time
+from typing import Callable, Dict, Iterable, List, Optional, Type, TypeVar
+from synapse.business_model.appointment import AppointmentState
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# EVENTOS
+# =============================================================================
+
+@dataclass(frozen=True, kw_only=True)
+class DomainEvent:
+    """Base de todos os eventos. Eventos são imutáveis e não carregam entidades."""
+    occurred_at: datetime = field(default_factory=datetime.now)
+
+
+@dataclass(frozen=True, kw_only=True)
+class AppointmentEvent(DomainEvent):
+    """Transição de uma consulta (None = não existia / foi removida)."""
+    appointment_id: int
+    before: Optional[AppointmentState]
+    after: Optional[AppointmentState]
+
+
+@dataclass(frozen=True, kw_only=True)
+class AppointmentScheduled(AppointmentEvent):
+    pass
+
+
+@dataclass(frozen=True, kw_only=True)
+class AppointmentCancelled(AppointmentEvent):
+    reason: Optional[str] = None
+
+
+@dataclass(frozen=True, kw_only=True)
+class AppointmentCompleted(AppointmentEvent):
+    automatic: bool = False
+
+
+@dataclass(frozen=True, kw_only=True)
+class AppointmentDeleted(AppointmentEvent):
+    pass
+
+
+@dataclass(frozen=True, kw_only=True)
+class LeadEvent(DomainEvent):
+    """Transição de status de um lead (None = não existia / foi removido)."""
+    lead_id: int
+    before: Optional[str]
+    after: Optional[str]
+
+
+@dataclass(frozen=True, kw_only=True)
+class LeadCreated(LeadEvent):
+    pass
+
+
+@dataclass(frozen=True, kw_only=True)
+class LeadUpdated(LeadEvent):
+    pass
+
+
+@dataclass(frozen=True, kw_only=True)
+class LeadContacted(LeadEvent):
+    pass
+
+
+@dataclass(frozen=True, kw_only=True)
+class LeadLost(LeadEvent):
+    pass
+
+
+@dataclass(frozen=True, kw_only=True)
+class LeadConverted(LeadEvent):
+    patient_id: int
+
+
+@dataclass(frozen=True, kw_only=True)
+class LeadDeleted(LeadEvent):
+    pass
+
+
+@dataclass(frozen=True, kw_only=True)
+class PatientEvent(DomainEvent):
+    patient_id: int
+
+
+@dataclass(frozen=True, kw_only=True)
+class PatientCreated(PatientEvent):
+    pass
+
+
+@dataclass(frozen=True, kw_only=True)
+class PatientUpdated(PatientEvent):
+    pass
+
+
+@dataclass(frozen=True, kw_only=True)
+class PatientDeleted(PatientEvent):
+    pass
+
+
+@dataclass(frozen=True, kw_only=True)
+class PsychologistEvent(DomainEvent):
+    """Transição do flag is_active de um psicólogo (None = não existia / foi removido)."""
+    psychologist_id: int
+    was_active: Optional[bool]
+    is_active: Optional[bool]
+
+
+@dataclass(frozen=True, kw_only=True)
+class PsychologistCreated(PsychologistEvent):
+    pass
+
+
+@dataclass(frozen=True, kw_only=True)
+class PsychologistUpdated(PsychologistEvent):
+    pass
+
+
+@dataclass(frozen=True, kw_only=True)
+class PsychologistDeleted(PsychologistEvent):
+    pass
+
+
+@dataclass(frozen=True, kw_only=True)
+class AvailabilityEvent(DomainEvent):
+    availability_id: int
+    psychologist_id: int
+
+
+@dataclass(frozen=True, kw_only=True)
+class AvailabilityCreated(AvailabilityEvent):
+    pass
+
+
+@dataclass(frozen=True, kw_only=True)
+class AvailabilityUpdated(AvailabilityEvent):
+    pass
+
+
+@dataclass(frozen=True, kw_only=True)
+class AvailabilityDeleted(AvailabilityEvent):
+    pass
+
+
+@dataclass(frozen=True, kw_only=True)
+class WaitlistEvent(DomainEvent):
+    entry_id: int
+    patient_id: int
+    psychologist_id: int
+
+
+@dataclass(frozen=True, kw_only=True)
+class WaitlistSlotOffered(WaitlistEvent):
+    """Um horário liberado foi reservado para o paciente da lista de espera."""
+    hold_id: str
+    date: date
+    time: time
+    expires_at: datetime
+
+
+@dataclass(frozen=True, kw_only=True)
+class SlotHoldEvent(DomainEvent):
+    """Reserva temporária de um horário durante o agendamento (ver SlotHolds)."""
+    hold_id: str
+    patient_id: int
+    psychologist_id: int
+    date: date
+    time: time
+    duration: int
+
+
+@dataclass(frozen=True, kw_only=True)
+class SlotHeld(SlotHoldEvent):
+    expires_at: datetime
+
+
+@dataclass(frozen=True, kw_only=True)
+class SlotHoldReleased(SlotHoldEvent):
+    """Reserva encerrada: ``released`` (pelo paciente), ``replaced`` (nova
+    reserva do paciente), ``booked`` (virou consulta) ou ``expired``."""
+    reason: str
+
+
+# =============================================================================
+# BARRAMENTO
+# =============================================================================
+
+E = TypeVar('E', bound=DomainEvent)
+Handler = Callable[[DomainEvent], None]
+
+
+class EventBus:
+    """
+    Barramento de eventos de domínio.
+
+    Um inscrito recebe os eventos do tipo informado e de suas subclasses
+    (inscrever-se em AppointmentEvent recebe agendamentos, cancelamentos etc.).
+
+    - Inscritos síncronos rodam na thread que publicou, antes de ``publish``
+      retornar: use para agregados que a próxima leitura precisa ver.
+    - Inscritos em background rodam em um pool de threads: use para efeitos
+      lentos (notificações, relatórios), que não entram na latência da requisição.
+
+    Uma falha em um inscrito é registrada no log e não afeta os demais nem a
+    escrita que originou o evento, que já foi concluída.
+
+    Attributes:
+        max_workers: Threads do pool de inscritos em background
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self.max_workers = max_workers
+        self._sync: Dict[type, List[Handler]] = defaultdict(list)
+        self._background: Dict[type, List[Handler]] = defaultdict(list)
+        self._resolved: Dict[type, tuple] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def subscribe(self, event_type: Type[E], handler: Callable[[E], None], background: bool = False) -> None:
+        """
+        Inscreve um handler.
+
+        Args:
+            event_type: Classe do evento (inclui subclasses)
+            handler: Função que recebe o evento
+            background: Se True, o handler roda no pool de threads
+        """
+        with self._lock:
+            (self._background if background else self._sync)[event_type].append(handler)
+            self._resolved = {}
+
+    def _handlers(self, event_type: type) -> tuple:
+        handlers = self._resolved.get(event_type)
+        if handlers is None:
+            with self._lock:
+                mro = event_type.__mro__
+                handlers = (
+                    [h for cls in mro for h in self._sync.get(cls, ())],
+                    [h for cls in mro for h in self._background.get(cls, ())],
+                )
+                self._resolved[event_type] = handlers
+        return handlers
+
+    def publish(self, event: DomainEvent) -> None:
+        """Entrega um evento aos inscritos."""
+        self.publish_all((event,))
+
+    def publish_all(self, events: Iterable[DomainEvent]) -> None:
+        """
+        Entrega uma sequência de eventos, na ordem.
+
+        Os inscritos em background recebem o lote em uma única tarefa do pool,
+        para que escritas em massa (ex: importação) não criem uma tarefa por evento.
+        """
+        batches: Dict[Handler, List[DomainEvent]] = defaultdict(list)
+        for event in events:
+            sync, background = self._handlers(type(event))
+            for handler in sync:
+                self._call(handler, event)
+            for handler in background:
+                batches[handler].append(event)
+        for handler, batch in batches.items():
+            self._pool().submit(self._call_all, handler, batch)
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix='events')
+        return self._executor
+
+    @staticmethod
+    def _call(handler: Handler, event: DomainEvent) -> None:
+        try:
+            handler(event)
+        except Exception:
+            logger.exception("Falha no inscrito %r ao tratar %s", handler, type(event).__name__)
+
+    @classmethod
+    def _call_all(cls, handler: Handler, events: List[DomainEvent]) -> None:
+        for event in events:
+            cls._call(handler, event)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Encerra o pool, aguardando os eventos em background pendentes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
@@ -0,0 +1,106 @@
+"""
+Serviço de exportação de dados.
+Gera CSV ou NDJSON sob demanda, direto dos repositórios, em memória constante.
+"""
+
+import csv
+import io
+import json
+import time
+from datetime import date, datetime
+from typing import Callable, Iterable, Iterator, List, Optional
+from synapse.repositories.implementations.inmemory_appointment_repository import InMemoryAppointmentRepository
+from synapse.repositories.implementations.inmemory_lead_repository import InMemoryLeadRepository
+from synapse.repositories.implementations.inmemory_patient_repository import InMemoryPatientRepository
+
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+
+def _day(value) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return None
+
+
+class ExportService:
+    """
+    Serviço responsável por exportações de consultas, leads e pacientes.
+
+    Os registros são lidos um a um (``iter_all``) e codificados em blocos de
+    até EXPORT_CHUNK_SIZE bytes; nenhuma lista completa é montada. Entre os
+    blocos o gerador cede a CPU para as threads de tráfego interativo.
+
+    Attributes:
+        appointment_repository: Repositório de consultas
+        lead_repository: Repositório de leads
+        patient_repository: Repositório de pacientes
+    """
+
+    APPOINTMENT_COLUMNS = ["id", "patient_id", "psychologist_id", "date", "time", "duration",
+                           "status", "notes", "created_at", "cancelled_at", "cancellation_reason"]
+    LEAD_COLUMNS = ["id", "name", "email", "phone", "source", "status", "notes",
+                    "created_at", "converted_at", "converted_to_patient_id"]
+    PATIENT_COLUMNS = ["id", "name", "email", "phone", "cpf", "created_at"]
+
+    def __init__(self, appointment_repository: InMemoryAppointmentRepository,
+                 lead_repository: InMemoryLeadRepository,
+                 patient_repository: InMemoryPatientRepository):
+        self.appointment_repository = appointment_repository
+        self.lead_repository = lead_repository
+        self.patient_repository = patient_repository
+
+    def _filter(self, entities: Iterable, day_of: Callable, start: date = None,
+                end: date = None, status: str = None) -> Iterator:
+        for entity in entities:
+            if status and getattr(entity, "status", None) != status:
+                continue
+            if start or end:
+                day = _day(day_of(entity))
+                if day is None or (start and day < start) or (end and day > end):
+                    continue
+            yield entity
+
+    def iter_appointments(self, start: date = None, end: date = None, status: str = None) -> Iterator:
+        """Consultas com data da sessão entre start e end (inclusive)."""
+        return self._filter(self.appointment_repository.iter_all(), lambda a: a.date, start, end, status)
+
+    def iter_leads(self, start: date = None, end: date = None, status: str = None) -> Iterator:
+        """Leads criados entre start e end (inclusive)."""
+        return self._filter(self.lead_repository.iter_all(), lambda l: l.created_at, start, end, status)
+
+    def iter_patients(self, start: date = None, end: date = None) -> Iterator:
+        """Pacientes cadastrados entre start e end (inclusive)."""
+        return self._filter(self.patient_repository.iter_all(), lambda p: p.created_at, start, end)
+
+    def encode(self, entities: Iterable, columns: List[str], fmt: str) -> Iterator[bytes]:
+        """
+        Codifica as entidades em blocos de bytes.
+
+        Args:
+            entities: Entidades a exportar
+            columns: Colunas (chaves do to_dict) na ordem de saída
+            fmt: 'csv' ou 'ndjson'
+        """
+        buffer = io.StringIO()
+        writer = None
+        if fmt == "csv":
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+
+        for entity in entities:
+            data = entity.to_dict()
+            if writer:
+                writer.writerow(["" if data[c] is None else data[c] for c in columns])
+            else:
+                buffer.write(json.dumps({c: data[c] for c in columns}, ensure_ascii=False))
+                buffer.write("\n")
+            if buffer.tell() >= EXPORT_CHUNK_SIZE:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+                time.sleep(0)
+
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
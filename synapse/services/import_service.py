@@ -0,0 +1,151 @@
+"""
+Serviço de importação em massa.
+Lê CSV ou NDJSON em fluxo, valida em blocos e grava com inserções em lote.
+"""
+
+import csv
+import io
+import json
+from itertools import islice
+from typing import BinaryIO, Callable, Dict, Iterator, Tuple, Type
+from pydantic import BaseModel
+from synapse.repositories.implementations.inmemory_lead_repository import InMemoryLeadRepository
+from synapse.repositories.implementations.inmemory_patient_repository import InMemoryPatientRepository
+from synapse.business_model.lead import Lead
+from synapse.business_model.patient import Patient
+from synapse.api.dto import LeadCreateDTO, PatientCreateDTO
+from synapse.api.validation import validate_many
+from synapse.services.events import EventBus, LeadCreated, PatientCreated
+
+IMPORT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+
+
+class ImportService:
+    """
+    Serviço responsável por importações em massa de leads e pacientes.
+
+    O arquivo é lido linha a linha; a cada ``chunk_size`` linhas o bloco é
+    validado em uma única chamada (``validate_many``) e os registros válidos
+    são gravados com ``add_many``. Linhas inválidas são reportadas sem
+    interromper a importação.
+
+    Attributes:
+        lead_repository: Repositório de leads
+        patient_repository: Repositório de pacientes
+        chunk_size: Linhas por bloco de validação/gravação
+        max_errors: Máximo de erros detalhados no relatório
+        events: Barramento onde os registros importados são publicados (opcional)
+    """
+
+    def __init__(self, lead_repository: InMemoryLeadRepository,
+                 patient_repository: InMemoryPatientRepository,
+                 chunk_size: int = IMPORT_CHUNK_SIZE,
+                 max_errors: int = MAX_REPORTED_ERRORS,
+                 events: EventBus = None):
+        self.lead_repository = lead_repository
+        self.patient_repository = patient_repository
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+        self.events = events
+
+    def import_leads(self, stream: BinaryIO, fmt: str) -> Dict:
+        """
+        Importa leads de um arquivo CSV ou NDJSON.
+
+        Args:
+            stream: Fluxo binário com o conteúdo do arquivo
+            fmt: 'csv' ou 'ndjson'
+
+        Returns:
+            Dict com o relatório da importação (ver ``_import``)
+        """
+        return self._import(stream, fmt, LeadCreateDTO, Lead, self.lead_repository,
+                            lambda lead: LeadCreated(lead_id=lead.id, before=None, after=lead.status))
+
+    def import_patients(self, stream: BinaryIO, fmt: str) -> Dict:
+        """
+        Importa pacientes de um arquivo CSV ou NDJSON.
+
+        Args:
+            stream: Fluxo binário com o conteúdo do arquivo
+            fmt: 'csv' ou 'ndjson'
+
+        Returns:
+            Dict com o relatório da importação (ver ``_import``)
+        """
+        return self._import(stream, fmt, PatientCreateDTO, Patient, self.patient_repository,
+                            lambda patient: PatientCreated(patient_id=patient.id))
+
+    def _import(self, stream: BinaryIO, fmt: str, dto: Type[BaseModel], entity_class, repository,
+                created_event: Callable = None) -> Dict:
+        """
+        Returns:
+            Dict com imported, failed, errors (lista de {row, field, message},
+            limitada a max_errors) e errors_truncated
+        """
+        report = {"imported": 0, "failed": 0, "errors": [], "errors_truncated": False}
+
+        def fail(row, message, field=None):
+            report["failed"] += 1
+            if len(report["errors"]) < self.max_errors:
+                report["errors"].append({"row": row, "field": field, "message": message})
+            else:
+                report["errors_truncated"] = True
+
+        text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+        rows = self._parse_csv(text, dto) if fmt == "csv" else self._parse_ndjson(text)
+
+        try:
+            while True:
+                chunk = list(islice(rows, self.chunk_size))
+                if not chunk:
+                    break
+                payloads, numbers = [], []
+                for row, payload in chunk:
+                    if isinstance(payload, str):
+                        fail(row, payload)
+                    else:
+                        payloads.append(payload)
+                        numbers.append(row)
+
+                valid, errors = validate_many(dto, payloads)
+                for index, message, field in errors:
+                    fail(numbers[index], message, field)
+
+                entities = [entity_class(**item.model_dump()) for _, item in valid]
+                repository.add_many(entities)
+                if self.events and created_event:
+                    self.events.publish_all(created_event(entity) for entity in entities)
+                report["imported"] += len(entities)
+        except (csv.Error, UnicodeDecodeError) as e:
+            # Arquivo corrompido: o que já foi gravado permanece, o restante é descartado
+            fail(None, f"Arquivo inválido: {e}")
+        finally:
+            text.detach()
+
+        return report
+
+    def _parse_csv(self, text: io.TextIOBase, dto: Type[BaseModel]) -> Iterator[Tuple[int, object]]:
+        # Células vazias em colunas opcionais viram None, como um campo ausente no JSON
+        optional = [name for name, info in dto.model_fields.items() if not info.is_required()]
+        reader = csv.DictReader(text)
+        for record in reader:
+            for name in optional:
+                if record.get(name) == "":
+                    record[name] = None
+            yield reader.line_num, record
+
+    def _parse_ndjson(self, text: io.TextIOBase) -> Iterator[Tuple[int, object]]:
+        for line_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield line_number, "JSON inválido"
+                continue
+            if not isinstance(record, dict):
+                yield line_number, "Cada linha deve ser um objeto JSON"
+                continue
+            yield line_number, record
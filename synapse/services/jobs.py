@@ -0,0 +1,306 @@
+"""
+Fila de jobs em background com persistência em disco.
+Efeitos lentos (emails, integrações, relatórios) são enfileirados durante a
+requisição e executados depois por um pool de workers.
+"""
+
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[Dict], None]
+
+
+class JobQueue:
+    """
+    Fila de jobs durável em diretório local.
+
+    Cada job é um arquivo JSON em ``pending/`` cujo nome começa pelo instante
+    de execução (ms), então a ordem dos nomes é a ordem de execução. Um
+    worker reivindica o job renomeando o arquivo para ``running/`` (rename é
+    atômico: só um worker vence). Em caso de falha o job volta para
+    ``pending/`` com backoff exponencial; ao esgotar as tentativas vai para
+    ``failed/`` com o último erro. Arquivos ilegíveis (JSON truncado, campos
+    ausentes) vão direto para ``failed/``; nenhum erro encerra um worker.
+
+    Ao reivindicar um job o worker marca o início do lease (mtime do
+    arquivo). Jobs em ``running/`` com o lease vencido (processo interrompido
+    no meio) voltam para ``pending/`` na inicialização e periodicamente;
+    jobs dentro do lease são de um worker vivo, possivelmente de outro
+    processo, e ficam onde estão. Um handler que passe do lease pode ser
+    executado de novo, então ``lease`` deve ser bem maior que o job mais lento.
+
+    Attributes:
+        directory: Diretório raiz da fila
+        workers: Quantidade de threads de execução
+        max_attempts: Tentativas antes de mover o job para failed/
+        backoff_base: Espera (s) após a primeira falha; dobra a cada tentativa
+        backoff_max: Espera máxima (s) entre tentativas
+        poll_interval: Intervalo máximo (s) entre verificações da fila
+        lease: Tempo (s) após o qual um job em running/ é considerado abandonado
+    """
+
+    def __init__(self, directory: str, workers: int = 2, max_attempts: int = 5,
+                 backoff_base: float = 2.0, backoff_max: float = 300.0, poll_interval: float = 1.0,
+                 lease: float = 300.0):
+        self.directory = directory
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self._pending = os.path.join(directory, 'pending')
+        self._running = os.path.join(directory, 'running')
+        self._failed = os.path.join(directory, 'failed')
+        for path in (self._pending, self._running, self._failed):
+            os.makedirs(path, exist_ok=True)
+
+        self._handlers: Dict[str, Handler] = {}
+        self._metrics = defaultdict(lambda: {
+            "enqueued": 0, "succeeded": 0, "retried": 0, "failed": 0,
+            "total_seconds": 0.0, "max_seconds": 0.0, "last_error": None
+        })
+        self._metrics_lock = threading.Lock()
+        self._wakeup = threading.Condition()
+        self._stopping = threading.Event()
+        self._threads = []
+        self._next_recovery = 0.0
+
+    def register(self, name: str, handler: Handler) -> None:
+        """
+        Registra o handler de um tipo de job.
+
+        Args:
+            name: Nome do tipo de job
+            handler: Função que recebe o payload; uma exceção provoca nova tentativa
+        """
+        self._handlers[name] = handler
+
+    def enqueue(self, name: str, payload: Dict, delay: float = 0) -> str:
+        """
+        Grava um job na fila.
+
+        Args:
+            name: Nome do tipo de job (ver ``register``)
+            payload: Dados do job (serializáveis em JSON)
+            delay: Segundos até o job poder ser executado
+
+        Returns:
+            str: ID do job
+        """
+        job = {"id": uuid.uuid4().hex, "name": name, "payload": payload,
+               "attempts": 0, "enqueued_at": time.time()}
+        self._write(self._pending, time.time() + delay, job)
+        self._count(name, "enqueued")
+        with self._wakeup:
+            self._wakeup.notify()
+        return job["id"]
+
+    # =========================================================================
+    # CICLO DE VIDA
+    # =========================================================================
+
+    def start(self) -> None:
+        """Recupera jobs com lease vencido e inicia os workers."""
+        self._recover()
+        self._stopping.clear()
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f'jobs-{index}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def shutdown(self, timeout: float = None) -> None:
+        """Para os workers após o job em andamento de cada um."""
+        self._stopping.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _work(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                if time.time() >= self._next_recovery:
+                    self._recover()
+                path, wait = self._claim()
+                if path is None:
+                    with self._wakeup:
+                        self._wakeup.wait(min(wait, self.poll_interval))
+                    continue
+                self._run(path)
+            except Exception:
+                # Ex: disco cheio. O worker não pode morrer; o job em running/
+                # volta para pending/ quando o lease vencer
+                logger.exception("Erro no worker da fila de jobs")
+                self._stopping.wait(self.poll_interval)
+
+    # =========================================================================
+    # EXECUÇÃO
+    # =========================================================================
+
+    def _claim(self) -> Tuple[Optional[str], float]:
+        """Reivindica o próximo job vencido; senão retorna quanto esperar."""
+        now_ms = int(time.time() * 1000)
+        for filename in sorted(self._listdir(self._pending)):
+            try:
+                run_at_ms = int(filename.split('-', 1)[0])
+            except ValueError:
+                self._reject(os.path.join(self._pending, filename), "nome de arquivo inválido")
+                continue
+            if run_at_ms > now_ms:
+                return None, (run_at_ms - now_ms) / 1000
+            target = os.path.join(self._running, filename)
+            try:
+                os.rename(os.path.join(self._pending, filename), target)
+            except FileNotFoundError:
+                continue            # outro worker reivindicou antes
+            os.utime(target)        # início do lease
+            return target, 0
+        return None, self.poll_interval
+
+    def _recover(self) -> None:
+        """Devolve a pending/ os jobs de running/ cujo lease venceu."""
+        now = time.time()
+        self._next_recovery = now + self.lease / 2
+        for filename in self._listdir(self._running):
+            path = os.path.join(self._running, filename)
+            try:
+                if os.stat(path).st_mtime + self.lease <= now:
+                    os.replace(path, os.path.join(self._pending, filename))
+            except FileNotFoundError:
+                continue            # concluído ou recuperado por outro worker
+
+    def _load(self, path: str) -> Optional[Dict]:
+        """Lê um job; arquivos ilegíveis ou incompletos vão para failed/ e retornam None."""
+        try:
+            with open(path, encoding='utf-8') as f:
+                job = json.load(f)
+            if not isinstance(job, dict) or not isinstance(job.get("name"), str) or "payload" not in job:
+                raise ValueError("job sem name ou payload")
+        except FileNotFoundError:
+            return None             # recuperado por outro worker após o lease
+        except (OSError, ValueError) as e:
+            self._reject(path, f"{type(e).__name__}: {e}")
+            return None
+        job.setdefault("id", os.path.basename(path).split('-', 1)[-1].removesuffix('.json'))
+        if not isinstance(job.get("attempts"), int):
+            job["attempts"] = 0
+        return job
+
+    def _reject(self, path: str, error: str) -> None:
+        logger.error("Arquivo de job inválido %s movido para failed/: %s", path, error)
+        try:
+            os.replace(path, os.path.join(self._failed, os.path.basename(path)))
+        except FileNotFoundError:
+            return
+        self._finish("invalid", "failed", 0.0, error)
+
+    def _run(self, path: str) -> None:
+        job = self._load(path)
+        if job is None:
+            return
+        name = job["name"]
+        started = time.perf_counter()
+        try:
+            handler = self._handlers.get(name)
+            if handler is None:
+                raise LookupError(f"Nenhum handler registrado para '{name}'")
+            handler(job["payload"])
+        except Exception as e:
+            self._retry(path, job, e, time.perf_counter() - started)
+        else:
+            self._discard(path)
+            self._finish(name, "succeeded", time.perf_counter() - started)
+
+    def _retry(self, path: str, job: Dict, error: Exception, elapsed: float) -> None:
+        job["attempts"] += 1
+        job["last_error"] = f"{type(error).__name__}: {error}"
+        if job["attempts"] >= self.max_attempts:
+            logger.error("Job %s (%s) falhou %d vezes: %s", job["id"], job["name"], job["attempts"], error)
+            self._write(self._failed, time.time(), job)
+            outcome = "failed"
+        else:
+            # Backoff exponencial com jitter, para que falhas simultâneas não voltem juntas
+            delay = min(self.backoff_base * 2 ** (job["attempts"] - 1), self.backoff_max)
+            self._write(self._pending, time.time() + delay * random.uniform(0.5, 1.0), job)
+            outcome = "retried"
+        self._discard(path)
+        self._finish(job["name"], outcome, elapsed, job["last_error"])
+
+    # =========================================================================
+    # ARQUIVOS E MÉTRICAS
+    # =========================================================================
+
+    @staticmethod
+    def _listdir(directory: str):
+        # Arquivos temporários começam com '.'
+        return [name for name in os.listdir(directory) if not name.startswith('.')]
+
+    @staticmethod
+    def _discard(path: str) -> None:
+        # Ausente se o lease venceu durante a execução e o job já foi recuperado
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _write(directory: str, run_at: float, job: Dict) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.', suffix='.json')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(job, f, ensure_ascii=False)
+            os.replace(tmp_path, os.path.join(directory, f"{int(run_at * 1000):015d}-{job['id']}.json"))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _count(self, name: str, outcome: str) -> None:
+        with self._metrics_lock:
+            self._metrics[name][outcome] += 1
+
+    def _finish(self, name: str, outcome: str, elapsed: float, error: str = None) -> None:
+        with self._metrics_lock:
+            metrics = self._metrics[name]
+            metrics[outcome] += 1
+            metrics["total_seconds"] += elapsed
+            metrics["max_seconds"] = max(metrics["max_seconds"], elapsed)
+            if error:
+                metrics["last_error"] = error
+
+    def metrics(self) -> Dict:
+        """
+        Retorna o estado da fila e as métricas por tipo de job desde a inicialização.
+
+        Returns:
+            Dict com pending, running e failed (arquivos em cada diretório),
+            workers e jobs ({nome: enqueued, succeeded, retried, failed,
+            avg_seconds, max_seconds, last_error})
+        """
+        with self._metrics_lock:
+            jobs = {}
+            for name, m in self._metrics.items():
+                runs = m["succeeded"] + m["retried"] + m["failed"]
+                jobs[name] = {
+                    **{k: v for k, v in m.items() if k != "total_seconds"},
+                    "avg_seconds": round(m["total_seconds"] / runs, 4) if runs else None,
+                    "max_seconds": round(m["max_seconds"], 4),
+                }
+        return {
+            "pending": len(self._listdir(self._pending)),
+            "running": len(self._listdir(self._running)),
+            "failed": len(self._listdir(self._failed)),
+            "workers": len(self._threads),
+            "jobs": jobs,
+        }
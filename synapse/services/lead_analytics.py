@@ -0,0 +1,165 @@
+"""
+Analytics do funil de leads.
+Agrega os leads em um cubo diário (dia, origem, status) reconstruído só
+quando o repositório muda; os relatórios apenas consolidam o cubo.
+"""
+
+import threading
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+from statistics import median
+from typing import Dict, List, Optional
+from synapse.repositories.implementations.inmemory_lead_repository import InMemoryLeadRepository
+from synapse.services.single_flight import SingleFlight
+
+FUNNEL_STATUSES = ("new", "contacted", "converted", "lost")
+GRANULARITIES = ("day", "week", "month")
+
+
+def _as_date(value) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return None
+
+
+def bucket_of(day: date, granularity: str):
+    """
+    Retorna (chave ordenável, rótulo) do período que contém o dia.
+
+    Rótulos: 'AAAA-MM-DD' (day), 'AAAA-Www' ISO (week) e 'AAAA-MM' (month).
+    """
+    if granularity == "day":
+        return day, day.isoformat()
+    if granularity == "week":
+        monday = day - timedelta(days=day.weekday())
+        year, week, _ = monday.isocalendar()
+        return monday, f"{year}-W{week:02d}"
+    first = day.replace(day=1)
+    return first, first.strftime("%Y-%m")
+
+
+class _LeadCube:
+    """
+    Leads consolidados por dia de criação.
+
+    Attributes:
+        days: Dias com leads, em ordem (para recortar o intervalo com bisect)
+        counts: dia -> Counter {(origem, status): quantidade}
+        conversion_hours: dia -> {origem: [horas até a conversão]}
+    """
+
+    def __init__(self, leads):
+        self.counts = defaultdict(Counter)
+        self.conversion_hours = defaultdict(lambda: defaultdict(list))
+        for lead in leads:
+            day = _as_date(lead.created_at)
+            if day is None:
+                continue
+            self.counts[day][(lead.source, lead.status)] += 1
+            if lead.status == "converted" and isinstance(lead.converted_at, datetime) \
+                    and isinstance(lead.created_at, datetime):
+                hours = (lead.converted_at - lead.created_at).total_seconds() / 3600
+                self.conversion_hours[day][lead.source].append(hours)
+        self.days = sorted(self.counts)
+
+
+class LeadAnalyticsService:
+    """
+    Serviço de analytics do funil de leads.
+
+    O cubo diário é recalculado em uma única passada sobre o repositório
+    quando a versão da coleção muda. Um relatório recorta os dias do
+    intervalo com bisect e soma apenas as células do cubo (origem x status)
+    desses dias, sem percorrer os leads; só as medianas visitam as
+    durações de conversão do intervalo. Relatórios idênticos pedidos ao
+    mesmo tempo compartilham um único cálculo.
+
+    Attributes:
+        lead_repository: Repositório de leads
+    """
+
+    def __init__(self, lead_repository: InMemoryLeadRepository):
+        self.lead_repository = lead_repository
+        self._cube = None
+        self._cube_version = None
+        self._lock = threading.Lock()
+        self._flights = SingleFlight()
+
+    def get_version(self):
+        """Versão dos dados do relatório, usada para ETags."""
+        return self.lead_repository.version
+
+    def _snapshot(self) -> _LeadCube:
+        version = self.lead_repository.version
+        with self._lock:
+            if self._cube is None or self._cube_version != version:
+                self._cube = _LeadCube(self.lead_repository.iter_all())
+                self._cube_version = version
+            return self._cube
+
+    def funnel(self, granularity: str = "week", start: date = None, end: date = None,
+               source: str = None) -> Dict:
+        """
+        Calcula o funil de leads por período e origem.
+
+        Args:
+            granularity: 'day', 'week' ou 'month'
+            start: Primeiro dia de criação considerado (opcional)
+            end: Último dia de criação considerado (opcional)
+            source: Filtrar por origem (opcional)
+
+        Returns:
+            Dict com series (uma linha por período e origem) e by_source
+            (totais do intervalo por origem). Cada linha tem total, contagem
+            por status, conversion_rate (%) e median_hours_to_conversion.
+        """
+        return self._flights.do(
+            (self.lead_repository.version, granularity, start, end, source),
+            lambda: self._funnel(granularity, start, end, source)
+        )
+
+    def _funnel(self, granularity: str, start: Optional[date], end: Optional[date],
+                source: Optional[str]) -> Dict:
+        cube = self._snapshot()
+        first = bisect_left(cube.days, start) if start else 0
+        last = bisect_right(cube.days, end) if end else len(cube.days)
+
+        counts = defaultdict(Counter)
+        hours = defaultdict(list)
+        labels = {}
+        for day in cube.days[first:last]:
+            key, label = bucket_of(day, granularity)
+            labels[key] = label
+            for (lead_source, status), count in cube.counts[day].items():
+                if not source or lead_source == source:
+                    counts[(key, lead_source)][status] += count
+            for lead_source, values in cube.conversion_hours.get(day, {}).items():
+                if not source or lead_source == source:
+                    hours[(key, lead_source)].extend(values)
+
+        series = [self._row(counts[group], hours.get(group), bucket=labels[group[0]], source=group[1])
+                  for group in sorted(counts)]
+
+        source_counts = defaultdict(Counter)
+        source_hours = defaultdict(list)
+        for (_, lead_source), counter in counts.items():
+            source_counts[lead_source].update(counter)
+        for (_, lead_source), values in hours.items():
+            source_hours[lead_source].extend(values)
+        by_source = [self._row(source_counts[s], source_hours.get(s), source=s) for s in sorted(source_counts)]
+
+        return {"granularity": granularity, "series": series, "by_source": by_source}
+
+    @staticmethod
+    def _row(counter: Counter, conversion_hours: Optional[List[float]], **labels) -> Dict:
+        total = sum(counter.values())
+        row = dict(labels)
+        row["total"] = total
+        for status in FUNNEL_STATUSES:
+            row[status] = counter.get(status, 0)
+        row["conversion_rate"] = round(row["converted"] / total * 100, 1) if total else 0.0
+        row["median_hours_to_conversion"] = round(median(conversion_hours), 1) if conversion_hours else None
+        return row
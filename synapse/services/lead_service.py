@@ -5,6 +5,9 @@ Contém a lógica de negócio para operações CRUD de leads.
 
 from synapse.repositories.implementations.inmemory_lead_repository import InMemoryLeadRepository
 from synapse.business_model.lead import Lead
+from synapse.services.events import (
+    EventBus, LeadCreated, LeadUpdated, LeadContacted, LeadLost, LeadConverted, LeadDeleted
+)
 from synapse.api.exceptions import NotFoundError, ValidationError, BusinessRuleError
 from datetime import datetime
 
@@ -15,15 +18,30 @@ class LeadService:
     
     Attributes:
         lead_repository: Repositório para persistência de leads
+        events: Barramento onde as escritas são publicadas (opcional)
     """
     
-    def __init__(self, lead_repository: InMemoryLeadRepository):
+    def __init__(self, lead_repository: InMemoryLeadRepository, events: EventBus = None):
         self.lead_repository = lead_repository
+        self.events = events
+
+    def _publish(self, event_type, lead: Lead, before: str = None, **fields) -> None:
+        if self.events:
+            after = lead.status if event_type is not LeadDeleted else None
+            self.events.publish(event_type(lead_id=lead.id, before=before, after=after, **fields))
 
     def get_all(self):
         """Retorna todos os leads cadastrados."""
         return self.lead_repository.all()
 
+    def iter_all(self):
+        """Percorre os leads sob demanda, sem montar uma lista."""
+        return self.lead_repository.iter_all()
+
+    def get_version(self):
+        """Versão da coleção, usada para ETags e GETs condicionais."""
+        return self.lead_repository.version
+
     def get_by_id(self, lead_id: int):
         """
         Busca um lead pelo ID.
@@ -59,6 +77,7 @@ class LeadService:
         """
         lead = Lead(name=name, email=email, phone=phone, source=source, notes=notes)
         self.lead_repository.add(lead)
+        self._publish(LeadCreated, lead)
         return lead
 
     def update_lead(self, lead_id: int, name: str = None, email: str = None,
@@ -88,6 +107,7 @@ class LeadService:
             lead.notes = notes
             
         self.lead_repository.update(lead)
+        self._publish(LeadUpdated, lead, lead.status)
         return lead
 
     def delete_lead(self, lead_id: int) -> None:
@@ -100,8 +120,9 @@ class LeadService:
         Raises:
             NotFoundError: Se o lead não for encontrado
         """
-        self.get_by_id(lead_id)
+        lead = self.get_by_id(lead_id)
         self.lead_repository.delete(lead_id)
+        self._publish(LeadDeleted, lead, lead.status)
 
     def mark_contacted(self, lead_id: int, notes: str = None) -> Lead:
         """
@@ -115,8 +136,10 @@ class LeadService:
             Lead: Lead atualizado
         """
         lead = self.get_by_id(lead_id)
+        before = lead.status
         lead.mark_as_contacted(notes)
         self.lead_repository.update(lead)
+        self._publish(LeadContacted, lead, before)
         return lead
 
     def mark_lost(self, lead_id: int, reason: str = None) -> Lead:
@@ -131,8 +154,10 @@ class LeadService:
             Lead: Lead atualizado
         """
         lead = self.get_by_id(lead_id)
+        before = lead.status
         lead.mark_as_lost(reason)
         self.lead_repository.update(lead)
+        self._publish(LeadLost, lead, before)
         return lead
 
     def convert_to_patient(self, lead_id: int, patient_id: int) -> Lead:
@@ -154,6 +179,8 @@ class LeadService:
         if lead.status == 'converted':
             raise BusinessRuleError("Lead já foi convertido anteriormente")
         
+        before = lead.status
         lead.convert_to_patient(patient_id)
         self.lead_repository.update(lead)
+        self._publish(LeadConverted, lead, before, patient_id=patient_id)
         return lead
@@ -0,0 +1,221 @@
+"""
+Atualizações ao vivo (Server-Sent Events) de horários e agendas.
+Cada escrita de consulta vira mensagens pequenas entregues apenas às conexões
+interessadas, em vez de as páginas consultarem os endpoints completos de novo.
+"""
+
+import itertools
+import json
+import threading
+from collections import deque
+from typing import Dict, Hashable, Iterable, Iterator, Optional, Set
+from synapse.business_model.appointment import AppointmentState
+from synapse.services.events import (
+    EventBus, AppointmentEvent, AppointmentScheduled, AppointmentCancelled, AppointmentCompleted,
+    AppointmentDeleted, SlotHoldEvent, SlotHeld
+)
+
+# Mensagem SSE de comentário: mantém a conexão viva e detecta clientes que saíram
+KEEPALIVE = b": keepalive\n\n"
+# Enviada ao cliente que perdeu mensagens por estar lento: deve recarregar o estado completo
+RESET = b"event: reset\ndata: {}\n\n"
+
+CHANGE_TYPES = {
+    AppointmentScheduled: "scheduled",
+    AppointmentCancelled: "cancelled",
+    AppointmentCompleted: "completed",
+    AppointmentDeleted: "deleted",
+}
+
+
+def slots_topic(psychologist_id: int, day) -> tuple:
+    return ("slots", psychologist_id, day.isoformat())
+
+
+def agenda_topic(psychologist_id: int) -> tuple:
+    return ("agenda", psychologist_id)
+
+
+CLINIC_TOPIC = ("clinic",)
+
+
+def _takes_slot(state: Optional[AppointmentState]) -> bool:
+    # Mesmo critério de get_available_slots: só consultas canceladas liberam o horário
+    return state is not None and state.status != 'cancelled'
+
+
+def _slot_of(state: AppointmentState) -> tuple:
+    return state.psychologist_id, state.date, state.time
+
+
+def _state_dict(state: Optional[AppointmentState]) -> Optional[Dict]:
+    if state is None:
+        return None
+    return {
+        "id": state.id,
+        "patient_id": state.patient_id,
+        "psychologist_id": state.psychologist_id,
+        "date": state.date.isoformat(),
+        "time": state.time.strftime('%H:%M'),
+        "duration": state.duration,
+        "status": state.status,
+    }
+
+
+class Subscription:
+    """
+    Fila limitada de mensagens de uma conexão.
+
+    Se o cliente não consome as mensagens e a fila enche, as pendentes são
+    descartadas e a próxima leitura devolve um ``reset``: o cliente recarrega
+    o estado pelo endpoint completo, e a memória por conexão fica limitada.
+    """
+
+    def __init__(self, topics: Iterable[Hashable], max_queue: int):
+        self.topics = tuple(topics)
+        self.max_queue = max_queue
+        self._queue = deque()
+        self._lagged = False
+        self._ready = threading.Condition(threading.Lock())
+
+    def put(self, message: bytes) -> None:
+        with self._ready:
+            if len(self._queue) >= self.max_queue:
+                self._queue.clear()
+                self._lagged = True
+            else:
+                self._queue.append(message)
+            self._ready.notify()
+
+    def get(self, timeout: float) -> Optional[bytes]:
+        """
+        Próxima mensagem, aguardando até ``timeout`` segundos.
+
+        Returns:
+            bytes: Mensagem SSE ou None se nada chegou no prazo
+        """
+        with self._ready:
+            if not self._queue and not self._lagged:
+                self._ready.wait(timeout)
+            if self._lagged:
+                self._lagged = False
+                return RESET
+            return self._queue.popleft() if self._queue else None
+
+
+class LiveUpdates:
+    """
+    Distribui mudanças de consultas às conexões SSE abertas.
+
+    Tópicos:
+    - ``slots_topic(psicólogo, data)``: ``slot_taken`` / ``slot_freed`` com o
+      horário ocupado ou liberado por consultas e por reservas temporárias,
+      inclusive as que expiram (página de agendamento);
+    - ``agenda_topic(psicólogo)`` e ``CLINIC_TOPIC``: ``appointment`` com o
+      tipo da mudança e os estados antes/depois (dashboards).
+
+    As conexões ficam indexadas por tópico, então uma escrita só toca as
+    conexões daquele psicólogo/data e as conexões ociosas não custam nada.
+    Cada mensagem é serializada uma única vez e os mesmos bytes são
+    enfileirados para todos os inscritos do tópico. A publicação nunca
+    bloqueia: a fila de cada conexão é limitada (ver Subscription).
+
+    Attributes:
+        max_queue: Mensagens pendentes por conexão antes de um reset
+        keepalive: Intervalo (s) entre comentários de keepalive
+    """
+
+    def __init__(self, max_queue: int = 100, keepalive: float = 15.0):
+        self.max_queue = max_queue
+        self.keepalive = keepalive
+        self._topics: Dict[Hashable, Set[Subscription]] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def subscribe(self, events: EventBus) -> None:
+        """Gera as mensagens a partir dos eventos de consulta e de reserva (inscrito síncrono)."""
+        events.subscribe(AppointmentEvent, self._on_appointment)
+        events.subscribe(SlotHoldEvent, self._on_hold)
+
+    def _on_appointment(self, event: AppointmentEvent) -> None:
+        before, after = event.before, event.after
+        moved = before is not None and after is not None and _slot_of(before) != _slot_of(after)
+        if _takes_slot(before) and (moved or not _takes_slot(after)):
+            self._slot_change("slot_freed", before)
+        if _takes_slot(after) and (moved or not _takes_slot(before)):
+            self._slot_change("slot_taken", after)
+
+        change = {
+            "type": CHANGE_TYPES.get(type(event), "updated"),
+            "appointment_id": event.appointment_id,
+            "before": _state_dict(before),
+            "after": _state_dict(after),
+        }
+        psychologists = {s.psychologist_id for s in (before, after) if s is not None}
+        self.publish([agenda_topic(pid) for pid in psychologists] + [CLINIC_TOPIC], "appointment", change)
+
+    def _on_hold(self, event: SlotHoldEvent) -> None:
+        if isinstance(event, SlotHeld):
+            self._slot_change("slot_taken", event)
+        elif event.reason != "booked":
+            # Reserva que virou consulta: o horário continua ocupado (ver AppointmentScheduled)
+            self._slot_change("slot_freed", event)
+
+    def _slot_change(self, name: str, state) -> None:
+        self.publish([slots_topic(state.psychologist_id, state.date)], name, {
+            "psychologist_id": state.psychologist_id,
+            "date": state.date.isoformat(),
+            "time": state.time.strftime('%H:%M'),
+            "duration": state.duration,
+        })
+
+    def publish(self, topics: Iterable[Hashable], name: str, data: Dict) -> None:
+        """Enfileira uma mensagem para os inscritos dos tópicos."""
+        with self._lock:
+            subscribers = set()
+            for topic in topics:
+                subscribers |= self._topics.get(topic, set())
+        if not subscribers:
+            return
+        message = (f"id: {next(self._ids)}\nevent: {name}\n"
+                   f"data: {json.dumps(data, separators=(',', ':'))}\n\n").encode("utf-8")
+        for subscription in subscribers:
+            subscription.put(message)
+
+    def open(self, topics: Iterable[Hashable]) -> Subscription:
+        """Registra uma conexão nos tópicos."""
+        subscription = Subscription(topics, self.max_queue)
+        with self._lock:
+            for topic in subscription.topics:
+                self._topics.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def close(self, subscription: Subscription) -> None:
+        """Remove uma conexão dos tópicos."""
+        with self._lock:
+            for topic in subscription.topics:
+                subscribers = self._topics.get(topic)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._topics[topic]
+
+    def stream(self, topics: Iterable[Hashable]) -> Iterator[bytes]:
+        """
+        Gera o corpo de uma resposta SSE para os tópicos.
+
+        A conexão é registrada quando o primeiro byte é enviado e removida
+        quando o cliente desconecta (o servidor fecha o gerador).
+        """
+        subscription = self.open(topics)
+        try:
+            yield b"retry: 3000\n\n"
+            while True:
+                yield subscription.get(self.keepalive) or KEEPALIVE
+        finally:
+            self.close(subscription)
+
+    def connections(self) -> int:
+        """Conexões abertas."""
+        with self._lock:
+            return len({s for subscribers in self._topics.values() for s in subscribers})
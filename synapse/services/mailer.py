@@ -0,0 +1,63 @@
+"""
+Envio de emails.
+FileMailer grava cada mensagem como arquivo .eml em vez de falar SMTP,
+substituindo o servidor de email em desenvolvimento.
+"""
+
+import os
+import tempfile
+import time
+import uuid
+from email.message import EmailMessage
+from email.utils import formatdate, make_msgid
+
+DEFAULT_SENDER = "Synapse <no-reply@synapse.local>"
+
+
+class FileMailer:
+    """
+    Mailer que grava as mensagens em um diretório (uma mensagem por arquivo .eml).
+
+    Os arquivos podem ser abertos em qualquer cliente de email. A gravação é
+    atômica: um arquivo visível está sempre completo.
+
+    Attributes:
+        directory: Diretório das mensagens
+        sender: Remetente padrão
+    """
+
+    def __init__(self, directory: str, sender: str = DEFAULT_SENDER):
+        self.directory = directory
+        self.sender = sender
+        os.makedirs(directory, exist_ok=True)
+
+    def send(self, to: str, subject: str, body: str) -> str:
+        """
+        Envia (grava) uma mensagem de texto.
+
+        Args:
+            to: Destinatário
+            subject: Assunto
+            body: Corpo em texto puro
+
+        Returns:
+            str: Caminho do arquivo gravado
+        """
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = to
+        message["Subject"] = subject
+        message["Date"] = formatdate(localtime=True)
+        message["Message-ID"] = make_msgid(domain="synapse.local")
+        message.set_content(body)
+
+        path = os.path.join(self.directory, f"{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}.eml")
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.', suffix='.eml')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(message.as_bytes())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return path
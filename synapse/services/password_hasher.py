@@ -0,0 +1,99 @@
+"""
+Hash e verificação de senhas com bcrypt em um pool dedicado.
+Isola o custo de CPU da autenticação das threads que atendem o restante da API.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Optional
+import bcrypt
+from synapse.api.exceptions import ServiceUnavailableError
+
+DEFAULT_ROUNDS = 12
+
+
+def hash_rounds(password_hash: str) -> Optional[int]:
+    """
+    Extrai o fator de custo de um hash bcrypt ('$2b$12$...').
+
+    Returns:
+        Custo do hash ou None se o valor não for um hash bcrypt
+    """
+    parts = password_hash.split("$") if password_hash else []
+    if len(parts) != 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+class PasswordHasher:
+    """
+    Executa bcrypt em um pool de threads limitado.
+
+    O bcrypt libera o GIL durante o cálculo, então as threads do pool rodam
+    em paralelo de verdade; o tamanho do pool define quantos núcleos a
+    autenticação pode ocupar. Além das tarefas em execução, no máximo
+    ``max_queue`` aguardam na fila; acima disso a chamada falha na hora com
+    ServiceUnavailableError em vez de segurar a thread da requisição.
+
+    Attributes:
+        rounds: Fator de custo usado em novos hashes
+        timeout: Tempo máximo (s) de espera por um resultado
+    """
+
+    def __init__(self, rounds: int = DEFAULT_ROUNDS, max_workers: int = 2,
+                 max_queue: int = 16, timeout: float = 5.0):
+        if not 4 <= rounds <= 31:
+            raise ValueError("Custo do bcrypt deve estar entre 4 e 31")
+        self.rounds = rounds
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='bcrypt')
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise ServiceUnavailableError("Muitas autenticações em andamento. Tente novamente em instantes.")
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # O slot só volta quando a tarefa termina, mesmo que quem esperava tenha desistido
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise ServiceUnavailableError("Tempo de autenticação esgotado. Tente novamente em instantes.")
+
+    def hash(self, password: str) -> str:
+        """
+        Gera o hash de uma senha com o custo configurado.
+
+        Raises:
+            ServiceUnavailableError: Se o pool estiver saturado
+        """
+        return self._run(self._hash, password.encode("utf-8"), self.rounds)
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        """
+        Verifica uma senha contra um hash bcrypt.
+
+        Hashes inválidos (ex: placeholder de usuário sem senha) retornam False.
+
+        Raises:
+            ServiceUnavailableError: Se o pool estiver saturado
+        """
+        if hash_rounds(password_hash) is None:
+            return False
+        return self._run(bcrypt.checkpw, password.encode("utf-8"), password_hash.encode("utf-8"))
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """Indica se o hash foi gerado com um custo diferente do configurado."""
+        return hash_rounds(password_hash) != self.rounds
+
+    def shutdown(self) -> None:
+        """Encerra o pool, aguardando as tarefas em andamento."""
+        self._executor.shutdown(wait=True)
+
+    @staticmethod
+    def _hash(password: bytes, rounds: int) -> str:
+        return bcrypt.hashpw(password, bcrypt.gensalt(rounds)).decode()
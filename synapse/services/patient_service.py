@@ -5,6 +5,7 @@ Contém a lógica de negócio para operações CRUD de pacientes.
 
 from synapse.repositories.implementations.inmemory_patient_repository import InMemoryPatientRepository
 from synapse.business_model.patient import Patient
+from synapse.services.events import EventBus, PatientCreated, PatientUpdated, PatientDeleted
 from synapse.api.exceptions import NotFoundError, ValidationError
 
 
@@ -14,15 +15,25 @@ class PatientService:
     
     Attributes:
         patient_repository: Repositório para persistência de pacientes
+        events: Barramento onde as escritas são publicadas (opcional)
     """
     
-    def __init__(self, patient_repository: InMemoryPatientRepository):
+    def __init__(self, patient_repository: InMemoryPatientRepository, events: EventBus = None):
         self.patient_repository = patient_repository
+        self.events = events
+
+    def _publish(self, event_type, patient: Patient) -> None:
+        if self.events:
+            self.events.publish(event_type(patient_id=patient.id))
 
     def get_all(self):
         """Retorna todos os pacientes cadastrados."""
         return self.patient_repository.all()
 
+    def get_version(self):
+        """Versão da coleção, usada para ETags e GETs condicionais."""
+        return self.patient_repository.version
+
     def get_by_id(self, patient_id: int):
         """
         Busca um paciente pelo ID.
@@ -65,6 +76,7 @@ class PatientService:
             raise ValidationError("Telefone deve ter pelo menos 8 caracteres", "phone")
             
         self.patient_repository.add(patient)
+        self._publish(PatientCreated, patient)
         return patient
 
     def update_patient(self, patient_id: int, name: str = None, email: str = None, 
@@ -102,6 +114,7 @@ class PatientService:
             patient.cpf = cpf
             
         self.patient_repository.update(patient)
+        self._publish(PatientUpdated, patient)
         return patient
 
     def delete_patient(self, patient_id: int) -> None:
@@ -116,3 +129,4 @@ class PatientService:
         """
         patient = self.get_by_id(patient_id)
         self.patient_repository.delete(patient_id)
+        self._publish(PatientDeleted, patient)
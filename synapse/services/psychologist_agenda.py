@@ -0,0 +1,114 @@
+"""
+Agregados por psicólogo para o dashboard.
+Mantidos incrementalmente a cada evento de consulta, sem varrer o repositório.
+"""
+
+import threading
+from bisect import bisect_left, insort
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+from synapse.business_model.appointment import AppointmentState
+from synapse.services.events import EventBus, AppointmentEvent
+
+# Status que ainda vão acontecer
+UPCOMING_STATUSES = ('scheduled', 'confirmed')
+
+
+class _Agenda:
+    __slots__ = ('by_date', 'patients', 'upcoming', 'version')
+
+    def __init__(self):
+        self.by_date = Counter()        # data -> consultas não canceladas
+        self.patients = Counter()       # paciente -> consultas não canceladas
+        self.upcoming = []              # [(datetime, id)] ordenada, só scheduled/confirmed
+        self.version = 0
+
+
+class PsychologistAgendas:
+    """
+    Agenda agregada de cada psicólogo.
+
+    Para cada psicólogo guarda consultas por data, pacientes distintos e uma
+    lista ordenada (bisect) das próximas sessões. Cada evento de consulta traz
+    a transição como (antes, depois), com None para "não existia" ou "foi
+    removida"; o custo é O(log n) na agenda daquele psicólogo.
+    """
+
+    def __init__(self):
+        self._agendas: Dict[int, _Agenda] = {}
+        self._lock = threading.Lock()
+
+    def rebuild(self, appointments: Iterable) -> None:
+        """Recalcula todas as agendas a partir das consultas (usado na inicialização)."""
+        with self._lock:
+            self._agendas = {}
+            for appointment in appointments:
+                self._apply(appointment.snapshot(), +1)
+
+    def subscribe(self, events: EventBus) -> None:
+        """Inscreve as agendas (síncronas) nos eventos de consultas."""
+        events.subscribe(AppointmentEvent, lambda e: self.track(e.before, e.after))
+
+    def track(self, before: Optional[AppointmentState], after: Optional[AppointmentState]) -> None:
+        """Registra a transição de uma consulta."""
+        if before == after:
+            return
+        with self._lock:
+            if before is not None:
+                self._apply(before, -1)
+            if after is not None:
+                self._apply(after, +1)
+
+    def _apply(self, state: AppointmentState, sign: int) -> None:
+        agenda = self._agendas.get(state.psychologist_id)
+        if agenda is None:
+            agenda = self._agendas[state.psychologist_id] = _Agenda()
+        agenda.version += 1
+
+        if state.status != 'cancelled':
+            agenda.by_date[state.date] += sign
+            agenda.patients[state.patient_id] += sign
+            if agenda.patients[state.patient_id] <= 0:
+                del agenda.patients[state.patient_id]
+
+        if state.status in UPCOMING_STATUSES:
+            entry = (datetime.combine(state.date, state.time), state.id)
+            if sign > 0:
+                insort(agenda.upcoming, entry)
+            else:
+                index = bisect_left(agenda.upcoming, entry)
+                if index < len(agenda.upcoming) and agenda.upcoming[index] == entry:
+                    del agenda.upcoming[index]
+
+    def version(self, psychologist_id: int) -> int:
+        """Versão da agenda de um psicólogo, usada para ETags."""
+        agenda = self._agendas.get(psychologist_id)
+        return agenda.version if agenda else 0
+
+    def summary(self, psychologist_id: int, limit: int = 5, now: datetime = None) -> Dict:
+        """
+        Resume a agenda de um psicólogo.
+
+        Args:
+            psychologist_id: ID do psicólogo
+            limit: Quantidade de próximas sessões
+            now: Instante de referência (default: agora)
+
+        Returns:
+            Dict com today, week (semana ISO corrente), unique_patients e
+            upcoming_ids (IDs das próximas sessões em ordem cronológica)
+        """
+        now = now or datetime.now()
+        today = now.date()
+        monday = today - timedelta(days=today.weekday())
+        with self._lock:
+            agenda = self._agendas.get(psychologist_id) or _Agenda()
+            start = bisect_left(agenda.upcoming, (now, -1))
+            upcoming: List[int] = [appointment_id for _, appointment_id in agenda.upcoming[start:start + limit]]
+            return {
+                "today": agenda.by_date.get(today, 0),
+                "week": sum(agenda.by_date.get(monday + timedelta(days=i), 0) for i in range(7)),
+                "unique_patients": len(agenda.patients),
+                "upcoming_ids": upcoming
+            }
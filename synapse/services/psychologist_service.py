@@ -6,6 +6,7 @@ Contém a lógica de negócio para operações CRUD de psicólogos.
 from typing import List, Optional
 from synapse.repositories.implementations.inmemory_psychologist_repository import InMemoryPsychologistRepository
 from synapse.business_model.psychologist import Psychologist
+from synapse.services.events import EventBus, PsychologistCreated, PsychologistUpdated, PsychologistDeleted
 from synapse.api.exceptions import NotFoundError, ValidationError
 
 
@@ -15,10 +16,18 @@ class PsychologistService:
     
     Attributes:
         psychologist_repository: Repositório para persistência de psicólogos
+        events: Barramento onde as escritas são publicadas (opcional)
     """
     
-    def __init__(self, psychologist_repository: InMemoryPsychologistRepository):
+    def __init__(self, psychologist_repository: InMemoryPsychologistRepository, events: EventBus = None):
         self.psychologist_repository = psychologist_repository
+        self.events = events
+
+    def _publish(self, event_type, psychologist: Psychologist, was_active: Optional[bool] = None) -> None:
+        if self.events:
+            is_active = psychologist.is_active if event_type is not PsychologistDeleted else None
+            self.events.publish(event_type(psychologist_id=psychologist.id, was_active=was_active,
+                                           is_active=is_active))
 
     def get_all(self, active_only: bool = False):
         """
@@ -32,6 +41,10 @@ class PsychologistService:
             return [p for p in psychologists if p.is_active]
         return psychologists
 
+    def get_version(self):
+        """Versão da coleção, usada para ETags e GETs condicionais."""
+        return self.psychologist_repository.version
+
     def get_by_id(self, psychologist_id: int):
         """
         Busca um psicólogo pelo ID.
@@ -50,6 +63,24 @@ class PsychologistService:
             raise NotFoundError("Psicólogo", psychologist_id)
         return psychologist
 
+    def get_by_user_id(self, user_id: int):
+        """
+        Busca o psicólogo vinculado a um usuário.
+        
+        Args:
+            user_id: ID do usuário
+            
+        Returns:
+            Psychologist: Psicólogo encontrado
+            
+        Raises:
+            NotFoundError: Se nenhum psicólogo estiver vinculado ao usuário
+        """
+        psychologist = self.psychologist_repository.by_user(user_id)
+        if not psychologist:
+            raise NotFoundError("Psicólogo")
+        return psychologist
+
     def create_psychologist(self, user_id: int, name: str, crp: str, specialty: str,
                             hourly_rate: float, themes: List[str] = None, 
                             bio: str = "") -> Psychologist:
@@ -87,6 +118,7 @@ class PsychologistService:
             raise ValidationError("Valor hora deve ser positivo", "hourly_rate")
             
         self.psychologist_repository.add(psychologist)
+        self._publish(PsychologistCreated, psychologist)
         return psychologist
 
     def update_psychologist(self, psychologist_id: int, name: str = None,
@@ -113,6 +145,7 @@ class PsychologistService:
             ValidationError: Se os dados forem inválidos
         """
         psychologist = self.get_by_id(psychologist_id)
+        was_active = psychologist.is_active
         
         if name is not None:
             psychologist.name = name
@@ -133,6 +166,7 @@ class PsychologistService:
                 psychologist.deactivate()
                 
         self.psychologist_repository.update(psychologist)
+        self._publish(PsychologistUpdated, psychologist, was_active)
         return psychologist
 
     def delete_psychologist(self, psychologist_id: int) -> None:
@@ -145,19 +179,24 @@ class PsychologistService:
         Raises:
             NotFoundError: Se o psicólogo não for encontrado
         """
-        self.get_by_id(psychologist_id)
+        psychologist = self.get_by_id(psychologist_id)
         self.psychologist_repository.delete(psychologist_id)
+        self._publish(PsychologistDeleted, psychologist, psychologist.is_active)
 
     def activate(self, psychologist_id: int) -> Psychologist:
         """Ativa um psicólogo."""
         psychologist = self.get_by_id(psychologist_id)
+        was_active = psychologist.is_active
         psychologist.activate()
         self.psychologist_repository.update(psychologist)
+        self._publish(PsychologistUpdated, psychologist, was_active)
         return psychologist
 
     def deactivate(self, psychologist_id: int) -> Psychologist:
         """Desativa um psicólogo."""
         psychologist = self.get_by_id(psychologist_id)
+        was_active = psychologist.is_active
         psychologist.deactivate()
         self.psychologist_repository.update(psychologist)
+        self._publish(PsychologistUpdated, psychologist, was_active)
         return psychologist
@@ -12,8 +12,8 @@ SEEDS_FILE = os.path.join(os.path.dirname(__file__), '..', 'seeds.json')
 
 class SeedLoader:
     @staticmethod
-    def load():
-        with open(SEEDS_FILE, encoding='utf-8') as f:
+    def load(path: str = None):
+        with open(path or SEEDS_FILE, encoding='utf-8') as f:
             data = json.load(f)
         patients = [Patient.from_dict(d) for d in data.get("patients", [])]
         psychologists = [Psychologist.from_dict(d) for d in data.get("psychologists", [])]
@@ -0,0 +1,90 @@
+"""
+Migração única das senhas em texto puro do arquivo de seeds.
+
+Usuários com "password" e sem "password_hash" recebem o hash bcrypt
+calculado em paralelo (o bcrypt libera o GIL) e perdem o texto puro.
+Usuários que já têm hash não são tocados, então rodar de novo é seguro.
+
+Uso (a partir da raiz do projeto):
+    python -m synapse.services.seed_migration [--input synapse/seeds.json]
+        [--output novo.json] [--rounds 12] [--workers 4]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+import bcrypt
+from synapse.services.seed_loader import SEEDS_FILE
+from synapse.services.password_hasher import DEFAULT_ROUNDS
+
+
+def _hash(password: str, rounds: int) -> str:
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode()
+
+
+def hash_seed_users(users: List[Dict], rounds: int = DEFAULT_ROUNDS, workers: int = None) -> int:
+    """
+    Substitui, in-place, a senha em texto puro de cada usuário pelo hash bcrypt.
+
+    Args:
+        users: Lista de usuários (dicts) do arquivo de seeds
+        rounds: Custo do bcrypt
+        workers: Threads de hash (default: número de CPUs)
+
+    Returns:
+        int: Quantidade de usuários migrados
+    """
+    pending = [u for u in users if u.get("password") and not u.get("password_hash")]
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        hashes = executor.map(_hash, [u["password"] for u in pending], [rounds] * len(pending))
+        for user, password_hash in zip(pending, hashes):
+            user["password_hash"] = password_hash
+            del user["password"]
+    return len(pending)
+
+
+def migrate(input_path: str, output_path: str, rounds: int = DEFAULT_ROUNDS, workers: int = None) -> int:
+    """
+    Lê o arquivo de seeds, migra as senhas e grava o resultado.
+
+    A escrita é atômica (arquivo temporário + rename), então o arquivo de
+    entrada pode ser o mesmo de saída.
+
+    Returns:
+        int: Quantidade de usuários migrados
+    """
+    with open(input_path, encoding='utf-8') as f:
+        data = json.load(f)
+
+    migrated = hash_seed_users(data.get("users", []), rounds, workers)
+
+    directory = os.path.dirname(os.path.abspath(output_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.json')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return migrated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", default=SEEDS_FILE, help="arquivo de seeds de entrada")
+    parser.add_argument("--output", help="arquivo de saída (default: sobrescreve a entrada)")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help="custo do bcrypt")
+    parser.add_argument("--workers", type=int, default=None, help="threads de hash (default: CPUs)")
+    args = parser.parse_args()
+
+    migrated = migrate(args.input, args.output or args.input, args.rounds, args.workers)
+    print(f"{migrated} usuário(s) migrado(s) para bcrypt (custo {args.rounds})")
+
+
+if __name__ == "__main__":
+    main()
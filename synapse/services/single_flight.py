@@ -0,0 +1,76 @@
+"""
+Agrupamento de leituras concorrentes idênticas (single-flight).
+Enquanto um cálculo está em andamento, chamadas com a mesma chave esperam
+por ele em vez de repeti-lo.
+"""
+
+import threading
+from typing import Callable, Dict, Hashable, TypeVar
+
+T = TypeVar('T')
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Executa no máximo um cálculo por chave de cada vez.
+
+    A primeira chamada de uma chave executa a função; as que chegam enquanto
+    ela roda esperam e recebem o mesmo resultado (ou a mesma exceção). Nada é
+    guardado depois: a próxima chamada após o término calcula de novo, então
+    o resultado nunca é mais antigo que o início do cálculo em andamento.
+
+    O resultado é compartilhado entre as chamadas e não deve ser alterado por
+    quem o recebe. Chaves devem incluir a versão dos dados lidos, para que uma
+    chamada feita após uma escrita não receba um cálculo iniciado antes dela.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        Executa ``fn`` ou aguarda a execução em andamento com a mesma chave.
+
+        Args:
+            key: Identifica o cálculo (argumentos e versão dos dados)
+            fn: Função sem argumentos que faz o cálculo
+
+        Returns:
+            Resultado de ``fn``
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            owner = call is None
+            if owner:
+                call = self._calls[key] = _Call()
+
+        if not owner:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def __len__(self) -> int:
+        """Cálculos em andamento."""
+        return len(self._calls)
@@ -0,0 +1,229 @@
+"""
+Reservas temporárias de horários durante o agendamento.
+Um paciente segura o horário enquanto preenche os dados; a reserva expira sozinha.
+"""
+
+import heapq
+import secrets
+import threading
+from datetime import date, datetime, time as dtime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+from synapse.services.events import EventBus, SlotHeld, SlotHoldReleased
+
+DEFAULT_HOLD_TTL = 300
+
+
+class SlotHold(NamedTuple):
+    """Reserva de um horário (psicólogo, data, hora) por um paciente."""
+    id: str
+    patient_id: int
+    psychologist_id: int
+    date: date
+    time: dtime
+    duration: int
+    expires_at: datetime
+
+    def to_dict(self) -> Dict:
+        return {
+            "hold_id": self.id,
+            "patient_id": self.patient_id,
+            "psychologist_id": self.psychologist_id,
+            "date": self.date.isoformat(),
+            "time": self.time.strftime('%H:%M'),
+            "duration": self.duration,
+            "expires_at": self.expires_at.isoformat(timespec='seconds'),
+        }
+
+
+class SlotHolds:
+    """
+    Registro em memória das reservas ativas.
+
+    As reservas ficam indexadas por ID, por dia de agenda (psicólogo, data)
+    e por paciente. Um heap de (expiração, id) permite descartar as vencidas
+    retirando só o topo, a cada operação, sem varrer o registro. Reservas
+    liberadas antes do prazo continuam no heap e são ignoradas quando
+    vencem (remoção preguiçosa).
+
+    Cada paciente mantém no máximo uma reserva: reservar outro horário
+    libera o anterior.
+
+    O registro não valida disponibilidade nem conflitos com consultas; isso
+    é feito pelo AppointmentService, que serializa verificação e gravação.
+
+    Com ``events``, cada reserva criada publica SlotHeld e cada reserva
+    encerrada publica SlotHoldReleased, fora do lock. Para que expirações
+    sejam publicadas no prazo, e não só na próxima operação, ``start``
+    inicia uma thread que dorme até o vencimento mais próximo.
+
+    Attributes:
+        ttl: Duração (s) de cada reserva
+        events: Barramento onde as reservas são publicadas (opcional)
+    """
+
+    def __init__(self, ttl: int = DEFAULT_HOLD_TTL, events: EventBus = None):
+        self.ttl = ttl
+        self.events = events
+        self._holds: Dict[str, SlotHold] = {}
+        self._by_day: Dict[Tuple[int, date], Dict[dtime, str]] = {}
+        self._by_patient: Dict[int, str] = {}
+        self._expiry: List[Tuple[datetime, str]] = []
+        self._version = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def version(self) -> int:
+        """Incrementada a cada reserva criada, liberada ou expirada."""
+        return self._version
+
+    def start(self) -> None:
+        """Inicia a thread que expira as reservas no prazo."""
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name='slot-holds', daemon=True)
+        self._thread.start()
+
+    def shutdown(self, timeout: float = None) -> None:
+        """Para a thread de expiração."""
+        self._stopping.set()
+        with self._wakeup:
+            self._wakeup.notify()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            with self._wakeup:
+                now = datetime.now()
+                expired = self._expire(now)
+                if not expired:
+                    # O topo pode ser de uma reserva já liberada: acorda à toa, sem efeito
+                    timeout = (self._expiry[0][0] - now).total_seconds() if self._expiry else None
+                    self._wakeup.wait(timeout)
+            self._released(expired, "expired")
+
+    def _expire(self, now: datetime) -> List[SlotHold]:
+        expired = []
+        while self._expiry and self._expiry[0][0] <= now:
+            _, hold_id = heapq.heappop(self._expiry)
+            hold = self._holds.get(hold_id)
+            if hold is not None and hold.expires_at <= now:
+                self._remove(hold)
+                expired.append(hold)
+        return expired
+
+    def _released(self, holds: List[SlotHold], reason: str) -> None:
+        if self.events and holds:
+            self.events.publish_all(SlotHoldReleased(
+                hold_id=h.id, patient_id=h.patient_id, psychologist_id=h.psychologist_id,
+                date=h.date, time=h.time, duration=h.duration, reason=reason) for h in holds)
+
+    def _remove(self, hold: SlotHold) -> None:
+        del self._holds[hold.id]
+        self._version += 1
+        day = self._by_day.get((hold.psychologist_id, hold.date))
+        if day is not None:
+            day.pop(hold.time, None)
+            if not day:
+                del self._by_day[(hold.psychologist_id, hold.date)]
+        if self._by_patient.get(hold.patient_id) == hold.id:
+            del self._by_patient[hold.patient_id]
+
+    def holder(self, psychologist_id: int, appt_date: date, appt_time: dtime) -> Optional[SlotHold]:
+        """Retorna a reserva ativa de um horário, se houver."""
+        with self._lock:
+            expired = self._expire(datetime.now())
+            hold_id = self._by_day.get((psychologist_id, appt_date), {}).get(appt_time)
+            hold = self._holds.get(hold_id) if hold_id else None
+        self._released(expired, "expired")
+        return hold
+
+    def get(self, hold_id: str) -> Optional[SlotHold]:
+        """Retorna uma reserva ativa pelo ID."""
+        with self._lock:
+            expired = self._expire(datetime.now())
+            hold = self._holds.get(hold_id)
+        self._released(expired, "expired")
+        return hold
+
+    def for_patient(self, patient_id: int) -> Optional[SlotHold]:
+        """Retorna a reserva ativa de um paciente, se houver."""
+        with self._lock:
+            expired = self._expire(datetime.now())
+            hold = self._holds.get(self._by_patient.get(patient_id))
+        self._released(expired, "expired")
+        return hold
+
+    def busy_times(self, psychologist_id: int, appt_date: date) -> Set[str]:
+        """Horários (HH:MM) reservados de um psicólogo em uma data."""
+        with self._lock:
+            expired = self._expire(datetime.now())
+            times = {t.strftime('%H:%M') for t in self._by_day.get((psychologist_id, appt_date), ())}
+        self._released(expired, "expired")
+        return times
+
+    def add(self, patient_id: int, psychologist_id: int, appt_date: date, appt_time: dtime,
+            duration: int) -> SlotHold:
+        """
+        Registra uma reserva, liberando a reserva anterior do paciente.
+
+        Quem chama deve garantir que o horário está livre (ver ``holder``).
+
+        Returns:
+            SlotHold: Reserva criada
+        """
+        now = datetime.now()
+        hold = SlotHold(secrets.token_urlsafe(12), patient_id, psychologist_id, appt_date, appt_time,
+                        duration, now + timedelta(seconds=self.ttl))
+        with self._lock:
+            expired = self._expire(now)
+            previous = self._holds.get(self._by_patient.get(patient_id))
+            if previous is not None:
+                self._remove(previous)
+            self._holds[hold.id] = hold
+            self._by_day.setdefault((psychologist_id, appt_date), {})[appt_time] = hold.id
+            self._by_patient[patient_id] = hold.id
+            heapq.heappush(self._expiry, (hold.expires_at, hold.id))
+            self._version += 1
+            if self._expiry[0][1] == hold.id:
+                self._wakeup.notify()
+        self._released(expired, "expired")
+        if previous is not None:
+            self._released([previous], "replaced")
+        if self.events:
+            self.events.publish(SlotHeld(
+                hold_id=hold.id, patient_id=patient_id, psychologist_id=psychologist_id,
+                date=appt_date, time=appt_time, duration=duration, expires_at=hold.expires_at))
+        return hold
+
+    def release(self, hold_id: str, reason: str = "released") -> bool:
+        """
+        Libera uma reserva antes do prazo.
+
+        Args:
+            hold_id: ID da reserva
+            reason: Motivo publicado em SlotHoldReleased (``released`` ou ``booked``)
+
+        Returns:
+            bool: False se a reserva não existia ou já tinha expirado
+        """
+        with self._lock:
+            expired = self._expire(datetime.now())
+            hold = self._holds.get(hold_id)
+            if hold is not None:
+                self._remove(hold)
+        self._released(expired, "expired")
+        if hold is None:
+            return False
+        self._released([hold], reason)
+        return True
+
+    def __len__(self) -> int:
+        with self._lock:
+            expired = self._expire(datetime.now())
+            count = len(self._holds)
+        self._released(expired, "expired")
+        return count
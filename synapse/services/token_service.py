@@ -0,0 +1,106 @@
+"""
+Tokens de acesso assinados (HMAC-SHA256) para a API JSON.
+A verificação não consulta repositórios: o token carrega as claims do usuário.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+from synapse.business_model.user import User
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+class TokenService:
+    """
+    Emite e verifica tokens ``<payload>.<assinatura>`` com expiração.
+
+    O payload é JSON em base64url com as claims ``sub`` (ID do usuário),
+    ``type`` (tipo do usuário), ``name``, ``iat`` e ``exp``. A assinatura é
+    comparada em tempo constante. Tokens já verificados ficam em um LRU
+    pequeno, de modo que requisições repetidas com o mesmo token custam uma
+    consulta ao dicionário e a checagem da expiração.
+
+    Attributes:
+        ttl: Validade dos tokens, em segundos
+    """
+
+    def __init__(self, secret: str, ttl: int = 3600, cache_size: int = 1024):
+        self._key = hashlib.sha256(("synapse-token|" + secret).encode("utf-8")).digest()
+        self.ttl = ttl
+        self._cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _sign(self, payload: str) -> str:
+        return _b64encode(hmac.new(self._key, payload.encode("ascii"), hashlib.sha256).digest())
+
+    def issue(self, user: User) -> str:
+        """
+        Emite um token para o usuário.
+
+        Args:
+            user: Usuário autenticado
+
+        Returns:
+            str: Token assinado
+        """
+        now = int(time.time())
+        claims = {"sub": user.id, "type": user.user_type, "name": user.name, "iat": now, "exp": now + self.ttl}
+        payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+        return f"{payload}.{self._sign(payload)}"
+
+    def verify(self, token: str) -> Optional[Dict]:
+        """
+        Verifica assinatura e expiração de um token.
+
+        Args:
+            token: Token recebido no cabeçalho Authorization
+
+        Returns:
+            Dict com as claims ou None se o token for inválido ou expirado
+        """
+        with self._lock:
+            claims = self._cache.get(token)
+            if claims is not None:
+                self._cache.move_to_end(token)
+
+        if claims is None:
+            claims = self._decode(token)
+            if claims is None:
+                return None
+            with self._lock:
+                self._cache[token] = claims
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+
+        if claims["exp"] <= time.time():
+            with self._lock:
+                self._cache.pop(token, None)
+            return None
+        return claims
+
+    def _decode(self, token: str) -> Optional[Dict]:
+        payload, _, signature = token.partition(".")
+        if not payload or not signature or not token.isascii():
+            return None
+        if not hmac.compare_digest(signature, self._sign(payload)):
+            return None
+        try:
+            claims = json.loads(_b64decode(payload))
+        except ValueError:
+            return None
+        if not isinstance(claims, dict) or not isinstance(claims.get("exp"), int):
+            return None
+        return claims
@@ -0,0 +1,171 @@
+"""
+Relatório de ocupação dos psicólogos.
+Compara minutos ofertados (disponibilidades) e minutos agendados (consultas)
+por semana ISO, sem cruzar cada janela de disponibilidade com cada consulta.
+"""
+
+import threading
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+from synapse.business_model.appointment import AppointmentState
+from synapse.services.events import EventBus, AppointmentEvent
+from synapse.services.single_flight import SingleFlight
+from synapse.repositories.implementations.inmemory_availability_repository import InMemoryAvailabilityRepository
+
+DAYS_PER_WEEK = 7
+
+
+def _monday(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def _minutes(start, end) -> int:
+    delta = datetime.combine(date.min, end) - datetime.combine(date.min, start)
+    return max(int(delta.total_seconds() // 60), 0)
+
+
+class UtilizationReport:
+    """
+    Ocupação por psicólogo e da clínica.
+
+    Os minutos agendados ficam em um índice por semana ISO
+    (segunda-feira -> psicólogo -> minutos por dia da semana), mantido
+    incrementalmente a cada evento de consulta. Os minutos ofertados por
+    dia da semana vêm das disponibilidades ativas e são recalculados só
+    quando o repositório de disponibilidades muda. Um relatório soma vetores
+    de 7 posições por semana do intervalo. Relatórios idênticos pedidos ao
+    mesmo tempo compartilham um único cálculo.
+
+    Attributes:
+        availability_repository: Repositório de disponibilidades
+    """
+
+    def __init__(self, availability_repository: InMemoryAvailabilityRepository):
+        self.availability_repository = availability_repository
+        self._weeks: Dict[date, Dict[int, List[int]]] = {}
+        self._offered: Dict[int, List[int]] = {}
+        self._offered_version = None
+        self._version = 0
+        self._lock = threading.Lock()
+        self._flights = SingleFlight()
+
+    def rebuild(self, appointments: Iterable) -> None:
+        """Recalcula o índice de minutos agendados (usado na inicialização)."""
+        with self._lock:
+            self._weeks = {}
+            for appointment in appointments:
+                self._apply(appointment.snapshot(), +1)
+            self._version += 1
+
+    def subscribe(self, events: EventBus) -> None:
+        """Inscreve o índice (síncrono) nos eventos de consultas."""
+        events.subscribe(AppointmentEvent, lambda e: self.track(e.before, e.after))
+
+    def track(self, before: Optional[AppointmentState], after: Optional[AppointmentState]) -> None:
+        """Registra a transição de uma consulta."""
+        if before == after:
+            return
+        with self._lock:
+            if before is not None:
+                self._apply(before, -1)
+            if after is not None:
+                self._apply(after, +1)
+            self._version += 1
+
+    def _apply(self, state: AppointmentState, sign: int) -> None:
+        if state.status == 'cancelled':
+            return
+        week = self._weeks.setdefault(_monday(state.date), {})
+        minutes = week.get(state.psychologist_id)
+        if minutes is None:
+            minutes = week[state.psychologist_id] = [0] * DAYS_PER_WEEK
+        minutes[state.date.weekday()] += sign * state.duration
+
+    def version(self):
+        """Versão dos dados do relatório, usada para ETags."""
+        return self._version, self.availability_repository.version
+
+    def _offered_by_weekday(self) -> Dict[int, List[int]]:
+        version = self.availability_repository.version
+        if self._offered_version != version:
+            offered = defaultdict(lambda: [0] * DAYS_PER_WEEK)
+            for availability in self.availability_repository.iter_all():
+                if availability.is_active:
+                    offered[availability.psychologist_id][availability.day_of_week] += \
+                        _minutes(availability.start_time, availability.end_time)
+            self._offered = dict(offered)
+            self._offered_version = version
+        return self._offered
+
+    def report(self, start: date, end: date, psychologist_id: int = None) -> Dict:
+        """
+        Calcula a ocupação semana a semana no intervalo.
+
+        Semanas parcialmente dentro do intervalo consideram apenas os dias
+        do intervalo.
+
+        Args:
+            start: Primeiro dia do intervalo
+            end: Último dia do intervalo
+            psychologist_id: Restringir a um psicólogo (opcional)
+
+        Returns:
+            Dict com weeks (semana ISO com offered_minutes, booked_minutes,
+            occupancy e by_psychologist), psychologists (totais do intervalo
+            por psicólogo) e clinic (totais do intervalo)
+        """
+        return self._flights.do(
+            (self.version(), start, end, psychologist_id),
+            lambda: self._report(start, end, psychologist_id)
+        )
+
+    def _report(self, start: date, end: date, psychologist_id: Optional[int]) -> Dict:
+        with self._lock:
+            offered_by_weekday = self._offered_by_weekday()
+            weeks = []
+            totals = defaultdict(lambda: [0, 0])
+            monday = _monday(start)
+            while monday <= end:
+                first = (start - monday).days if start > monday else 0
+                last = min((end - monday).days, DAYS_PER_WEEK - 1)
+                booked_week = self._weeks.get(monday, {})
+
+                ids = set(offered_by_weekday) | set(booked_week)
+                if psychologist_id is not None:
+                    ids &= {psychologist_id}
+
+                rows = []
+                for pid in sorted(ids):
+                    offered = sum(offered_by_weekday.get(pid, ())[first:last + 1])
+                    booked = sum(booked_week.get(pid, ())[first:last + 1])
+                    if not offered and not booked:
+                        continue
+                    totals[pid][0] += offered
+                    totals[pid][1] += booked
+                    rows.append(self._row(offered, booked, psychologist_id=pid))
+
+                year, week, _ = monday.isocalendar()
+                weeks.append(self._row(
+                    sum(r["offered_minutes"] for r in rows),
+                    sum(r["booked_minutes"] for r in rows),
+                    week=f"{year}-W{week:02d}",
+                    start=max(monday, start).isoformat(),
+                    end=(monday + timedelta(days=last)).isoformat(),
+                    by_psychologist=rows
+                ))
+                monday += timedelta(days=DAYS_PER_WEEK)
+
+        return {
+            "weeks": weeks,
+            "psychologists": [self._row(o, b, psychologist_id=pid) for pid, (o, b) in sorted(totals.items())],
+            "clinic": self._row(sum(o for o, _ in totals.values()), sum(b for _, b in totals.values()))
+        }
+
+    @staticmethod
+    def _row(offered: int, booked: int, **labels) -> Dict:
+        row = dict(labels)
+        row["offered_minutes"] = offered
+        row["booked_minutes"] = booked
+        row["occupancy"] = round(booked / offered * 100, 1) if offered else None
+        return row
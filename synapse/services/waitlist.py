@@ -0,0 +1,319 @@
+"""
+Lista de espera por horários.
+Pacientes registram interesse em um psicólogo, data e faixa de horário; quando
+uma consulta é cancelada, o horário liberado vai direto para o primeiro da fila.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import date, datetime, time as dtime
+from typing import Dict, List, Optional, Tuple
+from synapse.business_model.appointment import AppointmentState
+from synapse.services.events import (
+    EventBus, AppointmentEvent, AppointmentCancelled, AppointmentDeleted, WaitlistSlotOffered
+)
+from synapse.services.psychologist_agenda import UPCOMING_STATUSES
+from synapse.api.exceptions import NotFoundError, ValidationError, ConflictError, BusinessRuleError
+
+logger = logging.getLogger(__name__)
+
+WAITING = "waiting"
+OFFERED = "offered"
+BOOKED = "booked"
+CANCELLED = "cancelled"
+
+
+@dataclass
+class WaitlistEntry:
+    """Interesse de um paciente em horários de um psicólogo em uma data."""
+    id: int
+    patient_id: int
+    psychologist_id: int
+    date: date
+    start_time: dtime
+    end_time: dtime
+    duration: int = 60
+    auto_book: bool = False
+    created_at: datetime = field(default_factory=datetime.now)
+    status: str = WAITING
+    appointment_id: Optional[int] = None
+    hold_id: Optional[str] = None
+
+    def accepts(self, slot_time: dtime) -> bool:
+        """Se o horário de início está dentro da faixa desejada."""
+        return self.start_time <= slot_time <= self.end_time
+
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "patient_id": self.patient_id,
+            "psychologist_id": self.psychologist_id,
+            "date": self.date.isoformat(),
+            "start_time": self.start_time.strftime('%H:%M'),
+            "end_time": self.end_time.strftime('%H:%M'),
+            "duration": self.duration,
+            "auto_book": self.auto_book,
+            "created_at": self.created_at.isoformat(timespec='seconds'),
+            "status": self.status,
+            "appointment_id": self.appointment_id,
+            "hold_id": self.hold_id,
+        }
+
+
+class WaitlistService:
+    """
+    Lista de espera com encaixe por eventos de cancelamento.
+
+    Cada dia de agenda (psicólogo, data) tem um heap com os IDs das entradas
+    em espera; como os IDs são crescentes, o topo é sempre o paciente mais
+    antigo na fila. Quando uma consulta futura é cancelada ou removida, o heap
+    do dia é consultado a partir do topo até a primeira entrada cuja faixa
+    aceita o horário liberado; as entradas puladas voltam ao heap com a mesma
+    prioridade. No caso comum (faixas que aceitam o horário) o encaixe custa
+    O(log n), sem varrer as entradas nem as consultas.
+
+    O paciente encaixado recebe o horário de uma de duas formas:
+    - ``auto_book``: a consulta é agendada diretamente;
+    - caso contrário, o horário é reservado para ele (ver SlotHolds) e um
+      ``WaitlistSlotOffered`` é publicado para avisá-lo. Se a reserva expirar
+      sem agendamento, o horário volta à disponibilidade normal.
+
+    Entradas que saem da fila (encaixe ou desistência) permanecem no heap e
+    são descartadas quando chegam ao topo (remoção preguiçosa).
+
+    Attributes:
+        appointment_service: Serviço que valida, agenda e reserva horários
+        events: Barramento onde as ofertas são publicadas (opcional)
+    """
+
+    def __init__(self, appointment_service, events: EventBus = None):
+        self.appointment_service = appointment_service
+        self.events = events
+        self._entries: Dict[int, WaitlistEntry] = {}
+        self._queues: Dict[Tuple[int, date], List[int]] = {}
+        self._waiting: Dict[Tuple[int, int, date], int] = {}
+        self._ids = itertools.count(1)
+        self._pruned_on: Optional[date] = None
+        self._lock = threading.Lock()
+
+    def subscribe(self, events: EventBus) -> None:
+        """Encaixa pacientes nos horários liberados por cancelamentos e remoções."""
+        events.subscribe(AppointmentCancelled, self._on_freed)
+        events.subscribe(AppointmentDeleted, self._on_freed)
+
+    def _on_freed(self, event: AppointmentEvent) -> None:
+        before: AppointmentState = event.before
+        if before is None or before.status not in UPCOMING_STATUSES:
+            return
+        if datetime.combine(before.date, before.time) <= datetime.now():
+            return
+        self.match(before.psychologist_id, before.date, before.time)
+
+    # =========================================================================
+    # INSCRIÇÃO
+    # =========================================================================
+
+    def join(self, patient_id: int, psychologist_id: int, date_str: str, start_str: str,
+             end_str: str, duration: int = 60, auto_book: bool = False) -> WaitlistEntry:
+        """
+        Inclui um paciente na lista de espera.
+
+        Args:
+            patient_id: ID do paciente
+            psychologist_id: ID do psicólogo
+            date_str: Data desejada (yyyy-mm-dd)
+            start_str: Primeiro horário de início aceito (HH:MM)
+            end_str: Último horário de início aceito (HH:MM)
+            duration: Duração da consulta em minutos
+            auto_book: Se True, agenda sem confirmação quando surgir um horário
+
+        Returns:
+            WaitlistEntry: Entrada criada
+
+        Raises:
+            NotFoundError: Se paciente ou psicólogo não forem encontrados
+            ValidationError: Se data/faixa forem inválidas ou a data já tiver passado
+            BusinessRuleError: Se o psicólogo estiver inativo
+            ConflictError: Se o paciente já aguarda esse psicólogo nessa data
+        """
+        if not self.appointment_service.patient_repository.get(patient_id):
+            raise NotFoundError("Paciente", patient_id)
+        psy = self.appointment_service.psychologist_repository.get(psychologist_id)
+        if not psy:
+            raise NotFoundError("Psicólogo", psychologist_id)
+        if not psy.is_active:
+            raise BusinessRuleError("Psicólogo está inativo")
+
+        try:
+            wanted_date = date.fromisoformat(date_str)
+            start_time = dtime.fromisoformat(start_str)
+            end_time = dtime.fromisoformat(end_str)
+        except ValueError:
+            raise ValidationError("Data ou hora em formato inválido")
+        if wanted_date < date.today():
+            raise ValidationError("Data deve ser futura", "date")
+        if end_time < start_time:
+            raise ValidationError("Horário final deve ser posterior ao inicial", "end_time")
+
+        with self._lock:
+            self._prune(date.today())
+            key = (patient_id, psychologist_id, wanted_date)
+            if key in self._waiting:
+                raise ConflictError("Paciente já está na lista de espera deste psicólogo nesta data")
+            entry = WaitlistEntry(next(self._ids), patient_id, psychologist_id, wanted_date,
+                                  start_time, end_time, duration, auto_book)
+            self._entries[entry.id] = entry
+            self._waiting[key] = entry.id
+            heapq.heappush(self._queues.setdefault((psychologist_id, wanted_date), []), entry.id)
+        return entry
+
+    def leave(self, entry_id: int) -> WaitlistEntry:
+        """
+        Retira uma entrada da fila.
+
+        Raises:
+            NotFoundError: Se a entrada não existir
+            BusinessRuleError: Se a entrada já tiver sido encaixada
+        """
+        with self._lock:
+            entry = self._entries.get(entry_id)
+            if entry is None:
+                raise NotFoundError("Entrada da lista de espera", entry_id)
+            if entry.status not in (WAITING, CANCELLED):
+                raise BusinessRuleError(f"Entrada com status '{entry.status}' não pode ser cancelada")
+            self._close(entry, CANCELLED)
+        return entry
+
+    def get(self, entry_id: int) -> WaitlistEntry:
+        """
+        Busca uma entrada pelo ID.
+
+        Raises:
+            NotFoundError: Se a entrada não existir
+        """
+        entry = self._entries.get(entry_id)
+        if entry is None:
+            raise NotFoundError("Entrada da lista de espera", entry_id)
+        return entry
+
+    def list(self, patient_id: int = None, psychologist_id: int = None) -> List[WaitlistEntry]:
+        """Entradas (todas as situações), da mais antiga para a mais recente."""
+        with self._lock:
+            entries = list(self._entries.values())
+        return [e for e in entries
+                if (not patient_id or e.patient_id == patient_id)
+                and (not psychologist_id or e.psychologist_id == psychologist_id)]
+
+    # =========================================================================
+    # ENCAIXE
+    # =========================================================================
+
+    def match(self, psychologist_id: int, slot_date: date, slot_time: dtime) -> Optional[WaitlistEntry]:
+        """
+        Entrega um horário livre ao primeiro paciente da fila que o aceita.
+
+        Se o horário já tiver sido ocupado (ou deixar de ser válido) a entrada
+        volta à fila com a mesma prioridade; pacientes removidos são
+        descartados e o próximo da fila é tentado. Pacientes que já seguram
+        outro horário (agendamento em andamento) não recebem ofertas: a
+        reserva deles não é trocada, e o horário vai para o próximo da fila
+        enquanto eles continuam na fila.
+
+        Returns:
+            WaitlistEntry: Entrada encaixada, ou None se ninguém recebeu o horário
+        """
+        deferred = []
+        try:
+            return self._match(psychologist_id, slot_date, slot_time, deferred)
+        finally:
+            if deferred:
+                with self._lock:
+                    queue = self._queues.setdefault((psychologist_id, slot_date), [])
+                    for entry_id in deferred:
+                        heapq.heappush(queue, entry_id)
+
+    def _match(self, psychologist_id: int, slot_date: date, slot_time: dtime,
+               deferred: List[int]) -> Optional[WaitlistEntry]:
+        service = self.appointment_service
+        while True:
+            with self._lock:
+                entry = self._pop_match(psychologist_id, slot_date, slot_time)
+            if entry is None:
+                return None
+            if not entry.auto_book and service.holds and service.holds.for_patient(entry.patient_id):
+                deferred.append(entry.id)
+                continue
+            try:
+                if entry.auto_book:
+                    appt = service.schedule_appointment(
+                        entry.patient_id, psychologist_id, slot_date.isoformat(),
+                        slot_time.strftime('%H:%M'), entry.duration
+                    )
+                    entry.appointment_id = appt.id
+                    status = BOOKED
+                else:
+                    hold = service.hold_slot(
+                        entry.patient_id, psychologist_id, slot_date.isoformat(),
+                        slot_time.strftime('%H:%M'), entry.duration, replace=False
+                    )
+                    entry.hold_id = hold.id
+                    status = OFFERED
+            except NotFoundError:
+                with self._lock:
+                    self._close(entry, CANCELLED)
+                continue
+            except (ValidationError, ConflictError, BusinessRuleError) as e:
+                logger.info("Horário %s %s não encaixado: %s", slot_date, slot_time, e.message)
+                with self._lock:
+                    heapq.heappush(self._queues.setdefault((psychologist_id, slot_date), []), entry.id)
+                return None
+
+            with self._lock:
+                self._close(entry, status)
+            if status == OFFERED and self.events:
+                self.events.publish(WaitlistSlotOffered(
+                    entry_id=entry.id, patient_id=entry.patient_id, psychologist_id=psychologist_id,
+                    hold_id=hold.id, date=slot_date, time=slot_time, expires_at=hold.expires_at
+                ))
+            return entry
+
+    def _pop_match(self, psychologist_id: int, slot_date: date, slot_time: dtime) -> Optional[WaitlistEntry]:
+        queue = self._queues.get((psychologist_id, slot_date))
+        if not queue:
+            return None
+        skipped, found = [], None
+        while queue:
+            entry = self._entries[heapq.heappop(queue)]
+            if entry.status != WAITING:
+                continue
+            if entry.accepts(slot_time):
+                found = entry
+                break
+            skipped.append(entry.id)
+        for entry_id in skipped:
+            heapq.heappush(queue, entry_id)
+        if not queue:
+            del self._queues[(psychologist_id, slot_date)]
+        return found
+
+    def _close(self, entry: WaitlistEntry, status: str) -> None:
+        entry.status = status
+        key = (entry.patient_id, entry.psychologist_id, entry.date)
+        if self._waiting.get(key) == entry.id:
+            del self._waiting[key]
+
+    def _prune(self, today: date) -> None:
+        # Uma vez por dia descarta as filas de datas que já passaram
+        if self._pruned_on == today:
+            return
+        self._pruned_on = today
+        for key in [k for k in self._queues if k[1] < today]:
+            for entry_id in self._queues.pop(key):
+                entry = self._entries.pop(entry_id, None)
+                if entry is not None:
+                    self._close(entry, CANCELLED)
+        for entry_id in [i for i, e in self._entries.items() if e.date < today]:
+            del self._entries[entry_id]